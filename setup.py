@@ -12,8 +12,11 @@ setup(
         "pydantic>=2.0.0",
         "click>=8.0.0",
         "ccxt>=4.0.0",
-        "ta>=0.10.0",
     ],
+    extras_require={
+        # Reference indicators the tests check the kernels against
+        "dev": ["pytest>=7.0.0", "ta>=0.10.0"],
+    },
     entry_points={
         "console_scripts": [
             "trading-strategy=src.cli:cli",
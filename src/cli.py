@@ -1,16 +1,53 @@
 import click
-from .command import run, optimize_ichimoku
+from importlib import import_module
+from typing import List, Optional
 
+from . import command
 
-@click.group()
+
+class LazyGroup(click.Group):
+    """Group importing the module of a command only when it is used"""
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        lazy = [name.replace("_", "-") for name in command.COMMANDS]
+        return sorted(set(super().list_commands(ctx)) | set(lazy))
+
+    def get_command(self, ctx: click.Context, name: str) -> Optional[click.Command]:
+        attribute = name.replace("-", "_")
+        if name not in self.commands and attribute in command.COMMANDS:
+            module, _ = command.COMMANDS[attribute]
+            module = import_module(module, command.__name__)
+            self.add_command(getattr(module, attribute), name)
+        return super().get_command(ctx, name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        """List the commands by their short help, without importing them"""
+        commands = []
+        for name in self.list_commands(ctx):
+            attribute = name.replace("-", "_")
+            if name not in self.commands and attribute in command.COMMANDS:
+                _, short_help = command.COMMANDS[attribute]
+                commands.append((name, click.Command(name, help=short_help)))
+                continue
+            cmd = self.get_command(ctx, name)
+            if cmd is not None and not cmd.hidden:
+                commands.append((name, cmd))
+        if not commands:
+            return
+
+        # Same layout as click.Group
+        limit = formatter.width - 6 - max(len(name) for name, _ in commands)
+        with formatter.section("Commands"):
+            formatter.write_dl(
+                [(name, cmd.get_short_help_str(limit)) for name, cmd in commands]
+            )
+
+
+@click.group(cls=LazyGroup)
 def cli():
     """Crypto Trading Strategy Tester CLI"""
     pass
 
 
-cli.add_command(run)
-
-cli.add_command(optimize_ichimoku)
-
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,66 @@
+import re
+import zipfile
+from pathlib import Path
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .klines import COLUMNS
+from .timeframe import to_datetime_index
+
+Range = Tuple[int, int]
+
+# e.g. BTCUSDT-1m-2024-01.zip (monthly) or BTCUSDT-1m-2024-01-15.zip (daily)
+ARCHIVE_NAME = re.compile(
+    r"^(?P<symbol>[A-Z0-9]+)-(?P<timeframe>\d+[smhdwM])-"
+    r"(?P<year>\d{4})-(?P<month>\d{2})(?:-(?P<day>\d{2}))?\.zip$"
+)
+
+
+def archive_symbol(symbol: str) -> str:
+    """Get the symbol as written in archive names (e.g. BTC/USDT -> BTCUSDT)"""
+    return re.sub(r"[^A-Z0-9]", "", symbol.split(":")[0].upper())
+
+
+def parse_archive_name(path: Path) -> Optional[Tuple[str, str, Range]]:
+    """Get the symbol, timeframe and covered period of a kline archive"""
+    match = ARCHIVE_NAME.match(path.name)
+    if match is None:
+        return None
+
+    start = pd.Timestamp(
+        int(match["year"]), int(match["month"]), int(match["day"] or 1)
+    )
+    end = start + (pd.DateOffset(days=1) if match["day"] else pd.DateOffset(months=1))
+    period = (int(start.value // 1_000_000), int(end.value // 1_000_000) - 1)
+    return match["symbol"], match["timeframe"], period
+
+
+def read_kline_archive(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stream the CSV inside a zipped kline archive without extracting it.
+
+    Returns int64 open times in milliseconds and a (candles x 5) float64
+    block of OHLCV values.
+    """
+    with zipfile.ZipFile(path) as archive:
+        name = next(n for n in archive.namelist() if n.endswith(".csv"))
+        with archive.open(name) as raw:
+            # Newer archives start with a header row
+            has_header = not raw.peek(1)[:1].isdigit()
+            df = pd.read_csv(
+                raw, header=None, skiprows=int(has_header), usecols=range(6)
+            )
+
+    timestamps = df[0].to_numpy(dtype=np.int64)
+    # Spot archives switched to microseconds in 2025
+    if len(timestamps) and timestamps[0] > 10**14:
+        timestamps = timestamps // 1000
+
+    values = df[[1, 2, 3, 4, 5]].to_numpy(dtype=np.float64)
+    return timestamps, values
+
+
+def to_frame(timestamps: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    """Build an OHLCV DataFrame from archive arrays"""
+    return pd.DataFrame(values, columns=COLUMNS, index=to_datetime_index(timestamps))
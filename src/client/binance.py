@@ -1,13 +1,10 @@
-from typing import Literal
-from datetime import datetime
-import pandas as pd
+from typing import Any, Literal, Optional
 import ccxt
-from typing import Optional
 
-from .client import Client
+from .ccxt import CcxtClient
 
 
-class BinanceClient(Client):
+class BinanceClient(CcxtClient):
     def __init__(
         self,
         api_key: str,
@@ -15,81 +12,30 @@ class BinanceClient(Client):
         market_type: Literal["spot", "futures"] = "futures",
         sandbox_mode: bool = True,
         cache_dir: str = ".cache",
+        exchange: Optional[Any] = None,
     ):
-        super().__init__("binance", cache_dir)
-
-        # Initialize clients
-        self.exchange = ccxt.binance(
-            {
-                "apiKey": api_key,
-                "secret": api_secret,
-                "options": {"defaultType": market_type},
-            }
-        )
-        if sandbox_mode:
-            self.exchange.set_sandbox_mode(True)
+        if exchange is None:
+            # Authenticated exchanges are not shared between clients
+            exchange = ccxt.binance(
+                {
+                    "apiKey": api_key,
+                    "secret": api_secret,
+                    "options": {"defaultType": market_type},
+                }
+            )
+            if sandbox_mode:
+                exchange.set_sandbox_mode(True)
+
+        super().__init__(cache_dir=cache_dir, exchange=exchange)
 
     def fetch_balance(self):
-        return self.exchange.fetch_balance()
-
-    def fetch_once(
-        self,
-        symbol: str,
-        timeframe: str,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-    ) -> pd.DataFrame:
-        """Fetch OHLCV data from Binance"""
-
-        # Convert timeframe to Binance format (e.g., '1h' -> '1h', '1d' -> '1d')
-        interval = timeframe
-
-        # Convert dates to timestamps in milliseconds
-        start_ts = int(start_date.timestamp() * 1000) if start_date else None
-        end_ts = int(end_date.timestamp() * 1000) if end_date else None
-
-        # Fetch klines data
-        klines = self.client.klines(
-            symbol=symbol,
-            interval=interval,
-            startTime=start_ts,
-            endTime=end_ts,
-            limit=1000,
-        )
-
-        # Convert to DataFrame
-        df = pd.DataFrame(
-            klines,
-            columns=[
-                "timestamp",
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "close_time",
-                "quote_volume",
-                "trades",
-                "taker_buy_base",
-                "taker_buy_quote",
-                "ignore",
-            ],
-        )
-
-        # Keep only the OHLCV columns
-        df = df[["timestamp", "open", "high", "low", "close", "volume"]]
-
-        # Convert string values to float
-        for col in ["open", "high", "low", "close", "volume"]:
-            df[col] = df[col].astype(float)
-
-        return df
+        return self._request(self.exchange.fetch_balance)
 
     def get_latest_price(self, symbol: str) -> float:
         """Get the latest price for a symbol"""
-        ticker = self.client.ticker_price(symbol=symbol)
-        return float(ticker["price"])
+        ticker = self._request(self.exchange.fetch_ticker, symbol=symbol)
+        return float(ticker["last"])
 
     def get_orderbook(self, symbol: str, limit: int = 100) -> dict:
         """Get the current orderbook for a symbol"""
-        return self.client.depth(symbol=symbol, limit=limit)
+        return self._request(self.exchange.fetch_order_book, symbol=symbol, limit=limit)
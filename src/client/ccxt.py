@@ -1,30 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import numpy as np
 import pandas as pd
-import ccxt
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
+import time
 
 from .client import Client
+from .klines import KlineBuffer
+from .session import ExchangeSession
+from .timeframe import timeframe_to_milliseconds, to_milliseconds
 
 
 class CcxtClient(Client):
-    def __init__(self, exchange_id: str = "binance", cache_dir: str = ".cache"):
-        super().__init__(exchange_id, cache_dir)
-
-        self.exchange = getattr(ccxt, exchange_id)()
-        # Increase timeout values
-        self.exchange.timeout = 30000  # 30 seconds
-        self.exchange.enableRateLimit = True
-
-        # Configure exchange-specific options
-        if exchange_id == "binance":
-            self.exchange.options.update(
-                {
-                    "adjustForTimeDifference": True,
-                    "recvWindow": 60000,
-                    "defaultType": "future",  # Since we're using dapi
-                    "defaultNetwork": "BSC",
-                }
-            )
+    def __init__(
+        self,
+        exchange_id: str = "binance",
+        cache_dir: str = ".cache",
+        max_workers: int = 8,
+        limit: int = 1000,
+        max_memory_bytes: int = 512 * 1024 * 1024,
+        max_disk_bytes: Optional[int] = None,
+        exchange: Optional[Any] = None,
+        dtype: str = "float64",
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            exchange_id: ccxt id of the exchange to fetch from
+            cache_dir: Directory of the candle cache
+            max_workers: Number of windows fetched concurrently
+            limit: Maximum number of candles per request
+            max_memory_bytes: Size budget of the in-memory cache
+            max_disk_bytes: Size budget of the disk cache (unbounded if None)
+            exchange: Exchange object to use instead of the shared ccxt one,
+                e.g. a `ReplayExchange` for offline runs
+            dtype: Type of the fetched prices and volumes, "float32" halves
+                the memory of long histories
+        """
+        if exchange is not None:
+            exchange_id = exchange.id
+        super().__init__(exchange_id, cache_dir, max_memory_bytes, max_disk_bytes)
+
+        self.session = (
+            ExchangeSession(exchange)
+            if exchange is not None
+            else ExchangeSession.get(exchange_id)
+        )
+        self.exchange = self.session.exchange
+        self.scheduler = self.session.scheduler
+        self.max_workers = max_workers
+        self.limit = limit
+        self.dtype = np.dtype(dtype)
 
     def fetch_once(
         self,
@@ -36,26 +63,99 @@ class CcxtClient(Client):
         """Fetch OHLCV data from the exchange"""
 
         # Convert dates to timestamps in milliseconds
-        start_ts = int(start_date.timestamp() * 1000) if start_date else None
-
-        # We have a limit of 1000 klines per request
-        # Use pagination to fetch all data between startTime and endTime
-        klines = []
-        limit = 1000
-        while True:
-            fetched_klines = self.exchange.fetch_ohlcv(
+        start_ts = to_milliseconds(start_date)
+        end_ts = to_milliseconds(end_date)
+
+        if start_ts is None:
+            # Without a start the exchange returns its most recent candles
+            buffer = KlineBuffer(dtype=self.dtype)
+            buffer.extend(
+                self._request(
+                    self.exchange.fetch_ohlcv,
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    limit=self.limit,
+                )
+            )
+            if end_ts is not None:
+                buffer.size = int(
+                    np.searchsorted(buffer.timestamps[: buffer.size], end_ts, "right")
+                )
+            return buffer.to_frame()
+
+        if end_ts is None:
+            end_ts = int(time.time() * 1000)
+
+        # The timeframe gives the candle spacing, so the range can be split
+        # into windows of `limit` candles up front and fetched concurrently
+        step = timeframe_to_milliseconds(timeframe)
+        windows = [
+            (first, min(first + self.limit * step - 1, end_ts))
+            for first in range(start_ts, end_ts + 1, self.limit * step)
+        ]
+
+        # Every window writes its pages into its own region of one buffer
+        # sized for the whole range, so no page is kept as Python objects
+        capacities = [(last - first) // step + 1 for first, last in windows]
+        offsets = np.concatenate([[0], np.cumsum(capacities)[:-1]]).tolist()
+        buffer = KlineBuffer(capacity=sum(capacities), dtype=self.dtype)
+
+        self.session.load_markets()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            counts = list(
+                executor.map(
+                    lambda args: self._fetch_window(symbol, timeframe, buffer, *args),
+                    zip(windows, offsets, capacities),
+                )
+            )
+
+        # Windows are disjoint, so regions never share a candle
+        buffer.compact(list(zip(offsets, counts)))
+        return buffer.to_frame()
+
+    def _fetch_window(
+        self,
+        symbol: str,
+        timeframe: str,
+        buffer: KlineBuffer,
+        window: Tuple[int, int],
+        offset: int,
+        capacity: int,
+    ) -> int:
+        """
+        Fetch the candles of one window between two timestamps (inclusive)
+        into a region of the buffer. Returns the number of candles written.
+        """
+
+        start_ts, end_ts = window
+        step = timeframe_to_milliseconds(timeframe)
+        count = 0
+        since = start_ts
+        # Some exchanges return fewer candles per page than asked for,
+        # so keep paging until the window is filled.
+        while since <= end_ts and count < capacity:
+            fetched_klines = self._request(
+                self.exchange.fetch_ohlcv,
                 symbol=symbol,
                 timeframe=timeframe,
-                since=start_ts,
-                limit=limit,
+                since=since,
+                limit=min(self.limit, (end_ts - since) // step + 1),
+            )
+            written = buffer.write(offset + count, fetched_klines, capacity - count)
+            count += int(
+                np.searchsorted(
+                    buffer.timestamps[offset + count : offset + count + written],
+                    end_ts,
+                    "right",
+                )
             )
-            klines.extend(fetched_klines)
-            if len(fetched_klines) < limit:
+            if not fetched_klines or fetched_klines[-1][0] >= end_ts:
                 break
-            start_ts = fetched_klines[-1][0]
+            # Start after the last candle so page boundaries do not overlap
+            since = fetched_klines[-1][0] + step
 
-        # Convert to DataFrame
-        return pd.DataFrame(
-            klines,
-            columns=["timestamp", "open", "high", "low", "close", "volume"],
-        )
+        return count
+
+    def _request(self, method: Callable, **kwargs):
+        """Send a request to the exchange within its rate limit, with retries"""
+        return self.scheduler.call(method, **kwargs)
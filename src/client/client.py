@@ -1,72 +1,270 @@
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from datetime import datetime
+from itertools import islice
+import numpy as np
 import pandas as pd
-import ccxt
-from typing import Optional
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import os
 import time
-import pickle
 from pathlib import Path
-from slugify import slugify
+
+from .archive import (
+    archive_symbol,
+    parse_archive_name,
+    read_kline_archive,
+    to_frame,
+)
+from .resample import can_resample, resample_ohlcv
+from .store import OhlcvStore
+from .timeframe import (
+    ceil_timestamp,
+    floor_timestamp,
+    from_milliseconds,
+    timeframe_to_milliseconds,
+    to_datetime_index,
+    to_milliseconds,
+)
+
+# Archives read ahead of the one being written, per worker process
+READ_AHEAD = 2
+
+# Candles of adjacent archives written to the cache at a time
+IMPORT_BATCH = 4 * 1024 * 1024
 
 
 class Client(ABC):
-    def __init__(self, exchange_id: str = "binance", cache_dir: str = ".cache"):
+    def __init__(
+        self,
+        exchange_id: str = "binance",
+        cache_dir: str = ".cache",
+        max_memory_bytes: int = 512 * 1024 * 1024,
+        max_disk_bytes: Optional[int] = None,
+    ):
+        self.exchange_id = exchange_id
+
         # Cache settings
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.store = OhlcvStore(
+            self.cache_dir,
+            max_memory_bytes=max_memory_bytes,
+            max_disk_bytes=max_disk_bytes,
+        )
 
     def fetch_balance(self):
         raise NotImplementedError()
 
+    def cache_stats(self) -> Dict[str, int]:
+        """Get the hit, miss and eviction counters of the memory and disk cache"""
+        return self.store.stats()
+
     def fetch_retry(
         self,
         symbol: str,
         timeframe: str,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        max_retries: int = 3,
-        retry_delay: int = 5,
         use_cache: bool = True,
     ) -> pd.DataFrame:
-        """Fetch data with retrying and caching support"""
-
-        if use_cache:
-            cache_key = self._get_cache_key(symbol, timeframe, start_date, end_date)
-            cached_data = self._load_from_cache(cache_key)
-            if cached_data is not None:
-                return cached_data
-
-        # retry logic
-        for attempt in range(max_retries):
-            try:
-                df = self.fetch_once(symbol, timeframe, start_date, end_date)
-
-                # Convert timestamp to datetime
-                df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-                df.set_index("timestamp", inplace=True)
-
-                # Filter by date range if provided
-                if start_date:
-                    df = df[df.index >= pd.Timestamp(start_date)]
-                if end_date:
-                    df = df[df.index <= pd.Timestamp(end_date)]
-
-                if use_cache:
-                    cache_key = self._get_cache_key(
-                        symbol, timeframe, start_date, end_date
-                    )
-                    self._save_to_cache(df, cache_key)
+        """
+        Fetch data with caching support; failed requests are retried one at
+        a time by the exchange session's scheduler.
+
+        The cache keeps one continuous series per symbol and timeframe,
+        so only the ranges it does not cover yet are fetched. Ranges a finer
+        cached timeframe covers are resampled locally instead.
+        """
+
+        start_ts = to_milliseconds(start_date)
+        end_ts = to_milliseconds(end_date)
+
+        if not use_cache:
+            return self._fetch_range(symbol, timeframe, start_ts, end_ts)
+
+        self.store.import_legacy(self.cache_dir, self.exchange_id, symbol, timeframe)
+
+        missing = self._get_missing_ranges(symbol, timeframe, start_ts, end_ts)
+        for first, last in self._resample_from_cache(symbol, timeframe, missing):
+            df = self._fetch_range(symbol, timeframe, first, last)
+            self._save_to_cache(symbol, timeframe, df, first, last)
+
+        return self.store.read(self.exchange_id, symbol, timeframe, start_ts, end_ts)
+
+    def fetch_many(
+        self,
+        symbols: List[str],
+        timeframes: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        max_workers: int = 4,
+        **kwargs,
+    ) -> Iterator[Tuple[str, str, pd.DataFrame]]:
+        """
+        Fetch every symbol/timeframe pair through this client's session.
+
+        All pairs are scheduled together and share the exchange's rate-limit
+        budget. Yields `(symbol, timeframe, data)` as soon as a pair is done.
+        """
 
-                return df
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.fetch_retry,
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_date=start_date,
+                    end_date=end_date,
+                    **kwargs,
+                ): (symbol, timeframe)
+                for symbol in symbols
+                for timeframe in timeframes
+            }
+            for future in as_completed(futures):
+                symbol, timeframe = futures[future]
+                yield symbol, timeframe, future.result()
 
-            except (ccxt.NetworkError, ccxt.RequestTimeout) as e:
-                if attempt == max_retries - 1:  # Last attempt
-                    raise  # Re-raise the last exception
+    def import_archives(
+        self,
+        symbol: str,
+        directory: str,
+        timeframes: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Import zipped kline archives (e.g. `BTCUSDT-1m-2024-01.zip`) into the cache.
+
+        Archives are read in parallel, one file per process, straight from
+        the zip without extracting them. Each archive marks its whole month or
+        day as covered. Returns the number of candles imported per timeframe.
+
+        Args:
+            symbol: Trading pair the archives hold (e.g. BTC/USDT)
+            directory: Directory with the archives, searched recursively
+            timeframes: Timeframes to import (every timeframe found if None)
+            max_workers: Number of processes reading archives
+        """
+        name = archive_symbol(symbol)
+        archives: Dict[str, List[Tuple[Tuple[int, int], Path]]] = {}
+        for path in sorted(Path(directory).rglob("*.zip")):
+            parsed = parse_archive_name(path)
+            if parsed is None or parsed[0] != name:
+                continue
+            _, timeframe, period = parsed
+            if timeframes is None or timeframe in timeframes:
+                archives.setdefault(timeframe, []).append((period, path))
+
+        jobs = iter(
+            [
+                (timeframe, period, path)
+                for timeframe in sorted(archives)
+                for period, path in sorted(archives[timeframe])
+            ]
+        )
+        workers = max_workers or os.cpu_count() or 1
+
+        now_ts = int(time.time() * 1000)
+        imported = {timeframe: 0 for timeframe in archives}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Only a few archives are read ahead of the one being written
+            pending: Deque[Tuple[str, Tuple[int, int], Future]] = deque()
+            # One write per run of adjacent periods, up to IMPORT_BATCH
+            # candles, keeps merging linear and memory bounded
+            batch: List[Tuple[np.ndarray, np.ndarray]] = []
+            batch_timeframe, batch_first, batch_last, batch_size = None, 0, 0, 0
+            while True:
+                for timeframe, period, path in islice(
+                    jobs, READ_AHEAD * workers - len(pending)
+                ):
+                    future = executor.submit(read_kline_archive, str(path))
+                    pending.append((timeframe, period, future))
+                if not pending:
+                    break
+
+                timeframe, (first, last), future = pending.popleft()
+                if batch and (
+                    timeframe != batch_timeframe
+                    or first > batch_last + 1
+                    or batch_size >= IMPORT_BATCH
+                ):
+                    imported[batch_timeframe] += self._write_archives(
+                        symbol, batch_timeframe, batch, batch_first, batch_last, now_ts
+                    )
+                    batch = []
+                if not batch:
+                    batch_timeframe, batch_first, batch_last = timeframe, first, last
+                    batch_size = 0
+
+                timestamps, values = future.result()
+                batch.append((timestamps, values))
+                batch_size += len(timestamps)
+                batch_last = max(batch_last, last)
 
-                print(
-                    f"Attempt {attempt + 1} failed. Retrying in {retry_delay} seconds..."
+            if batch:
+                imported[batch_timeframe] += self._write_archives(
+                    symbol, batch_timeframe, batch, batch_first, batch_last, now_ts
                 )
-                time.sleep(retry_delay)
+
+        return imported
+
+    def _write_archives(
+        self,
+        symbol: str,
+        timeframe: str,
+        batch: List[Tuple[np.ndarray, np.ndarray]],
+        first: int,
+        last: int,
+        now_ts: int,
+    ) -> int:
+        """Write the candles of adjacent archives, returns how many there are"""
+        timestamps = np.concatenate([t for t, _ in batch])
+        values = np.concatenate([v for _, v in batch])
+        # Candles still forming are not covered yet
+        forming_ts = floor_timestamp(now_ts, timeframe)
+        self.store.write(
+            self.exchange_id,
+            symbol,
+            timeframe,
+            to_frame(timestamps, values),
+            covered=(first, min(last, forming_ts - 1)),
+        )
+        return len(timestamps)
+
+    def _fetch_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_ts: Optional[int],
+        end_ts: Optional[int],
+    ) -> pd.DataFrame:
+        """Fetch the candles between two timestamps (inclusive)"""
+
+        df = self.fetch_once(
+            symbol,
+            timeframe,
+            from_milliseconds(start_ts),
+            from_milliseconds(end_ts),
+        )
+
+        # Convert timestamp to datetime
+        timestamps = df.pop("timestamp").to_numpy(dtype="int64")
+        df.index = to_datetime_index(timestamps)
+
+        # Filter by date range if provided, candles come sorted
+        lo = 0 if start_ts is None else np.searchsorted(timestamps, start_ts)
+        hi = (
+            len(timestamps)
+            if end_ts is None
+            else np.searchsorted(timestamps, end_ts, "right")
+        )
+
+        return df.iloc[lo:hi]
 
     @abstractmethod
     def fetch_once(
@@ -79,41 +277,136 @@ class Client(ABC):
         """Fetch data"""
         pass
 
-    def _get_cache_key(
+    def _get_missing_ranges(
         self,
         symbol: str,
         timeframe: str,
-        start_date: Optional[datetime],
-        end_date: Optional[datetime],
-    ) -> str:
-        """Generate a unique cache key for the given parameters"""
-        keys = [
-            symbol,
-            timeframe,
-            # ! Keeps the cache by hours.
-            start_date.strftime("%Y%m%d%H") if start_date else "none",
-            end_date.strftime("%Y%m%d%H") if end_date else "none",
-        ]
-        return slugify("-".join(keys), separator="_")
-
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get the full path for a cache file"""
-        return self.cache_dir / f"{cache_key}.pkl"
-
-    def _save_to_cache(self, df: pd.DataFrame, cache_key: str):
-        """Save DataFrame to cache"""
-        cache_path = self._get_cache_path(cache_key)
-        with open(cache_path, "wb") as f:
-            pickle.dump(df, f)
-            df.to_csv(self._get_cache_path(cache_key + ".csv"), index=False)
-
-    def _load_from_cache(self, cache_key: str) -> Optional[pd.DataFrame]:
-        """Load DataFrame from cache if it exists"""
-        cache_path = self._get_cache_path(cache_key)
-        if cache_path.exists():
-            try:
-                with open(cache_path, "rb") as f:
-                    return pickle.load(f)
-            except (pickle.UnpicklingError, EOFError):
-                return None
-        return None
+        start_ts: Optional[int],
+        end_ts: Optional[int],
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Find the ranges of [start_ts, end_ts] the cache does not cover:
+        the head, interior gaps and the tail up to now.
+        """
+        covered = self.store.covered_ranges(self.exchange_id, symbol, timeframe)
+        if start_ts is None:
+            if not covered:
+                # Let the exchange pick its most recent candles
+                return [(None, end_ts)]
+            # Only top up the tail of the most recent cached run
+            start_ts = covered[-1][0]
+
+        last_ts = end_ts if end_ts is not None else int(time.time() * 1000)
+
+        missing = []
+        cursor = start_ts
+        for first, last in covered + [(last_ts + 1, last_ts + 1)]:
+            if last < cursor:
+                continue
+            gap_last = min(first - 1, last_ts)
+            # Skip gaps too narrow to hold the open time of any candle
+            if gap_last >= cursor and floor_timestamp(gap_last, timeframe) >= cursor:
+                missing.append((cursor, gap_last))
+            cursor = max(cursor, last + 1)
+            if cursor > last_ts:
+                break
+
+        return missing
+
+    def _resample_from_cache(
+        self,
+        symbol: str,
+        timeframe: str,
+        missing: List[Tuple[Optional[int], Optional[int]]],
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Derive missing ranges from finer timeframes in the cache and cache the
+        result. Returns the ranges that still have to be fetched.
+        """
+        bases = sorted(
+            (
+                base
+                for base in self.store.timeframes(self.exchange_id, symbol)
+                if can_resample(base, timeframe)
+            ),
+            key=timeframe_to_milliseconds,
+            # Coarser bases have fewer candles to aggregate
+            reverse=True,
+        )
+        step = timeframe_to_milliseconds(timeframe)
+
+        for base in bases:
+            base_step = timeframe_to_milliseconds(base)
+            covered = self.store.covered_ranges(self.exchange_id, symbol, base)
+            remaining = []
+            for first, last in missing:
+                if first is None or last is None:
+                    remaining.append((first, last))
+                    continue
+
+                for covered_first, covered_last in covered:
+                    # Candles whose base candles all open in the covered range
+                    lo = ceil_timestamp(max(first, covered_first), timeframe)
+                    hi = min(last, covered_last - step + base_step)
+                    if hi < lo or floor_timestamp(hi, timeframe) < lo:
+                        continue
+
+                    base_df = self.store.read(
+                        self.exchange_id,
+                        symbol,
+                        base,
+                        lo,
+                        floor_timestamp(hi, timeframe) + step - 1,
+                    )
+                    self.store.write(
+                        self.exchange_id,
+                        symbol,
+                        timeframe,
+                        resample_ohlcv(base_df, timeframe),
+                        covered=(lo, hi),
+                    )
+
+                    if first < lo:
+                        remaining.append((first, lo - 1))
+                    first = hi + 1
+                    if first > last:
+                        break
+
+                if first <= last:
+                    remaining.append((first, last))
+
+            # Drop leftovers too narrow to hold the open time of any candle
+            missing = [
+                (first, last)
+                for first, last in remaining
+                if first is None
+                or last is None
+                or floor_timestamp(last, timeframe) >= first
+            ]
+
+        return missing
+
+    def _save_to_cache(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        start_ts: Optional[int],
+        end_ts: Optional[int],
+    ):
+        """Save fetched candles to the cache and mark their range as covered"""
+
+        # The candle open right now is still forming, so it is not covered
+        # yet and gets fetched again by the next call.
+        forming_ts = floor_timestamp(int(time.time() * 1000), timeframe)
+        timestamps = df.index.as_unit("ms").asi8
+
+        if start_ts is None and len(timestamps) > 0:
+            start_ts = int(timestamps[0])
+        end_ts = forming_ts - 1 if end_ts is None else min(end_ts, forming_ts - 1)
+
+        covered = (start_ts, end_ts) if start_ts is not None else None
+        if covered and covered[1] < covered[0]:
+            covered = None
+
+        self.store.write(self.exchange_id, symbol, timeframe, df, covered)
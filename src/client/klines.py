@@ -0,0 +1,78 @@
+from typing import List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class KlineBuffer:
+    """
+    Growable columnar buffer for kline pages.
+
+    Pages are written straight into preallocated typed arrays, int64 open
+    times and a (candles x 5) block of OHLCV values, instead of collecting
+    every candle as a Python list. The arrays grow in chunks when full.
+    """
+
+    CHUNK = 64 * 1024  # candles
+
+    def __init__(self, capacity: int = 0, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+        self.values = np.empty((capacity, len(COLUMNS)), dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def reserve(self, capacity: int):
+        """Grow the arrays to hold at least `capacity` candles"""
+        if capacity <= len(self.timestamps):
+            return
+
+        capacity = -(-capacity // self.CHUNK) * self.CHUNK
+        timestamps = np.empty(capacity, dtype=np.int64)
+        values = np.empty((capacity, len(COLUMNS)), dtype=self.dtype)
+        timestamps[: self.size] = self.timestamps[: self.size]
+        values[: self.size] = self.values[: self.size]
+        self.timestamps, self.values = timestamps, values
+
+    def extend(self, klines: Sequence[Sequence[float]]):
+        """Append a page of `[timestamp, open, high, low, close, volume]` rows"""
+        self.reserve(self.size + len(klines))
+        self.size += self.write(self.size, klines, len(klines))
+
+    def write(
+        self, offset: int, klines: Sequence[Sequence[float]], capacity: int
+    ) -> int:
+        """
+        Write a page at `offset` without growing the arrays, keeping at most
+        `capacity` rows. Returns the number of rows written.
+        """
+        if len(klines) == 0 or capacity <= 0:
+            return 0
+
+        # One float64 array per page; millisecond timestamps are exact in it
+        page = np.asarray(klines, dtype=np.float64)[:capacity]
+        count = len(page)
+        self.timestamps[offset : offset + count] = page[:, 0]
+        self.values[offset : offset + count] = page[:, 1:6]
+        return count
+
+    def compact(self, regions: List[Tuple[int, int]]):
+        """Move `(offset, count)` regions written in order next to each other"""
+        size = 0
+        for offset, count in regions:
+            if offset != size:
+                self.timestamps[size : size + count] = self.timestamps[
+                    offset : offset + count
+                ]
+                self.values[size : size + count] = self.values[offset : offset + count]
+            size += count
+        self.size = size
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build a DataFrame viewing the buffer's arrays"""
+        df = pd.DataFrame(self.values[: self.size], columns=COLUMNS, copy=False)
+        df.insert(0, "timestamp", self.timestamps[: self.size])
+        return df
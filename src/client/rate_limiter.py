@@ -0,0 +1,26 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter shared by concurrent requests to one exchange.
+
+    Every caller reserves the next free slot, so requests leave at most
+    once per `interval` seconds no matter how many threads issue them.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        """Block until the caller may send its request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,314 @@
+import json
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import ccxt
+import numpy as np
+import pandas as pd
+from slugify import slugify
+
+from .timeframe import floor_timestamp, timeframe_to_milliseconds, to_milliseconds
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Base candles aggregated at a time into coarser synthetic candles
+SYNTHETIC_BLOCK = 1 << 20
+
+
+class ReplayExchange:
+    """
+    Offline stand-in for a ccxt exchange.
+
+    Serves `fetch_ohlcv` pages, tickers and order books from local files in
+    `data_dir` or, for series without a file, from a deterministic synthetic
+    generator. Latency, errors and rate limits can be injected, so pagination
+    throughput, retries and cache top-up can be measured without network.
+
+    Synthetic candles coarser than `base_timeframe` are aggregated from the
+    base ones, so they equal the candles resampled from a finer timeframe.
+
+    Layout of `data_dir`:
+        <symbol slug>/<timeframe>.csv    timestamp,open,high,low,close,volume
+        <symbol slug>/order_book.json    {"bids": [[price, amount], ...], "asks": ...}
+    """
+
+    id = "replay"
+
+    # Finest synthetic timeframe, the others are aggregated from it
+    base_timeframe = "1m"
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        symbols: Tuple[str, ...] = ("BTC/USDT", "ETH/USDT"),
+        seed: int = 0,
+        start: datetime = datetime(2017, 1, 1),
+        now: Optional[datetime] = None,
+        page_limit: int = 1000,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        rateLimit: int = 50,
+    ):
+        """
+        Initialize the exchange.
+
+        Args:
+            data_dir: Directory with recorded candles and order books
+            symbols: Symbols listed as markets for the synthetic generator
+            seed: Seed of the synthetic generator and of the injected errors
+            start: First synthetic candle
+            now: Frozen current time (the wall clock if None)
+            page_limit: Maximum number of candles served per request
+            latency: Seconds every request takes
+            error_rate: Probability of a request failing with a network error
+            rate_limit: Requests per second above which requests are
+                rejected with `RateLimitExceeded` (unlimited if None)
+            rateLimit: Milliseconds between requests advertised to clients,
+                as on a ccxt exchange
+        """
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.symbols = symbols
+        self.seed = seed
+        self.start_ts = to_milliseconds(start)
+        self.now_ts = to_milliseconds(now)
+        self.page_limit = page_limit
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rateLimit = rateLimit
+        self.enableRateLimit = False
+        self.markets = None
+
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._recent_requests = deque()
+        self._minute_requests = deque()
+        self.last_response_headers = {}
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], Optional[np.ndarray]] = {}
+
+    def load_markets(self) -> dict:
+        self._simulate_request()
+        symbols = set(self.symbols)
+        if self.data_dir is not None:
+            symbols.update(
+                path.name.upper().replace("_", "/")
+                for path in self.data_dir.iterdir()
+                if path.is_dir()
+            )
+        self.markets = {symbol: {"symbol": symbol} for symbol in sorted(symbols)}
+        return self.markets
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[dict] = None,
+    ) -> List[list]:
+        self._simulate_request()
+        limit = min(limit or self.page_limit, self.page_limit)
+        return [
+            [int(candle[0]), *candle[1:]]
+            for candle in self._candles(symbol, timeframe, since, limit).tolist()
+        ]
+
+    def fetch_ticker(self, symbol: str, params: Optional[dict] = None) -> dict:
+        self._simulate_request()
+        candles = self._candles(symbol, "1m", None, 1)
+        timestamp, _, high, low, close, volume = candles[-1].tolist()
+        return {
+            "symbol": symbol,
+            "timestamp": int(timestamp),
+            "high": high,
+            "low": low,
+            "bid": close,
+            "ask": close,
+            "last": close,
+            "close": close,
+            "baseVolume": volume,
+        }
+
+    def fetch_order_book(
+        self, symbol: str, limit: Optional[int] = None, params: Optional[dict] = None
+    ) -> dict:
+        self._simulate_request()
+        limit = limit or 100
+
+        path = self._symbol_dir(symbol) / "order_book.json" if self.data_dir else None
+        if path is not None and path.exists():
+            with open(path, "r") as f:
+                book = json.load(f)
+            bids, asks = book["bids"], book["asks"]
+        else:
+            # Synthetic levels spreading 1bp apart around the last price
+            close = self._candles(symbol, "1m", None, 1)[-1, 4]
+            levels = np.arange(1, limit + 1)
+            amounts = 1 + self._noise(symbol, levels) ** 2
+            bids = np.column_stack([close * (1 - levels * 1e-4), amounts]).tolist()
+            asks = np.column_stack([close * (1 + levels * 1e-4), amounts]).tolist()
+
+        return {
+            "symbol": symbol,
+            "bids": bids[:limit],
+            "asks": asks[:limit],
+            "timestamp": self._now(),
+            "nonce": None,
+        }
+
+    def fetch_balance(self, params: Optional[dict] = None) -> dict:
+        self._simulate_request()
+        return {"free": {}, "used": {}, "total": {}}
+
+    def _simulate_request(self):
+        """Account a request and inject the configured latency and failures"""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+
+            # Report the requests of the last minute as used weight
+            self._minute_requests.append(now)
+            while self._minute_requests[0] <= now - 60:
+                self._minute_requests.popleft()
+            self.last_response_headers = {
+                "X-MBX-USED-WEIGHT-1M": str(len(self._minute_requests))
+            }
+
+            if self.rate_limit is not None:
+                while self._recent_requests and self._recent_requests[0] <= now - 1:
+                    self._recent_requests.popleft()
+                self._recent_requests.append(now)
+                if len(self._recent_requests) > self.rate_limit:
+                    self.errors += 1
+                    raise ccxt.RateLimitExceeded("replay 429 Too Many Requests")
+
+            failure = self._random.random() < self.error_rate
+            timeout = self._random.random() < 0.5
+            if failure:
+                self.errors += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if failure:
+            if timeout:
+                raise ccxt.RequestTimeout("replay request timed out")
+            raise ccxt.NetworkError("replay connection reset")
+
+    def _candles(
+        self, symbol: str, timeframe: str, since: Optional[int], limit: int
+    ) -> np.ndarray:
+        """Get up to `limit` candles from `since` (the latest ones if None)"""
+        recorded = self._recorded(symbol, timeframe)
+        if recorded is not None:
+            if since is None:
+                return recorded[-limit:]
+            first = np.searchsorted(recorded[:, 0], since, "left")
+            return recorded[first : first + limit]
+
+        step = timeframe_to_milliseconds(timeframe)
+        last = floor_timestamp(self._now(), timeframe)
+        if since is None:
+            first = max(last - (limit - 1) * step, self.start_ts)
+        else:
+            first = max(since, self.start_ts)
+        # Align to the first candle open at or after `first`
+        first = floor_timestamp(first - 1, timeframe) + step
+        timestamps = np.arange(first, min(first + limit * step, last + 1), step)
+        return self._synthetic(symbol, timestamps, step)
+
+    def _recorded(self, symbol: str, timeframe: str) -> Optional[np.ndarray]:
+        """Load a recorded series as a (candles x 6) array, once"""
+        key = (symbol, timeframe)
+        with self._lock:
+            if key not in self._series:
+                path = (
+                    self._symbol_dir(symbol) / f"{timeframe}.csv"
+                    if self.data_dir
+                    else None
+                )
+                self._series[key] = (
+                    pd.read_csv(path)[
+                        ["timestamp", "open", "high", "low", "close", "volume"]
+                    ]
+                    .sort_values("timestamp")
+                    .to_numpy(dtype=np.float64)
+                    if path is not None and path.exists()
+                    else None
+                )
+            return self._series[key]
+
+    def _synthetic(self, symbol: str, timestamps: np.ndarray, step: int) -> np.ndarray:
+        """Generate candles as a pure function of the open time"""
+        base = timeframe_to_milliseconds(self.base_timeframe)
+        if step <= base or step % base:
+            return self._base_candles(symbol, timestamps, step)
+
+        # Aggregate the base candles every candle opens, a block at a time
+        per = step // base
+        offsets = np.arange(per, dtype=np.int64) * base
+        candles = np.empty((len(timestamps), 6))
+        chunk = max(SYNTHETIC_BLOCK // per, 1)
+        for first in range(0, len(timestamps), chunk):
+            opens = timestamps[first : first + chunk]
+            parts = self._base_candles(
+                symbol, (opens[:, None] + offsets).ravel(), base
+            ).reshape(len(opens), per, 6)
+            candles[first : first + chunk] = np.column_stack(
+                [
+                    opens,
+                    parts[:, 0, 1],
+                    parts[:, :, 2].max(axis=1),
+                    parts[:, :, 3].min(axis=1),
+                    parts[:, -1, 4],
+                    parts[:, :, 5].sum(axis=1),
+                ]
+            )
+        return candles
+
+    def _base_candles(
+        self, symbol: str, timestamps: np.ndarray, step: int
+    ) -> np.ndarray:
+        """Generate candles of the base timeframe (or finer)"""
+        close = self._price(symbol, timestamps + step)
+        open_ = self._price(symbol, timestamps)
+        high = np.maximum(open_, close) * (
+            1 + 0.005 * self._noise(symbol, timestamps + 1) ** 2
+        )
+        low = np.minimum(open_, close) * (
+            1 - 0.005 * self._noise(symbol, timestamps + 2) ** 2
+        )
+        volume = 1000 * (1 + self._noise(symbol, timestamps + 3) ** 2) * step / 60_000
+        return np.column_stack([timestamps, open_, high, low, close, volume])
+
+    def _price(self, symbol: str, timestamps: np.ndarray) -> np.ndarray:
+        days = timestamps / DAY_MS
+        return 100 * np.exp(
+            0.3 * np.sin(2 * np.pi * days / 90)
+            + 0.1 * np.sin(2 * np.pi * days / 7)
+            + 0.01 * self._noise(symbol, timestamps)
+        )
+
+    def _noise(self, symbol: str, values: np.ndarray) -> np.ndarray:
+        """Hash values to deterministic noise in [-1, 1] (splitmix64)"""
+        key = zlib.crc32(f"{self.seed}:{symbol}".encode())
+        x = np.asarray(values, dtype=np.int64).astype(np.uint64) + np.uint64(key)
+        x = x * np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+        return (x >> np.uint64(11)).astype(np.float64) / 2.0**52 - 1
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.data_dir / slugify(symbol, separator="_")
+
+    def _now(self) -> int:
+        return self.now_ts if self.now_ts is not None else int(time.time() * 1000)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from .timeframe import WEEK_OFFSET_MS, timeframe_to_milliseconds, to_datetime_index
+
+
+def can_resample(base: str, timeframe: str) -> bool:
+    """Check whether every candle of `timeframe` is made of whole `base` candles"""
+    if base.endswith(("w", "M")) or timeframe.endswith("M"):
+        return False
+
+    base_step = timeframe_to_milliseconds(base)
+    step = timeframe_to_milliseconds(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe.endswith("w") else 0
+    return base_step < step and step % base_step == 0 and offset % base_step == 0
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Aggregate sorted candles into a coarser timeframe: first open, highest
+    high, lowest low, last close and summed volume of every bucket.
+    """
+    if df.empty:
+        return df.copy()
+
+    step = timeframe_to_milliseconds(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe.endswith("w") else 0
+
+    timestamps = df.index.as_unit("ms").asi8
+    buckets = (timestamps - offset) // step * step + offset
+    # Candles come sorted, so every bucket is one contiguous run
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[:1] - 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    return pd.DataFrame(
+        {
+            "open": df["open"].to_numpy()[starts],
+            "high": np.maximum.reduceat(df["high"].to_numpy(), starts),
+            "low": np.minimum.reduceat(df["low"].to_numpy(), starts),
+            "close": df["close"].to_numpy()[ends],
+            "volume": np.add.reduceat(df["volume"].to_numpy(), starts),
+        },
+        index=to_datetime_index(buckets[starts]),
+    )
@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from typing import Callable, Optional
+import ccxt
+
+from .rate_limiter import RateLimiter
+
+
+class RequestScheduler:
+    """
+    Adaptive, rate-limit-aware scheduler for the requests to one exchange.
+
+    Requests are spaced by a shared `RateLimiter` whose interval follows the
+    request weight the exchange reports (e.g. Binance's `X-MBX-USED-WEIGHT-1M`
+    header): it slows down as the used weight approaches the limit and speeds
+    back up to the exchange's nominal rate when there is room. A request that
+    is rejected (429) or times out is retried on its own with exponential
+    backoff and full jitter, so callers never lose the requests that already
+    succeeded.
+    """
+
+    WEIGHT_HEADERS = ("x-mbx-used-weight-1m", "x-mbx-used-weight")
+    # Share of the weight limit to stay under
+    TARGET_USAGE = 0.8
+
+    def __init__(
+        self,
+        exchange,
+        max_retries: int = 5,
+        retry_delay: float = 1.0,
+        max_delay: float = 60.0,
+        weight_limit: Optional[int] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            exchange: ccxt exchange (or compatible object) to send requests to
+            max_retries: Attempts of a single request before giving up
+            retry_delay: Base delay of the exponential backoff in seconds
+            max_delay: Longest delay between two attempts in seconds
+            weight_limit: Request weight allowed per minute, derived from the
+                exchange's nominal `rateLimit` if None
+        """
+        self.exchange = exchange
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+
+        self.min_interval = exchange.rateLimit / 1000
+        if weight_limit is None and self.min_interval > 0:
+            weight_limit = int(60 / self.min_interval)
+        self.weight_limit = weight_limit
+        self.rate_limiter = RateLimiter(self.min_interval)
+
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self._last_throttle = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, method: Callable, **kwargs):
+        """Send a request, retrying only this request on transient failures"""
+        for attempt in range(self.max_retries):
+            self.rate_limiter.acquire()
+            try:
+                result = method(**kwargs)
+            except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+                self._throttle()
+                if attempt == self.max_retries - 1:
+                    raise
+                self._backoff(attempt, self._retry_after())
+            except (ccxt.NetworkError, ccxt.RequestTimeout):
+                if attempt == self.max_retries - 1:
+                    raise
+                self._backoff(attempt)
+            else:
+                with self._lock:
+                    self.requests += 1
+                self._observe_weight()
+                return result
+
+    def _throttle(self):
+        """Halve the throughput, once per second however many requests failed"""
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._last_throttle < 1:
+                return
+            self._last_throttle = now
+        self._set_interval(
+            max(self.rate_limiter.interval, self.min_interval, 0.001) * 2
+        )
+
+    def _backoff(self, attempt: int, minimum: float = 0.0):
+        with self._lock:
+            self.retries += 1
+        delay = random.uniform(0, min(self.max_delay, self.retry_delay * 2**attempt))
+        time.sleep(max(delay, minimum))
+
+    def _observe_weight(self):
+        """Adjust the request interval to the weight used in this minute"""
+        used = self._header(*self.WEIGHT_HEADERS)
+        interval = self.rate_limiter.interval
+        if used is None or not self.weight_limit:
+            # Recover from past throttling once requests go through again
+            self._set_interval(interval * 0.9)
+            return
+
+        usage = float(used) / self.weight_limit
+        if usage > self.TARGET_USAGE:
+            self._set_interval(interval * (1 + 4 * (usage - self.TARGET_USAGE)))
+        else:
+            self._set_interval(interval * 0.9)
+
+    def _retry_after(self) -> float:
+        retry_after = self._header("retry-after")
+        try:
+            return float(retry_after) if retry_after is not None else 0.0
+        except ValueError:
+            return 0.0
+
+    def _header(self, *names: str) -> Optional[str]:
+        headers = getattr(self.exchange, "last_response_headers", None) or {}
+        lowered = {str(key).lower(): value for key, value in headers.items()}
+        for name in names:
+            if name in lowered:
+                return lowered[name]
+        return None
+
+    def _set_interval(self, interval: float):
+        self.rate_limiter.interval = min(
+            max(interval, self.min_interval), self.max_delay
+        )
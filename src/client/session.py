@@ -0,0 +1,72 @@
+import threading
+from typing import Dict
+import ccxt
+from requests.adapters import HTTPAdapter
+
+from .scheduler import RequestScheduler
+
+
+class ExchangeSession:
+    """
+    Exchange connection shared by every client of a process.
+
+    Holds a single ccxt exchange object, so all clients reuse its pooled
+    HTTP session, load the markets once and spend one rate-limit budget.
+    Any object with the ccxt exchange interface can be wrapped, such as
+    the offline `ReplayExchange`.
+    """
+
+    _sessions: Dict[str, "ExchangeSession"] = {}
+    _sessions_lock = threading.Lock()
+
+    def __init__(self, exchange, pool_size: int = 32):
+        self.exchange = exchange
+
+        # Requests are spaced by our own scheduler, which unlike the built-in
+        # limiter is shared safely between the threads using the session
+        self.exchange.enableRateLimit = False
+        self.scheduler = RequestScheduler(self.exchange)
+
+        # Keep a connection per concurrent request instead of the default 10
+        if getattr(self.exchange, "session", None) is not None:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.exchange.session.mount("https://", adapter)
+            self.exchange.session.mount("http://", adapter)
+
+        self._markets_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, exchange_id: str, pool_size: int = 32) -> "ExchangeSession":
+        """Get the session of an exchange, creating it on first use"""
+        with cls._sessions_lock:
+            if exchange_id not in cls._sessions:
+                cls._sessions[exchange_id] = cls(
+                    cls.build_exchange(exchange_id), pool_size
+                )
+            return cls._sessions[exchange_id]
+
+    @staticmethod
+    def build_exchange(exchange_id: str) -> ccxt.Exchange:
+        """Create a public ccxt exchange configured for fetching history"""
+        exchange = getattr(ccxt, exchange_id)()
+        # Increase timeout values
+        exchange.timeout = 30000  # 30 seconds
+
+        # Configure exchange-specific options
+        if exchange_id == "binance":
+            exchange.options.update(
+                {
+                    "adjustForTimeDifference": True,
+                    "recvWindow": 60000,
+                    "defaultType": "future",  # Since we're using dapi
+                    "defaultNetwork": "BSC",
+                }
+            )
+
+        return exchange
+
+    def load_markets(self):
+        """Load the markets once, even when called from several threads"""
+        with self._markets_lock:
+            if not self.exchange.markets:
+                self.scheduler.call(self.exchange.load_markets)
@@ -0,0 +1,121 @@
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# What a process needs to attach to a shared array: name, shape and dtype
+SharedSpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedArray:
+    """
+    NumPy array in shared memory. Worker processes attach to it by its
+    `spec` instead of receiving a pickled copy of the data; only the
+    process that created it removes it.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        dtype: str = "float64",
+        name: Optional[str] = None,
+    ):
+        """
+        Create a shared array, or attach to an existing one.
+
+        Args:
+            shape: Shape of the array
+            dtype: Data type of the array
+            name: Name of an existing shared array to attach to
+        """
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=size if self.owner else 0
+        )
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf)
+
+    @classmethod
+    def copy_of(cls, array: np.ndarray) -> "SharedArray":
+        """Create a shared array holding a copy of `array`"""
+        shared = cls(array.shape, array.dtype.str)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spec: SharedSpec) -> "SharedArray":
+        """Attach to the shared array of a spec"""
+        name, shape, dtype = spec
+        return cls(shape, dtype, name)
+
+    @property
+    def spec(self) -> SharedSpec:
+        return self.memory.name, self.array.shape, self.array.dtype.str
+
+    def close(self):
+        """Detach from the array, and remove it if this process created it"""
+        # The buffer can't be released while an array still points to it
+        self.array = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# What a process needs to attach to a shared frame: its values (columns x
+# rows), its index, the column names and the index name
+FrameSpec = Tuple[SharedSpec, SharedSpec, List[str], Optional[str]]
+
+
+class SharedFrame:
+    """
+    Numeric DataFrame, such as OHLCV candles, in shared memory. The frame
+    of a process that attaches to it reads the shared values in place.
+    """
+
+    def __init__(self, values: SharedArray, index: SharedArray, spec: FrameSpec):
+        self.values = values
+        self.index = index
+        self._spec = spec
+        # Each column is a contiguous row of the shared values
+        self.frame = pd.DataFrame(
+            values.array.T,
+            index=pd.Index(index.array, name=spec[3], copy=False),
+            columns=spec[2],
+            copy=False,
+        )
+
+    @classmethod
+    def copy_of(cls, data: pd.DataFrame) -> "SharedFrame":
+        """Create a shared frame holding a copy of `data`"""
+        values = SharedArray.copy_of(data.to_numpy(dtype="float64").T)
+        index = SharedArray.copy_of(data.index.to_numpy())
+        spec = (values.spec, index.spec, list(data.columns), data.index.name)
+        return cls(values, index, spec)
+
+    @classmethod
+    def attach(cls, spec: FrameSpec) -> "SharedFrame":
+        """Attach to the shared frame of a spec"""
+        values, index, _, _ = spec
+        return cls(SharedArray.attach(values), SharedArray.attach(index), spec)
+
+    @property
+    def spec(self) -> FrameSpec:
+        return self._spec
+
+    def close(self):
+        """Detach from the frame, and remove it if this process created it"""
+        self.frame = None
+        self.values.close()
+        self.index.close()
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
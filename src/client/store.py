@@ -0,0 +1,440 @@
+import json
+import os
+import pickle
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+from slugify import slugify
+
+from .lru import LruCache
+from .timeframe import floor_timestamp, timeframe_to_milliseconds, to_datetime_index
+
+Range = Tuple[int, int]
+
+# Key format of the pickle cache used before the columnar store:
+# `<symbol>_<timeframe>_<start hour|none>_<end hour|none>.pkl`
+LEGACY_KEY_SUFFIX = re.compile(r"^(\d{10}|none)_(\d{10}|none)$")
+
+
+class Series(NamedTuple):
+    meta: dict
+    columns: Dict[str, np.ndarray]
+
+
+class OhlcvStore:
+    """
+    Columnar two-tier store for OHLCV candles.
+
+    On disk every series is partitioned by exchange/symbol/timeframe into
+    its own directory holding one `.npy` file per column, so a series can be
+    opened memory-mapped and sliced by time range without loading the whole
+    file. A `meta.json` next to the columns lists the time ranges (inclusive,
+    in milliseconds) that have been fetched for the series.
+
+    Series that fit are kept in a bounded in-memory LRU in front of the disk.
+    Series read from disk stay memory-mapped in it, counted by their full
+    size, so reading a short range of a long series never loads all of it.
+    A `manifest.json` at the root records the size and last access of every
+    series on disk, and the least recently used ones are evicted once the
+    disk budget is exceeded.
+    """
+
+    COLUMNS = ["open", "high", "low", "close", "volume"]
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        root: Path,
+        max_memory_bytes: int = 512 * 1024 * 1024,
+        max_disk_bytes: Optional[int] = None,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self.memory = LruCache(max_memory_bytes)
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_evictions = 0
+
+        self._lock = threading.RLock()
+        self._manifest = self._load_manifest()
+        # Held around every read-merge-write of a series, by its key
+        self._series_locks: Dict[str, threading.Lock] = {}
+
+        # Pickles of the old cache not imported yet, listed once per directory
+        self._legacy: Dict[Path, List[Path]] = {}
+
+    def series_key(self, exchange: str, symbol: str, timeframe: str) -> str:
+        """Get the path of a series relative to the store root"""
+        return "/".join(
+            [
+                slugify(exchange),
+                slugify(symbol, separator="_"),
+                slugify(timeframe, lowercase=False),
+            ]
+        )
+
+    def series_dir(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        """Get the directory holding the columns of a series"""
+        return self.root / self.series_key(exchange, symbol, timeframe)
+
+    def timeframes(self, exchange: str, symbol: str) -> List[str]:
+        """Get the timeframes stored for a symbol"""
+        path = self.root / slugify(exchange) / slugify(symbol, separator="_")
+        if not path.is_dir():
+            return []
+        return [meta.parent.name for meta in path.glob("*/meta.json")]
+
+    def covered_ranges(self, exchange: str, symbol: str, timeframe: str) -> List[Range]:
+        """Get the time ranges already fetched for a series"""
+        series = self.memory.peek(self.series_key(exchange, symbol, timeframe))
+        if series is not None:
+            meta = series.meta
+        else:
+            meta = self._load_meta(self.series_dir(exchange, symbol, timeframe))
+        return [tuple(r) for r in meta["ranges"]] if meta else []
+
+    def open(self, exchange: str, symbol: str, timeframe: str) -> Optional[Series]:
+        """Open every column of a series memory-mapped"""
+        path = self.series_dir(exchange, symbol, timeframe)
+        meta = self._load_meta(path)
+        if meta is None:
+            return None
+
+        try:
+            columns = {
+                name: np.load(path / f"{name}.npy", mmap_mode="r")
+                for name in ["timestamp"] + self.COLUMNS
+            }
+        except (OSError, ValueError):
+            return None
+
+        # A write interrupted between the columns and the meta file
+        # leaves columns of a different length behind.
+        if any(len(column) != meta["rows"] for column in columns.values()):
+            return None
+
+        return Series(meta, columns)
+
+    def read(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Read the candles of a series between two timestamps (inclusive)"""
+        series = self._get(exchange, symbol, timeframe)
+        if series is None:
+            return pd.DataFrame(
+                {name: np.array([], dtype=np.float64) for name in self.COLUMNS},
+                index=to_datetime_index(np.array([], dtype=np.int64)),
+            )
+
+        timestamps = series.columns["timestamp"]
+        lo = 0 if start_ts is None else np.searchsorted(timestamps, start_ts, "left")
+        hi = (
+            len(timestamps)
+            if end_ts is None
+            else np.searchsorted(timestamps, end_ts, "right")
+        )
+
+        # Only the requested slice is copied out of the cached or mapped columns
+        return pd.DataFrame(
+            {name: np.array(series.columns[name][lo:hi]) for name in self.COLUMNS},
+            index=to_datetime_index(np.array(timestamps[lo:hi])),
+        )
+
+    def write(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        covered: Optional[Range],
+    ):
+        """
+        Merge candles into a series and mark `covered` as fetched.
+
+        Threads writing the same series take turns, so none of them loses
+        the candles and ranges another one merged in meanwhile.
+        """
+        key = self.series_key(exchange, symbol, timeframe)
+        with self._series_lock(key):
+            self._write(key, exchange, symbol, timeframe, df, covered)
+
+    def _write(
+        self,
+        key: str,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        covered: Optional[Range],
+    ):
+        path = self.root / key
+        path.mkdir(parents=True, exist_ok=True)
+
+        timestamps = df.index.as_unit("ms").asi8
+        columns = {name: df[name].to_numpy() for name in self.COLUMNS}
+
+        existing = self.memory.peek(key) or self.open(exchange, symbol, timeframe)
+        if existing is not None:
+            # New candles go first so they win over stale ones on duplicates
+            timestamps = np.concatenate([timestamps, existing.columns["timestamp"]])
+            columns = {
+                name: np.concatenate([values, existing.columns[name]])
+                for name, values in columns.items()
+            }
+            ranges = [tuple(r) for r in existing.meta["ranges"]]
+            del existing
+            # Don't keep columns mapped from the files about to be replaced
+            self.memory.pop(key)
+        else:
+            ranges = []
+
+        timestamps, first = np.unique(timestamps, return_index=True)
+        columns = {name: values[first] for name, values in columns.items()}
+        columns["timestamp"] = timestamps
+
+        for name, values in columns.items():
+            tmp_path = path / f"{name}.npy.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, values)
+            os.replace(tmp_path, path / f"{name}.npy")
+
+        meta = {
+            "rows": len(timestamps),
+            "ranges": merge_ranges(ranges + ([tuple(covered)] if covered else [])),
+        }
+        self._save_meta(path, meta)
+
+        size = sum(values.nbytes for values in columns.values())
+        self.memory.put(key, Series(meta, columns), size)
+
+        with self._lock:
+            self._manifest[key] = {"size": size, "last_access": time.time()}
+            self._evict(keep=key)
+            self._save_manifest()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit, miss and eviction counters of both cache tiers"""
+        with self._lock:
+            disk_bytes = sum(entry["size"] for entry in self._manifest.values())
+        return {
+            "memory_hits": self.memory.hits,
+            "memory_misses": self.memory.misses,
+            "memory_evictions": self.memory.evictions,
+            "memory_bytes": self.memory.size,
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+            "disk_evictions": self.disk_evictions,
+            "disk_bytes": disk_bytes,
+        }
+
+    def import_legacy(
+        self, cache_dir: Path, exchange: str, symbol: str, timeframe: str
+    ) -> int:
+        """
+        Import the pickled DataFrames written by the old cache for a series.
+
+        Imported pickles and their CSV copies are removed, so every entry
+        is imported only once. The directory is only listed the first time,
+        so later fetches don't scan it again. Pickles that can't be loaded
+        are skipped. Returns the number of imported entries.
+
+        The old cache lowercased the whole key, so `1m` and `1M` pickles
+        share their names; only those whose candles are spaced and aligned
+        as the timeframe's are imported, the others are left for the other
+        timeframe.
+        """
+        # The name the old cache gave, lowercase timeframe included
+        prefix = slugify(f"{symbol}-{timeframe}", separator="_") + "_"
+        with self._lock:
+            directory = Path(cache_dir)
+            if directory not in self._legacy:
+                self._legacy[directory] = sorted(
+                    path
+                    for path in directory.glob("*.pkl")
+                    if not path.name.endswith(".csv.pkl")
+                )
+            pending = self._legacy[directory]
+            paths = [
+                path
+                for path in pending
+                if path.name.startswith(prefix)
+                and LEGACY_KEY_SUFFIX.match(path.name[len(prefix) : -len(".pkl")])
+            ]
+            claimed = set(paths)
+            self._legacy[directory] = [path for path in pending if path not in claimed]
+
+        imported = 0
+        skipped = []
+        for pickle_path in paths:
+            key = pickle_path.name[: -len(".pkl")]
+
+            try:
+                with open(pickle_path, "rb") as f:
+                    df = pickle.load(f)
+                timestamps = df.index.as_unit("ms").asi8
+            except Exception:
+                # Corrupt, or of classes that moved or no longer exist
+                continue
+
+            if not _spaced_as(timestamps, timeframe):
+                skipped.append(pickle_path)
+                continue
+
+            if len(df) > 0:
+                self.write(
+                    exchange,
+                    symbol,
+                    timeframe,
+                    df,
+                    covered=(int(timestamps[0]), int(timestamps[-1])),
+                )
+
+            pickle_path.unlink()
+            pickle_path.with_name(f"{key}.csv.pkl").unlink(missing_ok=True)
+            imported += 1
+
+        if skipped:
+            with self._lock:
+                self._legacy[Path(cache_dir)].extend(skipped)
+        return imported
+
+    def _get(self, exchange: str, symbol: str, timeframe: str) -> Optional[Series]:
+        """Get a series from memory, falling back to disk"""
+        key = self.series_key(exchange, symbol, timeframe)
+        series = self.memory.get(key)
+        if series is not None:
+            return series
+
+        series = self.open(exchange, symbol, timeframe)
+        with self._lock:
+            if series is None:
+                self.disk_misses += 1
+                return None
+
+            self.disk_hits += 1
+            if key in self._manifest:
+                self._manifest[key]["last_access"] = time.time()
+                self._save_manifest()
+
+        # Cache the mapped columns as they are, so a read still only copies
+        # the rows it asks for, and the OS pages in only those
+        size = sum(column.nbytes for column in series.columns.values())
+        self.memory.put(key, series, size)
+
+        return series
+
+    def _series_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._series_locks.setdefault(key, threading.Lock())
+
+    def _evict(self, keep: str):
+        """Remove least recently used series until the disk budget is met"""
+        if self.max_disk_bytes is None:
+            return
+
+        total = sum(entry["size"] for entry in self._manifest.values())
+        by_last_access = sorted(
+            self._manifest.items(), key=lambda item: item[1]["last_access"]
+        )
+        for key, entry in by_last_access:
+            if total <= self.max_disk_bytes:
+                break
+            if key == keep:
+                continue
+            # A series being written is in use, and its lock is taken
+            # before this one, so don't wait for it
+            lock = self._series_lock(key)
+            if not lock.acquire(blocking=False):
+                continue
+
+            try:
+                self.memory.pop(key)
+                shutil.rmtree(self.root / key, ignore_errors=True)
+                self._remove_empty_parents(self.root / key)
+            finally:
+                lock.release()
+            del self._manifest[key]
+            total -= entry["size"]
+            self.disk_evictions += 1
+
+    def _remove_empty_parents(self, path: Path):
+        for parent in path.parents:
+            if parent == self.root:
+                break
+            try:
+                parent.rmdir()
+            except OSError:  # Not empty
+                break
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.root / self.MANIFEST, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        # Index series written without a manifest
+        manifest = {}
+        for meta_path in self.root.glob("*/*/*/meta.json"):
+            path = meta_path.parent
+            manifest[path.relative_to(self.root).as_posix()] = {
+                "size": sum(f.stat().st_size for f in path.glob("*.npy")),
+                "last_access": meta_path.stat().st_mtime,
+            }
+        return manifest
+
+    def _save_manifest(self):
+        tmp_path = self.root / f"{self.MANIFEST}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp_path, self.root / self.MANIFEST)
+
+    def _load_meta(self, path: Path) -> Optional[dict]:
+        try:
+            with open(path / "meta.json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_meta(self, path: Path, meta: dict):
+        tmp_path = path / "meta.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path / "meta.json")
+
+
+def _spaced_as(timestamps: np.ndarray, timeframe: str) -> bool:
+    """Check whether candles open on the timeframe's boundaries, a candle apart"""
+    if len(timestamps) == 0:
+        return True
+    if floor_timestamp(int(timestamps[0]), timeframe) != timestamps[0]:
+        return False
+    if len(timestamps) < 2:
+        return True
+    # Months are 28 to 31 days, a timeframe's length counts them as 30
+    step = timeframe_to_milliseconds(timeframe)
+    spacing = int(np.diff(timestamps).min())
+    return 0.9 * step <= spacing < 2 * step
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Merge overlapping or adjacent inclusive ranges into a sorted list"""
+    merged: List[Range] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
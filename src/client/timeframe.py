@@ -0,0 +1,86 @@
+import time
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+
+# Seconds of every timeframe unit, as ccxt counts them
+TIMEFRAME_UNITS = {
+    "y": 365 * 24 * 60 * 60,
+    "M": 30 * 24 * 60 * 60,
+    "w": 7 * 24 * 60 * 60,
+    "d": 24 * 60 * 60,
+    "h": 60 * 60,
+    "m": 60,
+    "s": 1,
+}
+
+# Weekly candles open on Monday, while the Unix epoch was a Thursday
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+
+def to_milliseconds(date: Optional[datetime]) -> Optional[int]:
+    """Convert a datetime to a UTC timestamp in milliseconds.
+
+    Naive datetimes are treated as UTC, the same way candle timestamps are.
+    """
+    if date is None:
+        return None
+    return int(pd.Timestamp(date).value // 1_000_000)
+
+
+def from_milliseconds(timestamp: Optional[int]) -> Optional[datetime]:
+    """Convert a UTC timestamp in milliseconds to a naive datetime"""
+    if timestamp is None:
+        return None
+    return pd.Timestamp(timestamp, unit="ms").to_pydatetime()
+
+
+def to_datetime_index(timestamps) -> pd.DatetimeIndex:
+    """Build the `timestamp` index used by every OHLCV DataFrame"""
+    return pd.DatetimeIndex(pd.to_datetime(timestamps, unit="ms"), name="timestamp")
+
+
+def timeframe_to_milliseconds(timeframe: str) -> int:
+    """Get the candle spacing of a timeframe (e.g. '1h' -> 3600000)
+
+    Parsed here rather than by ccxt, so that strategies and worker processes
+    don't have to import it.
+    """
+    unit = TIMEFRAME_UNITS.get(timeframe[-1:])
+    if unit is None or not timeframe[:-1].isdigit():
+        raise ValueError(f"Unknown timeframe '{timeframe}'")
+    return int(timeframe[:-1]) * unit * 1000
+
+
+def floor_timestamp(timestamp: int, timeframe: str) -> int:
+    """Get the open time of the candle containing a timestamp"""
+    if timeframe.endswith("M"):
+        month = pd.Timestamp(timestamp, unit="ms").to_period("M").start_time
+        return int(month.value // 1_000_000)
+
+    step = timeframe_to_milliseconds(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe.endswith("w") else 0
+    return (timestamp - offset) // step * step + offset
+
+
+def closed_candles(
+    data: pd.DataFrame, timeframe: str, now_ts: Optional[int] = None
+) -> pd.DataFrame:
+    """Drop the candle still forming at `now_ts` (default: now) and any after it"""
+    if now_ts is None:
+        now_ts = int(time.time() * 1000)
+    forming = pd.Timestamp(floor_timestamp(now_ts, timeframe), unit="ms")
+    if len(data) == 0 or data.index[-1] < forming:
+        return data
+    return data[data.index < forming]
+
+
+def ceil_timestamp(timestamp: int, timeframe: str) -> int:
+    """Get the open time of the first candle opening at or after a timestamp"""
+    floor = floor_timestamp(timestamp, timeframe)
+    if floor == timestamp:
+        return timestamp
+    # Month lengths vary, so step from the middle of the next month
+    if timeframe.endswith("M"):
+        return floor_timestamp(floor + 45 * 24 * 60 * 60 * 1000, timeframe)
+    return floor + timeframe_to_milliseconds(timeframe)
@@ -1,4 +1,47 @@
-from .run import run
-from .optimize_ichimoku import optimize_ichimoku
+from importlib import import_module
 
-__all__ = ["run", "optimize_ichimoku"]
+# Module and short help of every command. The module is imported when the
+# command is first used, so that starting the CLI doesn't import the
+# dependencies of every command, and the help lists the commands without
+# importing them
+COMMANDS = {
+    "run": (".run", "Test a trading strategy with historical data"),
+    "optimize": (
+        ".optimize",
+        "Optimize the parameters of a strategy using a parallel search across"
+        " multiple timeframes.",
+    ),
+    "optimize_ichimoku": (
+        ".optimize_ichimoku",
+        "Optimize Ichimoku Strategy parameters using a parallel search across"
+        " multiple timeframes.",
+    ),
+    "import_klines": (
+        ".import_klines",
+        "Import archived kline dumps into the cache without unzipping them",
+    ),
+    "portfolio": (
+        ".portfolio",
+        "Test a trading strategy on many symbols as an equally weighted portfolio",
+    ),
+    "results": (".results", "Show the best stored optimization results of a strategy"),
+}
+
+__all__ = [
+    "run",
+    "optimize",
+    "optimize_ichimoku",
+    "import_klines",
+    "portfolio",
+    "results",
+]
+
+
+def __getattr__(name: str):
+    if name in COMMANDS:
+        module, _ = COMMANDS[name]
+        command = getattr(import_module(module, __name__), name)
+        # Replace the module the import bound to the same name
+        globals()[name] = command
+        return command
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
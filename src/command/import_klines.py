@@ -0,0 +1,52 @@
+import click
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..client.ccxt import CcxtClient
+
+
+@click.command("import-klines")
+@click.option("--symbol", required=True, help="Trading pair (e.g., BTC/USDT)")
+@click.option(
+    "--path",
+    "directory",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    required=True,
+    help="Directory with zipped kline archives (e.g., BTCUSDT-1m-2024-01.zip)",
+)
+@click.option(
+    "--timeframe",
+    "timeframes",
+    multiple=True,
+    help="Timeframe to import, can be repeated (defaults to every one found)",
+)
+@click.option("--exchange", default="binance", help="Exchange the archives come from")
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Number of worker processes reading archives (defaults to CPU count)",
+)
+def import_klines(
+    symbol: str,
+    directory: Path,
+    timeframes: Tuple[str, ...],
+    exchange: str,
+    workers: Optional[int],
+):
+    """Import archived kline dumps into the cache without unzipping them"""
+
+    client = CcxtClient(exchange_id=exchange)
+    imported = client.import_archives(
+        symbol,
+        str(directory),
+        timeframes=list(timeframes) or None,
+        max_workers=workers,
+    )
+
+    if not imported:
+        click.echo(f"No archives for {symbol} found in {directory}")
+        return
+
+    for timeframe, rows in imported.items():
+        click.echo(f"{symbol} {timeframe}: imported {rows} candles")
@@ -0,0 +1,400 @@
+import click
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from tqdm import tqdm
+import pandas as pd
+
+from ..client.ccxt import CcxtClient
+from ..client.timeframe import closed_candles, timeframe_to_milliseconds
+from ..strategy.backtest import Execution
+from ..strategy.grid_search import TopResults
+from ..strategy.registry import load_strategy, strategy_names
+from ..strategy.results import ResultStore
+from ..strategy.search import SEARCHES, GridSearch, RandomSearch, Search, search
+from ..strategy.strategy import Strategy
+from ..strategy.walk_forward import walk_forward, walk_forward_folds
+from .options import execution_from_options, execution_options, optimization_options
+
+
+def format_metric(name: str, value: float) -> str:
+    """Format a metric the way `run` prints it"""
+    if name in ("total_profit", "max_drawdown", "win_rate", "exposure"):
+        return f"{value:.2%}"
+    if name in ("total_trades", "profitable_trades", "count_signals"):
+        return f"{value:.0f}"
+    return f"{value:.2f}"
+
+
+def progress_bar(total: int, desc: str) -> tqdm:
+    """Show how many parameter sets are evaluated and how fast"""
+    return tqdm(total=total, desc=desc, unit="eval", unit_scale=True)
+
+
+def echo_results(results: List[Tuple[Dict[str, Any], Dict[str, float]]], metric: str):
+    """Print ranked parameter sets with the metric they are ranked by"""
+    columns = list(dict.fromkeys([metric, "total_profit", "max_drawdown"]))
+    for rank, (params, metrics) in enumerate(results, 1):
+        values = ", ".join(
+            f"{name} {format_metric(name, metrics[name])}" for name in columns
+        )
+        click.echo(
+            f"  {rank}. {values}, trades {metrics['total_trades']}"
+            f" with {tuple(params.values())}"
+        )
+
+
+def optimize_grid(
+    strategy: Type[Strategy],
+    data: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    mode: Search,
+    execution: Execution,
+    workers: Optional[int],
+    metric: str,
+    top: int,
+    store: Optional[ResultStore] = None,
+    resume: bool = True,
+) -> Tuple[float, Optional[Dict[str, Any]]]:
+    """
+    Backtest the parameter sets the search mode chooses over all the data,
+    keeping only the best ones as the results stream in.
+
+    Returns:
+        The best value of the metric and the parameters it was made with
+    """
+    results = TopResults(top, metric)
+    with progress_bar(
+        mode.evaluations(len(data)), f"Testing combinations for {timeframe} '{symbol}'"
+    ) as progress:
+        for params, metrics in search(
+            strategy,
+            data,
+            symbol,
+            timeframe,
+            mode,
+            execution=execution,
+            metric=metric,
+            max_workers=workers,
+            progress=progress.update,
+            store=store,
+            resume=resume,
+        ):
+            results.add(params, metrics)
+
+    best = results.best()
+    if not best:
+        return float("-inf"), None
+
+    click.echo(f"\nTop {len(best)} by {metric} for {timeframe} '{symbol}':")
+    echo_results(best, metric)
+
+    params, metrics = best[0]
+    return metrics[metric], params
+
+
+def optimize_walk_forward(
+    strategy: Type[Strategy],
+    data: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    param_grid: Iterable[Dict[str, Any]],
+    combinations: int,
+    train_period: str,
+    test_period: str,
+    execution: Execution,
+    workers: Optional[int],
+    metric: str,
+) -> Tuple[float, Optional[Dict[str, Any]]]:
+    """
+    Optimize on rolling training windows and test on the bars after each.
+
+    Returns:
+        The profit of all test windows compounded, and the parameters of the
+        latest training window
+    """
+    bar = timeframe_to_milliseconds(timeframe)
+    folds = walk_forward_folds(
+        len(data),
+        timeframe_to_milliseconds(train_period) // bar,
+        timeframe_to_milliseconds(test_period) // bar,
+    )
+    if not folds:
+        click.echo(f"  Not enough bars for a {train_period} training window")
+        return float("-inf"), None
+
+    with progress_bar(
+        combinations, f"{len(folds)} folds for {timeframe} '{symbol}'"
+    ) as progress:
+        results = walk_forward(
+            strategy,
+            data,
+            symbol,
+            timeframe,
+            param_grid,
+            folds,
+            execution=execution,
+            metric=metric,
+            max_workers=workers,
+            progress=progress.update,
+        )
+    if not results:
+        return float("-inf"), None
+
+    equity = 1.0
+    for result in results:
+        fold = result.fold
+        equity *= 1 + result.test["total_profit"]
+        click.echo(
+            f"  {data.index[fold.test.start]:%Y-%m-%d} - {data.index[fold.test.stop - 1]:%Y-%m-%d}:"
+            f" train {metric} {format_metric(metric, result.train[metric])},"
+            f" test profit {result.test['total_profit']:.2%}"
+            f" with {tuple(result.params.values())}"
+        )
+
+    return equity - 1, results[-1].params
+
+
+def optimize_strategy(
+    strategy: str,
+    symbol: str,
+    timeframes: List[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    workers: Optional[int],
+    walk_forward: bool,
+    train_period: str,
+    test_period: str,
+    execution: Execution,
+    metric: str = "total_profit",
+    top: int = 5,
+    search_mode: str = "grid",
+    budget: Optional[int] = None,
+    seed: Optional[int] = None,
+    results_path: Optional[str] = None,
+    resume: bool = True,
+):
+    """
+    Search the parameter space a strategy declares on every timeframe and
+    report the best parameters.
+
+    Combinations failing the constraints of the space are pruned while
+    they are enumerated, so they are never sent to a worker. They are
+    enumerated again as they are dispatched instead of being kept, and only
+    the best results are, so memory doesn't grow with the space.
+
+    Walk-forward optimization only searches the grid or a random sample of
+    it, as every fold is evaluated on the same parameter sets.
+
+    Other optimizations store every evaluation in the database at
+    `results_path`, and skip the ones stored for the same data when
+    resuming, so an interrupted or widened optimization picks up where the
+    last one stopped. The candle still forming is left out; without an
+    `end_date`, every candle closing since changes the data, so only runs
+    up to a fixed `end_date` resume later on.
+    """
+    strategy_class = load_strategy(strategy)
+    space = strategy_class.parameter_space
+    if space is None:
+        raise click.UsageError(
+            f"Strategy '{strategy}' declares no parameters to optimize"
+        )
+    if walk_forward and SEARCHES[search_mode] not in (GridSearch, RandomSearch):
+        raise click.UsageError(
+            f"Walk-forward optimization can't search by {search_mode}, only by"
+            " grid or random"
+        )
+
+    click.echo(f"Starting {strategy} strategy optimization for '{symbol}'...")
+
+    combinations = sum(1 for _ in space)
+    click.echo(
+        f"{combinations} of {space.size} parameter combinations meet the constraints"
+    )
+
+    client = CcxtClient()
+
+    # Download only the finest timeframe, the coarser ones are resampled
+    # from it by the client
+    finest = min(timeframes, key=timeframe_to_milliseconds)
+    datasets = {
+        finest: client.fetch_retry(
+            symbol=symbol, timeframe=finest, start_date=start_date, end_date=end_date
+        )
+    }
+    datasets.update(
+        (timeframe, data)
+        for _, timeframe, data in client.fetch_many(
+            symbols=[symbol],
+            timeframes=[tf for tf in timeframes if tf != finest],
+            start_date=start_date,
+            end_date=end_date,
+        )
+    )
+
+    # Walk-forward optimizations are compared by their compounded test profit
+    score = "total_profit" if walk_forward else metric
+
+    best_overall_score = float("-inf")
+    best_overall_params = None
+    best_overall_timeframe = None
+
+    for timeframe in timeframes:
+        click.echo(f"\nTesting timeframe {timeframe} for '{symbol}'...")
+
+        # Only closed candles, so the data and its stored results stay the
+        # same until the next candle closes
+        data = closed_candles(datasets[timeframe], timeframe)
+        mode = SEARCHES[search_mode](space, combinations, budget, seed)
+        if walk_forward:
+            param_grid = (
+                mode.sample(mode.budget, set())
+                if isinstance(mode, RandomSearch) and mode.budget < combinations
+                else space
+            )
+            best_score, best_params = optimize_walk_forward(
+                strategy_class,
+                data,
+                symbol,
+                timeframe,
+                param_grid,
+                len(param_grid) if isinstance(param_grid, list) else combinations,
+                train_period,
+                test_period,
+                execution,
+                workers,
+                metric,
+            )
+        else:
+            with ResultStore(results_path) if results_path else nullcontext() as store:
+                best_score, best_params = optimize_grid(
+                    strategy_class,
+                    data,
+                    symbol,
+                    timeframe,
+                    mode,
+                    execution,
+                    workers,
+                    metric,
+                    top,
+                    store,
+                    resume,
+                )
+        if best_params is None:
+            continue
+
+        # Update overall best if current timeframe performed better
+        if best_score > best_overall_score:
+            best_overall_score = best_score
+            best_overall_params = best_params
+            best_overall_timeframe = timeframe
+
+        click.echo(f"\nResults for {timeframe} '{symbol}':")
+        click.echo(
+            f"  Best {score} is {format_metric(score, best_score)} with parameters:"
+        )
+        for name, value in best_params.items():
+            click.echo(f"    {name}: {value}")
+
+    click.echo("\nOverall optimization complete!")
+    if best_overall_params is None:
+        return
+
+    click.echo(
+        f"\nBest performing timeframe for '{symbol}' and this strategy is {best_overall_timeframe}"
+    )
+    click.echo(
+        f"  Best overall {score} is {format_metric(score, best_overall_score)} with parameters:"
+    )
+    for name, value in best_overall_params.items():
+        click.echo(f"    {name}: {value}")
+
+
+@click.command()
+@click.option(
+    "--strategy",
+    type=click.Choice(strategy_names()),
+    required=True,
+    help="Trading strategy to optimize",
+)
+@click.option("--symbol", required=True, help="Trading pair (e.g., BTC/USDT)")
+@click.option(
+    "--timeframe",
+    default="15m,1h,4h,1d",
+    help="Comma-separated list of timeframes to test (default: 15m,1h,4h,1d)",
+)
+@click.option(
+    "--start-date",
+    type=click.DateTime(),
+    help="Start date for optimization (YYYY-MM-DD)",
+)
+@click.option(
+    "--end-date", type=click.DateTime(), help="End date for optimization (YYYY-MM-DD)"
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Number of worker processes (defaults to CPU count)",
+)
+@click.option(
+    "--walk-forward",
+    is_flag=True,
+    help="Optimize on rolling training windows and test on the bars after each",
+)
+@click.option(
+    "--train-period",
+    default="180d",
+    help="Length of every walk-forward training window (default: 180d)",
+)
+@click.option(
+    "--test-period",
+    default="30d",
+    help="Length of every walk-forward test window (default: 30d)",
+)
+@optimization_options
+@execution_options
+def optimize(
+    strategy: str,
+    symbol: str,
+    timeframe: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    workers: Optional[int],
+    walk_forward: bool,
+    train_period: str,
+    test_period: str,
+    metric: str,
+    top: int,
+    search: str,
+    budget: Optional[int],
+    seed: Optional[int],
+    results_path: str,
+    resume: bool,
+    fee: float,
+    slippage: float,
+    position_size: float,
+    long_only: bool,
+):
+    """Optimize the parameters of a strategy using a parallel search across multiple timeframes."""
+
+    optimize_strategy(
+        strategy,
+        symbol,
+        [tf.strip() for tf in timeframe.split(",")],
+        start_date,
+        end_date,
+        workers,
+        walk_forward,
+        train_period,
+        test_period,
+        execution_from_options(fee, slippage, position_size, long_only),
+        metric,
+        top,
+        search,
+        budget,
+        seed,
+        results_path,
+        resume,
+    )
@@ -0,0 +1,173 @@
+import click
+
+from ..strategy.backtest import Execution
+from ..strategy.metrics import OPTIMIZATION_METRICS
+from ..strategy.results import DEFAULT_PATH
+from ..strategy.search import SEARCHES
+
+# Parameters of every strategy, named as `StrategyFactory.build` expects them
+STRATEGY_OPTIONS = [
+    # Bollinger Bands specific options
+    click.option(
+        "--bollinger-bands-period", type=int, default=20, help="Bollinger Bands period"
+    ),
+    click.option(
+        "--bollinger-bands-std",
+        type=float,
+        default=2.0,
+        help="Number of standard deviations",
+    ),
+    # Ichimoku specific options
+    click.option(
+        "--ichimoku-tenkan-period", type=int, default=9, help="Tenkan-sen period"
+    ),
+    click.option(
+        "--ichimoku-kijun-period", type=int, default=26, help="Kijun-sen period"
+    ),
+    click.option(
+        "--ichimoku-senkou-span-b-period",
+        type=int,
+        default=52,
+        help="Senkou Span B period",
+    ),
+    click.option(
+        "--ichimoku_displacement", type=int, default=26, help="Displacement period"
+    ),
+    # MA Crossover specific options
+    click.option(
+        "--ma-cross-fast-period",
+        type=int,
+        default=12,
+        help="Fast EMA period for MA-Cross",
+    ),
+    click.option(
+        "--ma-cross-slow-period",
+        type=int,
+        default=26,
+        help="Slow EMA period for MA-Cross",
+    ),
+    # MACD specific options
+    click.option(
+        "--macd-fast-period", type=int, default=12, help="Fast EMA period for MACD"
+    ),
+    click.option(
+        "--macd-slow-period", type=int, default=26, help="Slow EMA period for MACD"
+    ),
+    click.option(
+        "--macd-signal-period", type=int, default=9, help="Signal line period for MACD"
+    ),
+    # RSI specific options
+    click.option("--rsi-period", type=int, default=14, help="RSI calculation period"),
+    click.option(
+        "--rsi-overbought", type=float, default=70, help="RSI overbought threshold"
+    ),
+    click.option(
+        "--rsi-oversold", type=float, default=30, help="RSI oversold threshold"
+    ),
+]
+
+# How the signals are traded, see `execution_from_options`
+EXECUTION_OPTIONS = [
+    click.option(
+        "--fee",
+        type=float,
+        default=Execution().fee,
+        help="Fee per fill, as a fraction of the traded value",
+    ),
+    click.option(
+        "--slippage",
+        type=float,
+        default=Execution().slippage,
+        help="Price lost per fill, as a fraction of the price",
+    ),
+    click.option(
+        "--position-size",
+        type=float,
+        default=Execution().size,
+        help="Fraction of the equity a position takes",
+    ),
+    click.option(
+        "--long-only", is_flag=True, help="Only close long positions on sell signals"
+    ),
+]
+
+# Database of the results of optimizations, see `ResultStore`
+RESULTS_OPTION = click.option(
+    "--results",
+    "results_path",
+    type=click.Path(dir_okay=False),
+    default=DEFAULT_PATH,
+    help=f"SQLite database of the optimization results (default: {DEFAULT_PATH})",
+)
+
+# What an optimization maximizes, how it searches, how many of its results it
+# reports and where it stores all of them
+OPTIMIZATION_OPTIONS = [
+    click.option(
+        "--metric",
+        type=click.Choice(OPTIMIZATION_METRICS),
+        default="total_profit",
+        help="Metric to maximize (default: total_profit)",
+    ),
+    click.option(
+        "--top",
+        type=click.IntRange(min=1),
+        default=5,
+        help="Number of best parameter sets to report (default: 5)",
+    ),
+    click.option(
+        "--search",
+        type=click.Choice(list(SEARCHES)),
+        default="grid",
+        help="How parameter sets are chosen: every combination, at random, by"
+        " successive halving on the latest bars, or by a tree-structured Parzen"
+        " estimator (default: grid)",
+    ),
+    click.option(
+        "--budget",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Parameter sets to evaluate (default: a tenth of the combinations for"
+        " random and tpe, all of them for halving)",
+    ),
+    click.option(
+        "--seed", type=int, default=None, help="Seed of the random search modes"
+    ),
+    RESULTS_OPTION,
+    click.option(
+        "--resume/--no-resume",
+        default=True,
+        help="Skip the parameter sets already stored for the same data, or"
+        " evaluate and store them again (default: resume)",
+    ),
+]
+
+
+def strategy_options(command):
+    """Add the options of every strategy's parameters to a command"""
+    for option in reversed(STRATEGY_OPTIONS):
+        command = option(command)
+    return command
+
+
+def execution_options(command):
+    """Add the fee, slippage, sizing and shorting options to a command"""
+    for option in reversed(EXECUTION_OPTIONS):
+        command = option(command)
+    return command
+
+
+def optimization_options(command):
+    """Add the metric, search mode, result count and store of an optimization"""
+    for option in reversed(OPTIMIZATION_OPTIONS):
+        command = option(command)
+    return command
+
+
+def execution_from_options(
+    fee: float, slippage: float, position_size: float, long_only: bool
+) -> Execution:
+    """Get the execution the options of `execution_options` describe"""
+    return Execution(
+        fee=fee, slippage=slippage, size=position_size, short=not long_only
+    )
@@ -0,0 +1,126 @@
+import click
+from datetime import datetime
+from typing import Optional
+import numpy as np
+
+from ..client.ccxt import CcxtClient
+from ..client.timeframe import timeframe_to_milliseconds
+from ..strategy.metrics import YEAR_MS
+from ..strategy.portfolio import (
+    backtest_portfolio,
+    correlation_matrix,
+    portfolio_metrics,
+)
+from ..strategy.registry import strategy_names
+from .options import execution_from_options, execution_options, strategy_options
+
+
+@click.command()
+@click.option(
+    "--strategy",
+    type=click.Choice(strategy_names()),
+    required=True,
+    help="Trading strategy to test",
+)
+@click.option(
+    "--symbols",
+    required=True,
+    help="Comma-separated list of trading pairs (e.g., BTC/USDT,ETH/USDT)",
+)
+@click.option(
+    "--timeframe", required=True, help="Candle timeframe (1m, 5m, 15m, 1h, 4h, 1d)"
+)
+@click.option(
+    "--start-date",
+    type=click.DateTime(),
+    help="Start date for backtesting (YYYY-MM-DD)",
+)
+@click.option(
+    "--end-date", type=click.DateTime(), help="End date for backtesting (YYYY-MM-DD)"
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Number of worker processes (defaults to CPU count)",
+)
+@strategy_options
+@execution_options
+def portfolio(
+    strategy: str,
+    symbols: str,
+    timeframe: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    workers: Optional[int],
+    fee: float,
+    slippage: float,
+    position_size: float,
+    long_only: bool,
+    **options,
+):
+    """Test a trading strategy on many symbols as an equally weighted portfolio"""
+
+    symbol_list = list(dict.fromkeys(s.strip() for s in symbols.split(",")))
+    click.echo(f"Fetching {len(symbol_list)} symbols for {timeframe}...")
+
+    client = CcxtClient()
+    datasets = {
+        symbol: data
+        for symbol, _, data in client.fetch_many(
+            symbols=symbol_list,
+            timeframes=[timeframe],
+            start_date=start_date,
+            end_date=end_date,
+        )
+    }
+    for symbol in symbol_list:
+        if not len(datasets.get(symbol, [])):
+            click.echo(f"No candles for '{symbol}', skipping it")
+
+    result = backtest_portfolio(
+        datasets=datasets,
+        strategy=strategy,
+        timeframe=timeframe,
+        options=options,
+        execution=execution_from_options(fee, slippage, position_size, long_only),
+        max_workers=workers,
+    )
+    periods_per_year = YEAR_MS / timeframe_to_milliseconds(timeframe)
+    metrics = portfolio_metrics(result, periods_per_year)
+
+    # Print results
+    click.echo(f"\nStrategy: {strategy.upper()}")
+    click.echo(f"Symbols: {len(result.symbols)}")
+    click.echo(f"Timeframe: {timeframe}")
+    click.echo(f"Count bars: {len(result.index)}")
+
+    click.echo("\nPerformance by symbol")
+    for symbol, m in sorted(
+        result.metrics.items(), key=lambda item: item[1]["total_profit"], reverse=True
+    ):
+        click.echo(
+            f"  {symbol}: profit {m['total_profit']:.2%},"
+            f" drawdown {m['max_drawdown']:.2%},"
+            f" trades {m['total_trades']},"
+            f" Sharpe {m['sharpe_ratio']:.2f}"
+        )
+
+    click.echo("\nPortfolio metrics")
+    click.echo(f"  Total profit: {metrics['total_profit']:.2%}")
+    click.echo(f"  Max drawdown: {metrics['max_drawdown']:.2%}")
+    click.echo(f"  Sharpe ratio: {metrics['sharpe_ratio']:.2f}")
+    click.echo(f"  Mean correlation: {metrics['mean_correlation']:.2f}")
+
+    # The pairs that diversify the least
+    correlation = correlation_matrix(result.profit)
+    rows, columns = np.triu_indices(len(correlation), k=1)
+    pairs = correlation[rows, columns]
+    ranked = np.argsort(np.nan_to_num(pairs, nan=-np.inf))[::-1][:5]
+    if len(ranked):
+        click.echo("  Most correlated pairs:")
+    for i in ranked:
+        click.echo(
+            f"    {result.symbols[rows[i]]} / {result.symbols[columns[i]]}:"
+            f" {pairs[i]:.2f}"
+        )
@@ -0,0 +1,106 @@
+import click
+from pathlib import Path
+from typing import Tuple
+
+from ..client.timeframe import from_milliseconds
+from ..strategy.metrics import OPTIMIZATION_METRICS
+from ..strategy.registry import load_strategy, strategy_names
+from ..strategy.results import Filter, ResultStore
+from .optimize import echo_results
+from .options import RESULTS_OPTION, execution_from_options, execution_options
+
+
+@click.command()
+@click.option(
+    "--strategy",
+    type=click.Choice(strategy_names()),
+    required=True,
+    help="Trading strategy the results are of",
+)
+@click.option("--symbol", required=True, help="Trading pair (e.g., BTC/USDT)")
+@click.option(
+    "--timeframe", required=True, help="Candle timeframe (1m, 5m, 15m, 1h, 4h, 1d)"
+)
+@click.option(
+    "--metric",
+    type=click.Choice(OPTIMIZATION_METRICS),
+    default="total_profit",
+    help="Metric to rank by (default: total_profit)",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    help="Number of best parameter sets to show (default: 10)",
+)
+@click.option(
+    "--filter",
+    "filters",
+    multiple=True,
+    help="Condition on a metric, e.g. total_trades>=10 (repeat for more)",
+)
+@RESULTS_OPTION
+@execution_options
+def results(
+    strategy: str,
+    symbol: str,
+    timeframe: str,
+    metric: str,
+    top: int,
+    filters: Tuple[str, ...],
+    results_path: str,
+    fee: float,
+    slippage: float,
+    position_size: float,
+    long_only: bool,
+):
+    """Show the best stored optimization results of a strategy"""
+
+    try:
+        conditions = [Filter.parse(text) for text in filters]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--filter'")
+
+    if not Path(results_path).exists():
+        raise click.UsageError(f"No results stored in {results_path}")
+
+    strategy_class = load_strategy(strategy)
+    execution = execution_from_options(fee, slippage, position_size, long_only)
+    with ResultStore(results_path) as store:
+        dataset = store.latest_dataset(strategy_class, symbol, timeframe, execution)
+        if dataset is None:
+            raise click.UsageError(
+                f"No results of {strategy} stored for {timeframe} '{symbol}'"
+            )
+        try:
+            best = store.best(
+                strategy_class,
+                symbol,
+                timeframe,
+                execution,
+                metric,
+                top,
+                conditions,
+                dataset,
+            )
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+    click.echo(
+        f"Data of {timeframe} '{symbol}' from {from_milliseconds(dataset.start_ts)}"
+        f" to {from_milliseconds(dataset.end_ts)} ({dataset.bars} bars)"
+    )
+    if not best:
+        click.echo("No stored results meet the filters")
+        return
+
+    # Show the parameters in the order the strategy declares them
+    space = strategy_class.parameter_space
+    if space is not None:
+        best = [
+            ({name: params[name] for name in space.parameters if name in params}, m)
+            for params, m in best
+        ]
+
+    click.echo(f"\nTop {len(best)} by {metric} of {strategy}:")
+    echo_results(best, metric)
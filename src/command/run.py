@@ -3,9 +3,17 @@ import click
 from datetime import datetime
 from typing import Optional
 
-from ..client.binance import BinanceClient
 from ..client.ccxt import CcxtClient
 from ..strategy.factory import StrategyFactory
+from ..strategy.metrics import OPTIMIZATION_METRICS
+from ..strategy.registry import load_strategy, strategy_names
+from ..strategy.results import ResultStore
+from .options import (
+    RESULTS_OPTION,
+    execution_from_options,
+    execution_options,
+    strategy_options,
+)
 
 load_dotenv()
 
@@ -13,7 +21,7 @@ load_dotenv()
 @click.command()
 @click.option(
     "--strategy",
-    type=click.Choice(["bollinger-bands", "ichimoku", "ma-cross", "macd", "rsi"]),
+    type=click.Choice(strategy_names()),
     required=True,
     help="Trading strategy to test",
 )
@@ -29,83 +37,58 @@ load_dotenv()
 @click.option(
     "--end-date", type=click.DateTime(), help="End date for backtesting (YYYY-MM-DD)"
 )
-
-# Bollinger Bands specific options
-@click.option(
-    "--bollinger-bands-period", type=int, default=20, help="Bollinger Bands period"
-)
-@click.option(
-    "--bollinger-bands-std",
-    type=float,
-    default=2.0,
-    help="Number of standard deviations",
-)
-
-# Ichimoku specific options
-@click.option("--ichimoku-tenkan-period", type=int, default=9, help="Tenkan-sen period")
-@click.option("--ichimoku-kijun-period", type=int, default=26, help="Kijun-sen period")
 @click.option(
-    "--ichimoku-senkou-span-b-period", type=int, default=52, help="Senkou Span B period"
+    "--best-stored",
+    is_flag=True,
+    help="Use the best parameters an optimization stored instead of the"
+    " strategy options",
 )
 @click.option(
-    "--ichimoku_displacement", type=int, default=26, help="Displacement period"
+    "--metric",
+    type=click.Choice(OPTIMIZATION_METRICS),
+    default="total_profit",
+    help="Metric the stored parameters are ranked by (default: total_profit)",
 )
-
-# MA Crossover specific options
-@click.option(
-    "--ma-cross-fast-period", type=int, default=12, help="Fast EMA period for MA-Cross"
-)
-@click.option(
-    "--ma-cross-slow-period", type=int, default=26, help="Slow EMA period for MA-Cross"
-)
-
-# MACD specific options
-@click.option(
-    "--macd-fast-period", type=int, default=12, help="Fast EMA period for MACD"
-)
-@click.option(
-    "--macd-slow-period", type=int, default=26, help="Slow EMA period for MACD"
-)
-@click.option(
-    "--macd-signal-period", type=int, default=9, help="Signal line period for MACD"
-)
-
-# RSI specific options
-@click.option("--rsi-period", type=int, default=14, help="RSI calculation period")
-@click.option(
-    "--rsi-overbought", type=float, default=70, help="RSI overbought threshold"
-)
-@click.option("--rsi-oversold", type=float, default=30, help="RSI oversold threshold")
+@RESULTS_OPTION
+@strategy_options
+@execution_options
 def run(
     strategy: str,
     symbol: str,
     timeframe: str,
     start_date: Optional[datetime],
     end_date: Optional[datetime],
-    # Bollinger Bands
-    bollinger_bands_period: int,
-    bollinger_bands_std: float,
-    # MA Crossover
-    ma_cross_fast_period: int,
-    ma_cross_slow_period: int,
-    # MACD
-    macd_fast_period: int,
-    macd_slow_period: int,
-    macd_signal_period: int,
-    # RSI
-    rsi_period: int,
-    rsi_overbought: float,
-    rsi_oversold: float,
-    # Ichimoku
-    ichimoku_tenkan_period: int,
-    ichimoku_kijun_period: int,
-    ichimoku_senkou_span_b_period: int,
-    ichimoku_displacement: int,
+    best_stored: bool,
+    metric: str,
+    results_path: str,
+    # Execution
+    fee: float,
+    slippage: float,
+    position_size: float,
+    long_only: bool,
+    **options,
 ):
     """Test a trading strategy with historical data"""
 
+    execution = execution_from_options(fee, slippage, position_size, long_only)
+
+    # Parameters of the latest optimization, see `ResultStore.best`
+    if best_stored:
+        with ResultStore(results_path) as store:
+            stored = store.best(
+                load_strategy(strategy), symbol, timeframe, execution, metric
+            )
+        if not stored:
+            raise click.UsageError(
+                f"No results of {strategy} stored for {timeframe} '{symbol}'"
+                " with this execution"
+            )
+        params, _ = stored[0]
+        click.echo(f"Using the stored parameters with the best {metric}: {params}")
+
     # Fetch historical data
     client = CcxtClient()
+    # from ..client.binance import BinanceClient
     # client = BinanceClient(
     #     api_key=os.getenv("BINANCE_API_KEY"),
     #     api_secret=os.getenv("BINANCE_API_SECRET"),
@@ -116,32 +99,16 @@ def run(
     )
 
     # Initialize strategy
-    st = StrategyFactory.build(
-        strategy=strategy,
-        data=data,
-        symbol=symbol,
-        timeframe=timeframe,
-        # Bollinger Bands
-        bollinger_bands_period=bollinger_bands_period,
-        bollinger_bands_std=bollinger_bands_std,
-        # Ichimoku
-        ichimoku_tenkan_period=ichimoku_tenkan_period,
-        ichimoku_kijun_period=ichimoku_kijun_period,
-        ichimoku_senkou_span_b_period=ichimoku_senkou_span_b_period,
-        ichimoku_displacement=ichimoku_displacement,
-        # MA-Cross
-        ma_cross_fast_period=ma_cross_fast_period,
-        ma_cross_slow_period=ma_cross_slow_period,
-        # MACD
-        macd_fast_period=macd_fast_period,
-        macd_slow_period=macd_slow_period,
-        macd_signal_period=macd_signal_period,
-        # RSI
-        rsi_period=rsi_period,
-        rsi_overbought=rsi_overbought,
-        rsi_oversold=rsi_oversold,
-    )
+    if best_stored:
+        st = load_strategy(strategy)(
+            data=data, symbol=symbol, timeframe=timeframe, **params
+        )
+    else:
+        st = StrategyFactory.build(
+            strategy=strategy, data=data, symbol=symbol, timeframe=timeframe, **options
+        )
 
+    st.execution = execution
     metrics = st.get_performance_metrics()
 
     # Print results
@@ -156,3 +123,7 @@ def run(
     click.echo(f"  Total trades: {metrics['total_trades']}")
     click.echo(f"  Profitable trades: {metrics['profitable_trades']}")
     click.echo(f"  Win rate: {metrics['win_rate']:.2%}")
+    click.echo(f"  Sharpe ratio: {metrics['sharpe_ratio']:.2f}")
+    click.echo(f"  Sortino ratio: {metrics['sortino_ratio']:.2f}")
+    click.echo(f"  Profit factor: {metrics['profit_factor']:.2f}")
+    click.echo(f"  Exposure: {metrics['exposure']:.2%}")
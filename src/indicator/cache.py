@@ -0,0 +1,116 @@
+import hashlib
+import threading
+import weakref
+from typing import Callable, Dict, Hashable, Tuple
+import numpy as np
+import pandas as pd
+
+from ..client.lru import LruCache
+
+
+class IndicatorCache:
+    """
+    Memory-bounded cache of indicator series shared by strategy instances.
+
+    Series are keyed by a fingerprint of the data they were computed from,
+    the indicator name and its parameters, so strategies that differ in
+    other parameters reuse each other's work. Every process has its own
+    cache (`Strategy.indicator_cache`); data frames are treated as
+    immutable once an indicator was computed from them.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size of the cached series, least recently used
+                ones are evicted beyond it
+        """
+        self.memory = LruCache(max_bytes)
+        self._fingerprints: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        data: pd.DataFrame,
+        name: str,
+        params: Tuple[Hashable, ...],
+        compute: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Get an indicator series, computing and caching it on a miss.
+
+        Args:
+            data: OHLCV data the indicator is computed from
+            name: Name of the indicator
+            params: Parameters the indicator depends on
+            compute: Function computing the series from `data`
+        """
+        key = (self.fingerprint(data), name, params)
+        values = self.memory.get(key)
+        if values is None:
+            values = np.asarray(compute())
+            # Cached series are shared, so nobody may write to them
+            values.flags.writeable = False
+            self.memory.put(key, values, values.nbytes)
+        return values
+
+    def fingerprint(self, data: pd.DataFrame) -> str:
+        """Hash the index and columns of a data frame, once per frame object"""
+        frame_id = id(data)
+        with self._lock:
+            cached = self._fingerprints.get(frame_id)
+        if cached is not None:
+            return cached
+
+        digest = fingerprint(data)
+        with self._lock:
+            self._fingerprints[frame_id] = digest
+        # Forget the frame once it is garbage collected, ids get reused
+        weakref.finalize(data, self._forget, frame_id)
+        return digest
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit, miss and eviction counters"""
+        return {
+            "hits": self.memory.hits,
+            "misses": self.memory.misses,
+            "evictions": self.memory.evictions,
+            "bytes": self.memory.size,
+        }
+
+    def _forget(self, frame_id: int):
+        with self._lock:
+            self._fingerprints.pop(frame_id, None)
+
+
+def fingerprint(data: pd.DataFrame) -> str:
+    """
+    Hash the timestamps and the values of a data frame.
+
+    Timestamps are hashed in milliseconds and numbers as float64, so the
+    same candles hash alike however they were loaded. A candle still
+    forming changes with every fetch, and so does the hash of data
+    including it; see `closed_candles`.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data.index, pd.DatetimeIndex):
+        digest.update(data.index.as_unit("ms").asi8.tobytes())
+    else:
+        _update(digest, data.index)
+    for name in data.columns:
+        digest.update(str(name).encode())
+        column = data[name]
+        if pd.api.types.is_numeric_dtype(column):
+            column = column.to_numpy(dtype=np.float64)
+        _update(digest, column)
+    return digest.hexdigest()
+
+
+def _update(digest, values):
+    """Feed the raw bytes of an index or column to a hash"""
+    array = np.asarray(values)
+    if array.dtype == object:
+        array = pd.util.hash_array(array)
+    digest.update(np.ascontiguousarray(array).view(np.uint8))
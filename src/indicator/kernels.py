@@ -0,0 +1,311 @@
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+import numpy as np
+
+# Largest factor the EMA kernel lets its weights grow by within a block
+EMA_BLOCK_SCALE = 1e150
+EMA_MAX_BLOCK = 64 * 1024
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _block_scan(
+    values: np.ndarray, window: int, accumulate: Callable, fill: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split values into blocks of `window` and scan each block both ways.
+
+    Returns the running aggregate from the start of each block (prefix) and
+    from the end of each block (suffix). A full window starting at `j` and
+    ending at `i` spans at most two blocks, so it aggregates `suffix[j]`
+    and `prefix[i]` (van Herk/Gil-Werman).
+    """
+    n = len(values)
+    padded = np.full(-(-n // window) * window, fill)
+    padded[:n] = values
+    blocks = padded.reshape(-1, window)
+    prefix = accumulate(blocks, axis=1).ravel()[:n]
+    suffix = accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[:n]
+    return prefix, suffix
+
+
+def _apply_min_periods(result: np.ndarray, window: int, min_periods: Optional[int]):
+    """Blank the leading partial windows with fewer than `min_periods` values"""
+    min_periods = window if min_periods is None else min_periods
+    result[: max(min_periods - 1, 0)] = np.nan
+    return result
+
+
+def _rolling_extreme(
+    values, window: int, min_periods: Optional[int], ufunc: np.ufunc, fill: float
+) -> np.ndarray:
+    values = _as_array(values)
+    n = len(values)
+    result = np.empty(n)
+    if n == 0:
+        return result
+    if window <= 1:
+        result[:] = values
+        return result
+
+    head = min(window - 1, n)
+    result[:head] = ufunc.accumulate(values[:head])
+    if n >= window:
+        prefix, suffix = _block_scan(values, window, ufunc.accumulate, fill)
+        result[window - 1 :] = ufunc(suffix[: n - window + 1], prefix[window - 1 :])
+
+    return _apply_min_periods(result, window, min_periods)
+
+
+def rolling_max(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Get the maximum of every window in O(n), whatever the window length.
+
+    Args:
+        values: Input series
+        window: Number of values in a window
+        min_periods: Values a leading partial window needs to get a result
+            (defaults to `window`, i.e. only full windows)
+    """
+    return _rolling_extreme(values, window, min_periods, np.fmax, -np.inf)
+
+
+def rolling_min(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Get the minimum of every window in O(n), see `rolling_max`"""
+    return _rolling_extreme(values, window, min_periods, np.fmin, np.inf)
+
+
+def midpoint(high, low, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Get the middle of the highest high and the lowest low of every window"""
+    return 0.5 * (
+        rolling_max(high, window, min_periods) + rolling_min(low, window, min_periods)
+    )
+
+
+def _block_cumsum(values: np.ndarray, window: int) -> np.ndarray:
+    """Get the running sums within blocks of `window` values, one row per block"""
+    padded = np.zeros(-(-len(values) // window) * window)
+    padded[: len(values)] = values
+    return np.cumsum(padded.reshape(-1, window), axis=1)
+
+
+def _window_sums(
+    values: np.ndarray, window: int, carried: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Sum every window in O(n) from running sums within blocks of `window`.
+
+    A window starting in a block sums the rest of that block from `values`
+    and, unless it is aligned with the block, the start of the next block
+    from `carried` (`values` if None).
+    """
+    n = len(values)
+    result = np.empty(n)
+    head = min(window - 1, n)
+    result[:head] = np.cumsum(values[:head])
+    if n < window:
+        return result
+
+    prefix = _block_cumsum(values, window)
+    # Suffixes from the block totals stay within the magnitude of a block
+    suffix = prefix[:, -1:] - prefix
+    suffix = suffix.ravel()[: n - window + 1] + values[: n - window + 1]
+    if carried is not None:
+        prefix = _block_cumsum(carried, window)
+
+    result[window - 1 :] = suffix + prefix.ravel()[window - 1 : n]
+    # A window aligned with a block is that whole block
+    result[window - 1 :: window] = suffix[::window]
+    return result
+
+
+def _valid_counts(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the values with their NaNs zeroed, and the number of non-NaN values
+    of every window, from a separate window sum so that a NaN only affects
+    the windows containing it.
+    """
+    missing = np.isnan(values)
+    counts = np.minimum(np.arange(1, len(values) + 1), window).astype(np.float64)
+    if not missing.any():
+        return values, counts
+    counts -= _window_sums(missing.astype(np.float64), window)
+    return np.where(missing, 0.0, values), counts
+
+
+def _apply_valid_counts(
+    result: np.ndarray,
+    counts: np.ndarray,
+    window: int,
+    min_periods: Optional[int],
+) -> np.ndarray:
+    """Blank the windows with fewer than `min_periods` non-NaN values"""
+    min_periods = window if min_periods is None else max(min_periods, 1)
+    result[counts < min_periods] = np.nan
+    return result
+
+
+def rolling_sum(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Get the sum of every window in O(n).
+
+    Sums are taken within blocks of `window` values rather than from one
+    running total, so rounding errors do not build up along long series.
+    NaNs are skipped as pandas does: a window gets a result when it has at
+    least `min_periods` other values, so by default every window containing
+    a NaN is NaN.
+    """
+    values = _as_array(values)
+    window = max(window, 1)
+    values, counts = _valid_counts(values, window)
+    return _apply_valid_counts(
+        _window_sums(values, window), counts, window, min_periods
+    )
+
+
+def rolling_mean(values, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Get the mean of every window in O(n), of its non-NaN values"""
+    values = _as_array(values)
+    window = max(window, 1)
+    values, counts = _valid_counts(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = _window_sums(values, window) / counts
+    return _apply_valid_counts(result, counts, window, min_periods)
+
+
+def rolling_std(
+    values, window: int, min_periods: Optional[int] = None, ddof: int = 1
+) -> np.ndarray:
+    """
+    Get the standard deviation of every window in O(n) (sample by default).
+
+    Values are taken relative to the first value of the block a window
+    starts in, so the sums of squares stay small and do not cancel out.
+    NaNs are skipped as in `rolling_sum`.
+    """
+    values = _as_array(values)
+    n = len(values)
+    if n == 0:
+        return np.empty(0)
+    window = max(window, 1)
+
+    # Blocks starting with a NaN are relative to the latest value before it
+    missing = np.isnan(values)
+    filled = values
+    if missing.any():
+        latest = np.maximum.accumulate(np.where(missing, 0, np.arange(n)))
+        filled = values[latest]
+        filled[np.isnan(filled)] = 0.0
+
+    references = np.repeat(filled[::window], window)[:n]
+    own = values - references
+    # The part of a window past its first block is relative to that block
+    carried = values.copy()
+    carried[window:] -= references[:-window]
+    carried[:window] -= references[:window]
+
+    own, counts = _valid_counts(own, window)
+    carried[missing] = 0.0
+    sums = _window_sums(own, window, carried)
+    squares = _window_sums(own * own, window, carried * carried)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - sums * sums / counts) / (counts - ddof)
+    variance[counts <= ddof] = np.nan
+    result = np.sqrt(np.maximum(variance, 0.0))
+    return _apply_valid_counts(result, counts, window, min_periods)
+
+
+def ema(values, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    Get the exponential moving average `y[t] = (1 - alpha) * y[t-1] + alpha * x[t]`.
+
+    Matches `Series.ewm(alpha=alpha, adjust=False).mean()`: the average
+    starts at the first non-NaN value, leading NaNs stay NaN. The recursion
+    is unrolled into cumulative sums over blocks short enough for the
+    weights to stay within floating point range, so the work is vectorized.
+
+    Args:
+        values: Input series, NaN only at its start
+        alpha: Smoothing factor in (0, 1]
+        min_periods: Values needed before the average gets a result
+    """
+    values = _as_array(values)
+    result = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return result
+
+    first = valid[0]
+    x = values[first:]
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        result[first:] = x
+    else:
+        growth, shrink = ema_weights(decay)
+        block = len(growth)
+
+        carry = x[0]
+        out = result[first:]
+        for start in range(0, len(x), block):
+            chunk = x[start : start + block]
+            size = len(chunk)
+            weighted = np.cumsum(chunk * growth[:size])
+            out[start : start + size] = shrink[:size] * (
+                decay * carry + alpha * weighted
+            )
+            carry = out[start + size - 1]
+
+    result[first : first + max(min_periods - 1, 0)] = np.nan
+    return result
+
+
+@lru_cache(maxsize=256)
+def ema_weights(decay: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the weights of an EMA block: `decay ** -k` and `decay ** k` for every
+    offset `k` in a block, as long as they stay within floating point range.
+    """
+    block = int(np.log(EMA_BLOCK_SCALE) / -np.log(decay)) if decay < 1 else 1
+    offsets = np.arange(max(1, min(block, EMA_MAX_BLOCK)))
+    growth, shrink = decay**-offsets, decay**offsets
+    growth.flags.writeable = shrink.flags.writeable = False
+    return growth, shrink
+
+
+def ema_span(values, span: int, min_periods: int = 0) -> np.ndarray:
+    """Get the EMA with `alpha = 2 / (span + 1)`, as `ewm(span=span)`"""
+    return ema(values, 2.0 / (span + 1), min_periods)
+
+
+def wilder(values, window: int, min_periods: int = 0) -> np.ndarray:
+    """Get Wilder's smoothing, the EMA with `alpha = 1 / window`"""
+    return ema(values, 1.0 / window, min_periods)
+
+
+def relative_strength_index(close, window: int) -> np.ndarray:
+    """Get the RSI from Wilder-smoothed gains and losses, as `ta` does"""
+    close = _as_array(close)
+    diff = np.diff(close, prepend=np.nan)
+    gains = np.where(diff > 0, diff, 0.0)
+    losses = np.where(diff < 0, -diff, 0.0)
+    average_gain = wilder(gains, window, window)
+    average_loss = wilder(losses, window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            average_loss == 0, 100.0, 100 - 100 / (1 + average_gain / average_loss)
+        )
+
+
+def shift(values, periods: int) -> np.ndarray:
+    """Shift values by `periods` (backwards if negative), filling with NaN"""
+    values = _as_array(values)
+    result = np.full(len(values), np.nan)
+    if abs(periods) >= len(values):
+        return result
+    if periods >= 0:
+        result[periods:] = values[: len(values) - periods]
+    else:
+        result[:periods] = values[-periods:]
+    return result
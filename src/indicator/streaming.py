@@ -0,0 +1,239 @@
+import math
+from collections import deque
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from .kernels import ema_weights
+
+# Incremental counterparts of the kernels in `kernels`. Each one takes a
+# value per bar in O(1) and repeats the floating point operations of its
+# kernel in the same order, so it yields bit-identical results.
+
+
+class RollingExtreme:
+    """Rolling maximum (or minimum) over a monotonic deque, as `rolling_max`"""
+
+    __slots__ = ("window", "min_periods", "maximum", "count", "_candidates")
+
+    def __init__(self, window: int, min_periods: Optional[int] = None, maximum=True):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.maximum = maximum
+        self.count = 0
+        # (bar, value) pairs whose values only decrease (increase for minimum)
+        self._candidates = deque()
+
+    def update(self, value: float) -> float:
+        candidates = self._candidates
+        if self.maximum:
+            while candidates and candidates[-1][1] <= value:
+                candidates.pop()
+        else:
+            while candidates and candidates[-1][1] >= value:
+                candidates.pop()
+        candidates.append((self.count, value))
+        if candidates[0][0] <= self.count - self.window:
+            candidates.popleft()
+
+        self.count += 1
+        return candidates[0][1] if self.count >= self.min_periods else math.nan
+
+
+class Midpoint:
+    """Middle of the rolling highest high and lowest low, as `midpoint`"""
+
+    __slots__ = ("high", "low")
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.high = RollingExtreme(window, min_periods, maximum=True)
+        self.low = RollingExtreme(window, min_periods, maximum=False)
+
+    def update(self, high: float, low: float) -> float:
+        return 0.5 * (self.high.update(high) + self.low.update(low))
+
+
+class WindowSums:
+    """
+    Window sums from running sums within blocks of `window` bars, as the
+    kernels' `_window_sums`. Keeps the previous block to subtract from.
+    """
+
+    __slots__ = (
+        "window",
+        "count",
+        "_prefix",
+        "_values",
+        "_previous_prefix",
+        "_previous_values",
+        "_carried",
+    )
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self._prefix = [0.0] * window
+        self._values = [0.0] * window
+        self._previous_prefix = [0.0] * window
+        self._previous_values = [0.0] * window
+        self._carried = 0.0
+
+    def update(self, value: float, carried: Optional[float] = None) -> float:
+        window = self.window
+        offset = self.count % window
+        if offset == 0 and self.count > 0:
+            self._previous_prefix, self._prefix = self._prefix, self._previous_prefix
+            self._previous_values, self._values = self._values, self._previous_values
+
+        prefix = self._prefix
+        prefix[offset] = value if offset == 0 else prefix[offset - 1] + value
+        self._values[offset] = value
+        carried = value if carried is None else carried
+        self._carried = carried if offset == 0 else self._carried + carried
+        self.count += 1
+
+        if self.count < window:
+            return prefix[offset]
+        if offset == window - 1:
+            # A window aligned with a block is that whole block
+            return prefix[window - 1] - prefix[0] + self._values[0]
+
+        start = offset + 1
+        previous = self._previous_prefix
+        suffix = previous[window - 1] - previous[start] + self._previous_values[start]
+        return suffix + self._carried
+
+
+class RollingMean:
+    """Rolling mean, as `rolling_mean`"""
+
+    __slots__ = ("window", "min_periods", "sums")
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.sums = WindowSums(window)
+
+    def update(self, value: float) -> float:
+        if self.window <= 1:
+            self.sums.count += 1
+            return value
+        total = self.sums.update(value)
+        if self.sums.count < self.min_periods:
+            total = math.nan
+        return total / min(self.sums.count, self.window)
+
+
+class RollingStd:
+    """Rolling standard deviation, as `rolling_std`"""
+
+    __slots__ = (
+        "window",
+        "min_periods",
+        "ddof",
+        "sums",
+        "squares",
+        "_reference",
+        "_previous_reference",
+    )
+
+    def __init__(self, window: int, min_periods: Optional[int] = None, ddof: int = 1):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.ddof = ddof
+        self.sums = WindowSums(window)
+        self.squares = WindowSums(window)
+        self._reference = math.nan
+        self._previous_reference = math.nan
+
+    def update(self, value: float) -> float:
+        count = self.sums.count
+        if count % self.window == 0:
+            # Values are relative to the first value of their block
+            self._previous_reference = self._reference if count > 0 else value
+            self._reference = value
+        own = value - self._reference
+        carried = value - self._previous_reference
+
+        sums = self.sums.update(own, carried)
+        squares = self.squares.update(own * own, carried * carried)
+        counts = min(count + 1, self.window)
+        if counts <= self.ddof:
+            return math.nan
+
+        variance = (squares - sums * sums / counts) / (counts - self.ddof)
+        if count + 1 < self.min_periods or math.isnan(variance):
+            return math.nan
+        return math.sqrt(max(variance, 0.0))
+
+
+class Ema:
+    """Exponential moving average, as `ema`; NaNs before the first value"""
+
+    __slots__ = (
+        "alpha",
+        "decay",
+        "min_periods",
+        "count",
+        "_growth",
+        "_shrink",
+        "_carry",
+        "_weighted",
+        "_last",
+    )
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.decay = 1.0 - alpha
+        self.min_periods = min_periods
+        self.count = 0
+        if self.decay > 0.0:
+            self._growth, self._shrink = _ema_weights(self.decay)
+        self._carry = self._weighted = self._last = math.nan
+
+    def update(self, value: float) -> float:
+        if self.count == 0 and math.isnan(value):
+            return math.nan
+
+        if self.decay <= 0.0:
+            result = value
+        else:
+            offset = self.count % len(self._growth)
+            if offset == 0:
+                self._carry = value if self.count == 0 else self._last
+                self._weighted = value * self._growth[0]
+            else:
+                self._weighted += value * self._growth[offset]
+            result = self._shrink[offset] * (
+                self.decay * self._carry + self.alpha * self._weighted
+            )
+        self._last = result
+
+        self.count += 1
+        return result if self.count >= self.min_periods else math.nan
+
+
+class RelativeStrengthIndex:
+    """RSI from Wilder-smoothed gains and losses, as `relative_strength_index`"""
+
+    __slots__ = ("gains", "losses", "_previous")
+
+    def __init__(self, window: int):
+        self.gains = Ema(1.0 / window, window)
+        self.losses = Ema(1.0 / window, window)
+        self._previous = math.nan
+
+    def update(self, close: float) -> float:
+        diff = close - self._previous
+        self._previous = close
+        average_gain = self.gains.update(diff if diff > 0 else 0.0)
+        average_loss = self.losses.update(-diff if diff < 0 else 0.0)
+        if average_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + average_gain / average_loss)
+
+
+@lru_cache(maxsize=256)
+def _ema_weights(decay: float) -> Tuple[List[float], List[float]]:
+    """Get the kernel's EMA block weights as floats, shared by all instances"""
+    growth, shrink = ema_weights(decay)
+    return growth.tolist(), shrink.tolist()
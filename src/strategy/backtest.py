@@ -0,0 +1,145 @@
+from typing import NamedTuple
+import numpy as np
+
+
+class Execution(NamedTuple):
+    """How signals are traded"""
+
+    # Fee per fill, as a fraction of the traded value
+    fee: float = 0.001
+    # Price lost per fill, as a fraction of the price
+    slippage: float = 0.0
+    # Fraction of the equity a position takes
+    size: float = 1.0
+    # Whether sell signals open short positions, or only close long ones
+    short: bool = True
+
+
+class Trades(NamedTuple):
+    """Trade ledger of one or many signal columns, one entry per trade"""
+
+    column: np.ndarray  # signal column of the trade
+    entry: np.ndarray  # bar the position was opened at the close of
+    exit: np.ndarray  # bar the position was closed at, -1 while open
+    direction: np.ndarray  # 1 for long, -1 for short
+    profit: np.ndarray  # return of the trade, after costs
+
+
+class Backtest(NamedTuple):
+    """Positions, returns and trades of one or many signal columns"""
+
+    position: np.ndarray  # position held after the close of every bar
+    profit: np.ndarray  # return of every bar, after costs
+    equity: np.ndarray  # equity at the close of every bar, starting at 1
+    trades: Trades
+
+
+def positions(signal: np.ndarray, short: bool = True) -> np.ndarray:
+    """
+    Hold the position of the latest buy (1) or sell (-1) signal.
+
+    Args:
+        signal: Signals, (bars,) or (bars x columns)
+        short: Whether sell signals open short positions, or only close
+            long ones
+    """
+    # Encode the bar of every signal above its value, so that the running
+    # maximum is the latest signal; 2 stands for no signal yet
+    bars = np.arange(6, 4 * len(signal) + 6, 4, dtype=np.int32)
+    latest = np.where(
+        signal != 0, bars.reshape((-1,) + (1,) * (signal.ndim - 1)) + signal, 2
+    )
+    np.maximum.accumulate(latest, axis=0, out=latest)
+
+    position = (latest & 3).astype(np.int8)
+    position -= 2
+    if not short:
+        np.maximum(position, 0, out=position)
+    return position
+
+
+def backtest(
+    price: np.ndarray, signal: np.ndarray, execution: Execution = Execution()
+) -> Backtest:
+    """
+    Trade signals in a few vectorized passes, for any number of columns.
+
+    Signals are filled at the close of their bar, and positions are kept
+    until an opposite signal. Every change of position costs fee and
+    slippage on the traded value, a reversal counts as two fills. Positions
+    are rebalanced to `execution.size` of the equity on every bar.
+
+    Args:
+        price: Close price of every bar
+        signal: Signals, (bars,) or (bars x columns)
+        execution: Fees, slippage and sizing
+    """
+    single = signal.ndim == 1
+    if single:
+        signal = signal[:, None]
+    bars = len(signal)
+
+    position = positions(signal, execution.short)
+    held = np.zeros_like(position)
+    held[1:] = position[:-1]
+    change = np.zeros(bars)
+    if bars > 1:
+        change[1:] = price[1:] / price[:-1] - 1
+
+    # Fills happen where the position changes, 2 for a reversal
+    fills = np.subtract(position, held)
+    np.abs(fills, out=fills)
+    fill_bars, fill_columns = np.nonzero(fills)
+    # The ledger wants them by column and then bar
+    by_column = np.argsort(fill_columns, kind="stable")
+    fill_bars, fill_columns = fill_bars[by_column], fill_columns[by_column]
+    fill_cost = 1.0 - execution.size * (execution.fee + execution.slippage)
+
+    # A position can lose the whole equity at worst
+    factor = np.multiply(held, execution.size * change[:, None])
+    factor += 1.0
+    np.maximum(factor, 0.0, out=factor)
+    factor[fill_bars, fill_columns] *= np.power(
+        fill_cost, fills[fill_bars, fill_columns]
+    )
+    equity = np.cumprod(factor, axis=0)
+    profit = np.subtract(factor, 1.0, out=factor)
+
+    trades = _trades(position, fills, fill_columns, fill_bars, equity, fill_cost)
+    if single:
+        return Backtest(position[:, 0], profit[:, 0], equity[:, 0], trades)
+    return Backtest(position, profit, equity, trades)
+
+
+def _trades(
+    position: np.ndarray,
+    fills: np.ndarray,
+    columns: np.ndarray,
+    bars: np.ndarray,
+    equity: np.ndarray,
+    fill_cost: float,
+) -> Trades:
+    """List the trades between the changes of position of every column"""
+    direction = position[bars, columns]
+
+    # A trade lasts until the next change of its column, or is still open
+    following = np.full(len(bars), -1, dtype=np.int64)
+    same_column = columns[1:] == columns[:-1]
+    following[:-1][same_column] = bars[1:][same_column]
+
+    opened = direction != 0
+    columns, entry, exit = columns[opened], bars[opened], following[opened]
+    closed = exit >= 0
+    last = np.where(closed, exit, len(position) - 1)
+
+    # The equity between the entry and the exit bar holds the trade's price
+    # moves and all fills of the exit bar; only the trade's own exit fill
+    # and its entry fill count
+    exit_fills = np.where(closed, fills[last, columns], 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit = (
+            equity[last, columns]
+            / equity[entry, columns]
+            * np.power(fill_cost, 1 + closed - exit_fills)
+        )
+    return Trades(columns, entry, exit, direction[opened], profit - 1.0)
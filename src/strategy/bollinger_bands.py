@@ -1,5 +1,10 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+import numpy as np
 import pandas as pd
 
+from ..indicator.kernels import rolling_mean, rolling_std
+from ..indicator.streaming import RollingMean, RollingStd
+from .parameter_space import ParameterSpace
 from .strategy import Strategy
 
 
@@ -11,6 +16,15 @@ class BollingerBands(Strategy):
     - Sell when price crosses above upper band (overbought)
     """
 
+    option_arguments = {"std": "num_std"}
+
+    parameter_space = ParameterSpace(
+        {
+            "period": range(10, 50 + 2, 2),
+            "num_std": [1.0, 1.5, 2.0, 2.5, 3.0],
+        }
+    )
+
     def __init__(
         self,
         data: pd.DataFrame,
@@ -32,27 +46,45 @@ class BollingerBands(Strategy):
         self.period = period
         self.num_std = num_std
 
-    def generate_signals(self) -> pd.DataFrame:
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {"period": self.period, "num_std": self.num_std}
+
+    def signal_matrix(self, param_grid: Sequence[Dict[str, Any]]) -> np.ndarray:
         """Generate trading signals based on Bollinger Bands."""
 
         # Calculate Bollinger Bands
-        df = self.data.copy()
-        df["MA"] = df["close"].rolling(window=self.period).mean()
-        df["STD"] = df["close"].rolling(window=self.period).std()
-        df["Upper"] = df["MA"] + (df["STD"] * self.num_std)
-        df["Lower"] = df["MA"] - (df["STD"] * self.num_std)
+        close = self.data["close"].to_numpy(dtype="float64")
+        periods = [(params["period"],) for params in param_grid]
+        ma = self.indicator_matrix(
+            "sma", lambda period: rolling_mean(close, period), periods
+        )
+        std = self.indicator_matrix(
+            "std", lambda period: rolling_std(close, period), periods
+        )
+        num_std = np.array([params["num_std"] for params in param_grid])
+        upper = ma + std * num_std
+        lower = ma - std * num_std
 
         # Generate signals
         # 1 for buy (price crosses below lower band)
         # -1 for sell (price crosses above upper band)
         # 0 for hold
-        df["signal"] = 0
-        df.loc[df["close"] < df["Lower"], "signal"] = 1
-        df.loc[df["close"] > df["Upper"], "signal"] = -1
+        price = close[:, None]
+        signal = (price < lower).astype(np.int8)
+        signal[price > upper] = -1
+
+        return signal
+
+    def _create_stream(self) -> Callable[[Mapping[str, float]], Optional[int]]:
+        mean = RollingMean(self.period)
+        deviation = RollingStd(self.period)
 
-        # Calculate profits
-        df["price"] = df["close"]
-        df["profit"] = df["close"].pct_change() * df["signal"].shift(1)
+        def update(candle: Mapping[str, float]) -> Optional[int]:
+            close = float(candle["close"])
+            ma, std = mean.update(close), deviation.update(close)
+            if close > ma + std * self.num_std:
+                return -1
+            return int(close < ma - std * self.num_std)
 
-        # Keep only required columns
-        return df[["price", "signal", "profit"]]
+        return update
@@ -1,90 +1,47 @@
-from typing_extensions import Literal
+from inspect import signature
+from typing import Any
 import pandas as pd
 
-from src.strategy.bollinger_bands import BollingerBands
-from src.strategy.ichimoku import Ichimoku
-from src.strategy.ma_cross import MaCross
-from src.strategy.macd import Macd
-from src.strategy.rsi import Rsi
-
-
-StrategyType = Literal["bollinger-bands", "ichimoku", "ma-cross", "macd", "rsi"]
+from .registry import load_strategy
+from .strategy import Strategy
 
 
 class StrategyFactory:
     @staticmethod
     def build(
-        strategy: StrategyType,
+        strategy: str,
         data: pd.DataFrame,
         symbol: str,
         timeframe: str,
-        # Bollinger Bands
-        bollinger_bands_period: int,
-        bollinger_bands_std: float,
-        # Ichimoku
-        ichimoku_tenkan_period: int,
-        ichimoku_kijun_period: int,
-        ichimoku_senkou_span_b_period: int,
-        ichimoku_displacement: int,
-        # MA-Cross
-        ma_cross_fast_period: int,
-        ma_cross_slow_period: int,
-        # MACD
-        macd_fast_period: int,
-        macd_slow_period: int,
-        macd_signal_period: int,
-        # RSI
-        rsi_period: int,
-        rsi_overbought: int,
-        rsi_oversold: int,
-    ):
-        if strategy == "bollinger-bands":
-            return BollingerBands(
-                data=data,
-                symbol=symbol,
-                timeframe=timeframe,
-                period=bollinger_bands_period,
-                num_std=bollinger_bands_std,
-            )
-
-        if strategy == "ichimoku":
-            return Ichimoku(
-                data=data,
-                symbol=symbol,
-                timeframe=timeframe,
-                tenkan_period=ichimoku_tenkan_period,
-                kijun_period=ichimoku_kijun_period,
-                senkou_span_b_period=ichimoku_senkou_span_b_period,
-                displacement=ichimoku_displacement,
-            )
-
-        if strategy == "ma-cross":
-            return MaCross(
-                data=data,
-                symbol=symbol,
-                timeframe=timeframe,
-                fast_period=ma_cross_fast_period,
-                slow_period=ma_cross_slow_period,
-            )
-
-        if strategy == "macd":
-            return Macd(
-                data=data,
-                symbol=symbol,
-                timeframe=timeframe,
-                fast_period=macd_fast_period,
-                slow_period=macd_slow_period,
-                signal_period=macd_signal_period,
-            )
-
-        if strategy == "rsi":
-            return Rsi(
-                data=data,
-                symbol=symbol,
-                timeframe=timeframe,
-                period=rsi_period,
-                overbought=rsi_overbought,
-                oversold=rsi_oversold,
-            )
-
-        # raise ValueError(f"Unknown strategy '{strategy}'.")
+        **options: Any,
+    ) -> Strategy:
+        """
+        Create a strategy from the options of the CLI, importing only the
+        module of the selected strategy.
+
+        An option is passed to the strategy when its name is the strategy's
+        name followed by a constructor argument (e.g. `ichimoku_kijun_period`
+        for `kijun_period`), or by a key of its `option_arguments`. Options
+        of other strategies are ignored, so a command can pass all of them.
+
+        Args:
+            strategy: Name of the strategy (see `registry.strategy_names`)
+            data: OHLCV data
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            options: Parameters of the strategies, as the CLI names them
+        """
+        strategy_class = load_strategy(strategy)
+        arguments = signature(strategy_class.__init__).parameters
+        prefix = strategy.replace("-", "_") + "_"
+
+        params = {}
+        for option, value in options.items():
+            if not option.startswith(prefix):
+                continue
+            name = option[len(prefix) :]
+            name = strategy_class.option_arguments.get(name, name)
+            if name in arguments:
+                params[name] = value
+
+        return strategy_class(data=data, symbol=symbol, timeframe=timeframe, **params)
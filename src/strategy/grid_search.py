@@ -0,0 +1,266 @@
+import heapq
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+import pandas as pd
+
+from ..client.shared import FrameSpec, SharedFrame
+from .backtest import Execution
+from .strategy import Strategy
+
+# Parameter sets of the first tasks, before the throughput is known
+FIRST_CHUNK = 8
+
+# Largest task, so a slow strategy doesn't leave workers idle at the end
+MAX_CHUNK = 4096
+
+# Seconds a task should take, long enough that dispatching it costs little
+TASK_SECONDS = 0.25
+
+# Tasks queued per worker, so no worker waits for its next task
+TASKS_PER_WORKER = 2
+
+
+def dispatch_chunks(
+    executor: Executor,
+    function: Callable[..., Any],
+    param_grid: Iterable[Dict[str, Any]],
+    workers: int,
+    *args: Any,
+) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+    """
+    Evaluate a parameter grid in chunks, reading it as chunks are submitted.
+
+    Only a few tasks per worker are pending at a time, so a grid of any size
+    is never held in memory as a whole. Chunks grow with the measured
+    throughput until a task takes about `TASK_SECONDS`.
+
+    Args:
+        executor: Executor running the tasks
+        function: Called with a chunk of parameter sets and `args`
+        param_grid: Parameter sets, such as a `ParameterSpace`
+        workers: Number of workers of the executor
+        args: More arguments of every task
+
+    Yields:
+        Every chunk with its result, in the order of the grid
+    """
+    params = iter(param_grid)
+    pending = deque()
+    size = FIRST_CHUNK
+    evaluated = 0
+    start = time.perf_counter()
+    while True:
+        while len(pending) < TASKS_PER_WORKER * workers:
+            chunk = list(islice(params, size))
+            if not chunk:
+                break
+            pending.append((chunk, executor.submit(function, chunk, *args)))
+        if not pending:
+            return
+
+        chunk, future = pending.popleft()
+        yield chunk, future.result()
+
+        evaluated += len(chunk)
+        rate = evaluated / max(time.perf_counter() - start, 1e-9) / workers
+        size = min(max(int(rate * TASK_SECONDS), 1), MAX_CHUNK)
+
+
+@contextmanager
+def strategy_pool(
+    strategy: Type[Strategy],
+    data: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    params: Dict[str, Any],
+    execution: Execution = Execution(),
+    max_workers: Optional[int] = None,
+) -> Iterator[ProcessPoolExecutor]:
+    """
+    Start worker processes that each create one strategy, so tasks only
+    carry parameters and get the strategy from `worker_strategy`.
+
+    The data is copied to shared memory once for the whole pool, and the
+    strategies of the workers read it in place, instead of every worker
+    receiving a pickled copy of it.
+
+    Args:
+        strategy: Strategy class
+        data: OHLCV data
+        symbol: Trading pair symbol
+        timeframe: Candle timeframe
+        params: Any valid keyword arguments of the strategy's constructor
+            besides data, symbol and timeframe
+        execution: Fees, slippage and sizing
+        max_workers: Number of worker processes (defaults to CPU count)
+    """
+    with SharedFrame.copy_of(data) as shared, ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init,
+        initargs=(strategy, shared.spec, symbol, timeframe, params, execution),
+    ) as executor:
+        yield executor
+
+
+def worker_strategy() -> Strategy:
+    """Get the strategy of this worker process of a `strategy_pool`"""
+    return _strategy
+
+
+def grid_search(
+    strategy: Type[Strategy],
+    data: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    param_grid: Iterable[Dict[str, Any]],
+    execution: Execution = Execution(),
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+    """
+    Backtest every parameter set of a grid over all the data, in chunks
+    that the workers evaluate as one batch each.
+
+    Args:
+        strategy: Strategy class
+        data: OHLCV data
+        symbol: Trading pair symbol
+        timeframe: Candle timeframe
+        param_grid: Keyword arguments of the strategy's constructor besides
+            data, symbol and timeframe; read lazily, see `dispatch_chunks`
+        execution: Fees, slippage and sizing
+        max_workers: Number of worker processes (defaults to CPU count)
+
+    Yields:
+        Every parameter set with its metrics, in the order of the grid
+    """
+    params = iter(param_grid)
+    first = next(params, None)
+    if first is None:
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    with strategy_pool(
+        strategy, data, symbol, timeframe, first, execution, workers
+    ) as executor:
+        yield from evaluate_grid(executor, workers, chain([first], params))
+
+
+def evaluate_grid(
+    executor: Executor,
+    workers: int,
+    param_grid: Iterable[Dict[str, Any]],
+    bars: Optional[int] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+    """
+    Backtest parameter sets on the workers of a `strategy_pool`.
+
+    Args:
+        executor: Pool of the strategy
+        workers: Number of workers of the pool
+        param_grid: Keyword arguments of the strategy's constructor besides
+            data, symbol and timeframe; read lazily, see `dispatch_chunks`
+        bars: Backtest on this many of the latest bars only (defaults to
+            all of them)
+
+    Yields:
+        Every parameter set with its metrics, in the order of the grid
+    """
+    for chunk, metrics in dispatch_chunks(
+        executor, _evaluate, param_grid, workers, bars
+    ):
+        yield from zip(chunk, metrics)
+
+
+class TopResults:
+    """
+    The best results of a stream by one metric, in memory bounded by their
+    number rather than by the length of the stream.
+    """
+
+    def __init__(self, count: int, metric: str = "total_profit"):
+        """
+        Args:
+            count: Number of results to keep
+            metric: Metric to maximize
+        """
+        self.count = count
+        self.metric = metric
+        self.seen = 0
+        # Min-heap of (value, -order, params, metrics); of equal values, the
+        # first one seen ranks higher
+        self._heap = []
+
+    def add(self, params: Dict[str, Any], metrics: Dict[str, float]):
+        """Consider a parameter set; NaN metrics are never kept"""
+        self.seen += 1
+        value = metrics[self.metric]
+        if value != value or self.count < 1:
+            return
+        item = (value, -self.seen, params, metrics)
+        if len(self._heap) < self.count:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def best(self) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """Get the parameter sets kept and their metrics, best first"""
+        ranked = sorted(self._heap, key=lambda item: item[:2], reverse=True)
+        return [(params, metrics) for _, _, params, metrics in ranked]
+
+
+# Shared data and strategy of a worker process
+_data: Optional[SharedFrame] = None
+_strategy: Optional[Strategy] = None
+_params: Dict[str, Any] = {}
+
+# Strategies of the latest bars of the data, by their number of bars
+_latest: Dict[int, Strategy] = {}
+
+
+def _init(
+    strategy: Type[Strategy],
+    data: FrameSpec,
+    symbol: str,
+    timeframe: str,
+    params: Dict[str, Any],
+    execution: Execution,
+):
+    """Create the strategy a worker process evaluates parameters with"""
+    global _data, _strategy, _params
+    _data = SharedFrame.attach(data)
+    _params = params
+    _strategy = strategy(data=_data.frame, symbol=symbol, timeframe=timeframe, **params)
+    _strategy.execution = execution
+
+
+def _evaluate(
+    param_grid: List[Dict[str, Any]], bars: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """Evaluate a chunk of the parameter grid over the latest bars"""
+    strategy = _strategy
+    if bars is not None and bars < len(_strategy.data):
+        if bars not in _latest:
+            _latest[bars] = type(_strategy)(
+                data=_strategy.data.iloc[-bars:],
+                symbol=_strategy.symbol,
+                timeframe=_strategy.timeframe,
+                **_params,
+            )
+            _latest[bars].execution = _strategy.execution
+        strategy = _latest[bars]
+    return strategy.get_performance_metrics_batch(param_grid)
@@ -1,6 +1,11 @@
+from collections import deque
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+import numpy as np
 import pandas as pd
-from ta.trend import IchimokuIndicator
 
+from ..indicator.kernels import midpoint, shift
+from ..indicator.streaming import Midpoint
+from .parameter_space import Constraint, ParameterSpace
 from .strategy import Strategy
 
 
@@ -27,6 +32,36 @@ class Ichimoku(Strategy):
     but can be adjusted based on the timeframe.
     """
 
+    # Parameter ranges to test with steps to reduce iterations
+    parameter_space = ParameterSpace(
+        {
+            "tenkan_period": range(5, 30 + 2, 2),
+            "kijun_period": range(20, 60 + 2, 2),
+            "senkou_span_b_period": range(40, 120 + 2, 2),
+            "displacement": range(20, 45 + 5, 5),
+        },
+        [
+            # Too small for meaningful averages
+            Constraint(("tenkan_period",), lambda tenkan: tenkan >= 5),
+            # Kijun should be notably larger than Tenkan
+            Constraint(
+                ("tenkan_period", "kijun_period"),
+                lambda tenkan, kijun: tenkan < kijun and kijun >= 2 * tenkan,
+            ),
+            # Senkou B should be notably larger than Kijun
+            Constraint(
+                ("kijun_period", "senkou_span_b_period"),
+                lambda kijun, senkou: kijun < senkou and senkou >= 2 * kijun,
+            ),
+            # The displacement shouldn't be too small or too large relative
+            # to Kijun
+            Constraint(
+                ("kijun_period", "displacement"),
+                lambda kijun, displacement: kijun * 0.5 <= displacement <= kijun * 1.5,
+            ),
+        ],
+    )
+
     def __init__(
         self,
         data: pd.DataFrame,
@@ -43,27 +78,47 @@ class Ichimoku(Strategy):
         self.senkou_span_b_period = senkou_span_b_period
         self.displacement = displacement
 
-    def generate_signals(self) -> pd.DataFrame:
-
-        # Calculate Ichimoku indicators
-        ichimoku = IchimokuIndicator(
-            high=self.data["high"],
-            low=self.data["low"],
-            window1=self.tenkan_period,
-            window2=self.kijun_period,
-            window3=self.senkou_span_b_period,
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "tenkan_period": self.tenkan_period,
+            "kijun_period": self.kijun_period,
+            "senkou_span_b_period": self.senkou_span_b_period,
+            "displacement": self.displacement,
+        }
+
+    @staticmethod
+    def lookahead(params: Dict[str, Any]) -> int:
+        # The Chikou Span compares a bar to the close `displacement` bars later
+        return params["displacement"]
+
+    def signal_matrix(self, param_grid: Sequence[Dict[str, Any]]) -> np.ndarray:
+
+        # Calculate Ichimoku indicators (donchian midlines, as `ta` does)
+        high = self.data["high"].to_numpy(dtype="float64")
+        low = self.data["low"].to_numpy(dtype="float64")
+        close = self.data["close"].to_numpy(dtype="float64")
+
+        def donchian_midlines(key: str, full_windows: bool) -> np.ndarray:
+            return self.indicator_matrix(
+                "midpoint",
+                lambda window, min_periods: midpoint(high, low, window, min_periods),
+                [
+                    (params[key], params[key] if full_windows else 0)
+                    for params in param_grid
+                ],
+            )
+
+        tenkan_sen = donchian_midlines("tenkan_period", True)
+        kijun_sen = donchian_midlines("kijun_period", True)
+        senkou_span_a = 0.5 * (tenkan_sen + kijun_sen)
+        senkou_span_b = donchian_midlines("senkou_span_b_period", False)
+        chikou_span = self.indicator_matrix(
+            "close_shift",
+            lambda periods: shift(close, periods),
+            [(-params["displacement"],) for params in param_grid],
         )
-
-        tenkan_sen = ichimoku.ichimoku_conversion_line()
-        kijun_sen = ichimoku.ichimoku_base_line()
-        senkou_span_a = ichimoku.ichimoku_a()
-        senkou_span_b = ichimoku.ichimoku_b()
-        chikou_span = self.data["close"].shift(-self.displacement)
-
-        # Generate signals DataFrame
-        signals = pd.DataFrame(index=self.data.index)
-        signals["price"] = self.data["close"]
-        signals["signal"] = 0
+        price = close[:, None]
 
         # Trading Rules:
         # 1. Price above Kumo (Senkou Span A & B)
@@ -72,25 +127,63 @@ class Ichimoku(Strategy):
 
         # Bullish conditions
         bullish = (
-            (self.data["close"] > senkou_span_a)  # Price above Kumo
-            & (self.data["close"] > senkou_span_b)
+            (price > senkou_span_a)  # Price above Kumo
+            & (price > senkou_span_b)
             & (tenkan_sen > kijun_sen)  # Tenkan-sen above Kijun-sen
-            & (chikou_span > self.data["close"])  # Chikou Span above price
+            & (chikou_span > price)  # Chikou Span above price
         )
 
         # Bearish conditions
         bearish = (
-            (self.data["close"] < senkou_span_a)  # Price below Kumo
-            & (self.data["close"] < senkou_span_b)
+            (price < senkou_span_a)  # Price below Kumo
+            & (price < senkou_span_b)
             & (tenkan_sen < kijun_sen)  # Tenkan-sen below Kijun-sen
-            & (chikou_span < self.data["close"])  # Chikou Span below price
+            & (chikou_span < price)  # Chikou Span below price
         )
 
-        # Set signals
-        signals.loc[bullish, "signal"] = 1
-        signals.loc[bearish, "signal"] = -1
-
-        # Calculate profit/loss for each signal
-        signals["profit"] = signals["signal"] * signals["price"].pct_change()
-
-        return signals
+        # 1 for bullish, -1 for bearish, 0 otherwise
+        signal = bullish.astype(np.int8) - bearish.astype(np.int8)
+
+        return signal
+
+    def _create_stream(self) -> Callable[[Mapping[str, float]], Optional[int]]:
+        tenkan = Midpoint(self.tenkan_period, self.tenkan_period)
+        kijun = Midpoint(self.kijun_period, self.kijun_period)
+        senkou_span_b = Midpoint(self.senkou_span_b_period, 0)
+        # Bars waiting for their Chikou Span
+        pending = deque()
+
+        def update(candle: Mapping[str, float]) -> Optional[int]:
+            high, low = float(candle["high"]), float(candle["low"])
+            close = float(candle["close"])
+            tenkan_sen = tenkan.update(high, low)
+            kijun_sen = kijun.update(high, low)
+            pending.append(
+                (
+                    close,
+                    tenkan_sen,
+                    kijun_sen,
+                    0.5 * (tenkan_sen + kijun_sen),
+                    senkou_span_b.update(high, low),
+                )
+            )
+            if len(pending) <= self.displacement:
+                return None
+
+            price, tenkan_sen, kijun_sen, span_a, span_b = pending.popleft()
+            chikou_span = close
+            bullish = (
+                price > span_a
+                and price > span_b
+                and tenkan_sen > kijun_sen
+                and chikou_span > price
+            )
+            bearish = (
+                price < span_a
+                and price < span_b
+                and tenkan_sen < kijun_sen
+                and chikou_span < price
+            )
+            return int(bullish) - int(bearish)
+
+        return update
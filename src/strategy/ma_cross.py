@@ -1,10 +1,22 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+import numpy as np
 import pandas as pd
-from ta.trend import SMAIndicator
 
+from ..indicator.kernels import rolling_mean
+from ..indicator.streaming import RollingMean
+from .parameter_space import Constraint, ParameterSpace
 from .strategy import Strategy
 
 
 class MaCross(Strategy):
+    parameter_space = ParameterSpace(
+        {
+            "fast_period": range(5, 50 + 5, 5),
+            "slow_period": range(10, 200 + 10, 10),
+        },
+        [Constraint(("fast_period", "slow_period"), lambda fast, slow: fast < slow)],
+    )
+
     def __init__(
         self,
         data: pd.DataFrame,
@@ -17,27 +29,40 @@ class MaCross(Strategy):
         self.fast_period = fast_period
         self.slow_period = slow_period
 
-    def generate_signals(self) -> pd.DataFrame:
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {"fast_period": self.fast_period, "slow_period": self.slow_period}
+
+    def signal_matrix(self, param_grid: Sequence[Dict[str, Any]]) -> np.ndarray:
 
         # Calculate moving averages
-        fast_ma = SMAIndicator(
-            close=self.data["close"], window=self.fast_period
-        ).sma_indicator()
-        slow_ma = SMAIndicator(
-            close=self.data["close"], window=self.slow_period
-        ).sma_indicator()
-
-        # Generate signals
-        signals = pd.DataFrame(index=self.data.index)
-        signals["price"] = self.data["close"]
-        signals["signal"] = 0
+        close = self.data["close"].to_numpy(dtype="float64")
+
+        def moving_averages(key: str) -> np.ndarray:
+            return self.indicator_matrix(
+                "sma",
+                lambda window: rolling_mean(close, window),
+                [(params[key],) for params in param_grid],
+            )
+
+        fast_ma = moving_averages("fast_period")
+        slow_ma = moving_averages("slow_period")
 
         # Buy signal when fast MA crosses above slow MA
-        signals.loc[fast_ma > slow_ma, "signal"] = 1
         # Sell signal when fast MA crosses below slow MA
-        signals.loc[fast_ma < slow_ma, "signal"] = -1
+        signal = (fast_ma > slow_ma).astype(np.int8) - (fast_ma < slow_ma).astype(
+            np.int8
+        )
+
+        return signal
+
+    def _create_stream(self) -> Callable[[Mapping[str, float]], Optional[int]]:
+        fast = RollingMean(self.fast_period)
+        slow = RollingMean(self.slow_period)
 
-        # Calculate profit/loss for each signal
-        signals["profit"] = signals["signal"] * signals["price"].pct_change()
+        def update(candle: Mapping[str, float]) -> Optional[int]:
+            close = float(candle["close"])
+            fast_ma, slow_ma = fast.update(close), slow.update(close)
+            return int(fast_ma > slow_ma) - int(fast_ma < slow_ma)
 
-        return signals
+        return update
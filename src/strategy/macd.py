@@ -1,10 +1,23 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+import numpy as np
 import pandas as pd
-from ta.trend import MACD
 
+from ..indicator.kernels import ema_span
+from ..indicator.streaming import Ema
+from .parameter_space import Constraint, ParameterSpace
 from .strategy import Strategy
 
 
 class Macd(Strategy):
+    parameter_space = ParameterSpace(
+        {
+            "fast_period": range(6, 20 + 2, 2),
+            "slow_period": range(20, 40 + 2, 2),
+            "signal_period": range(5, 15 + 1),
+        },
+        [Constraint(("fast_period", "slow_period"), lambda fast, slow: fast < slow)],
+    )
+
     def __init__(
         self,
         data: pd.DataFrame,
@@ -19,38 +32,71 @@ class Macd(Strategy):
         self.slow_period = slow_period
         self.signal_period = signal_period
 
-    def generate_signals(self) -> pd.DataFrame:
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "fast_period": self.fast_period,
+            "slow_period": self.slow_period,
+            "signal_period": self.signal_period,
+        }
+
+    def signal_matrix(self, param_grid: Sequence[Dict[str, Any]]) -> np.ndarray:
 
         # Calculate MACD
-        macd_indicator = MACD(
-            close=self.data["close"],
-            window_slow=self.slow_period,
-            window_fast=self.fast_period,
-            window_sign=self.signal_period,
-        )
-        macd_line = macd_indicator.macd()
-        signal_line = macd_indicator.macd_signal()
+        close = self.data["close"].to_numpy(dtype="float64")
 
-        # Generate signals
-        signals = pd.DataFrame(index=self.data.index)
-        signals["price"] = self.data["close"]
+        def exponential_averages(key: str) -> np.ndarray:
+            return self.indicator_matrix(
+                "ema",
+                lambda span: ema_span(close, span, span),
+                [(params[key],) for params in param_grid],
+            )
 
-        # Hold
-        signals["signal"] = 0
+        def macd(fast_period: int, slow_period: int) -> np.ndarray:
+            return self.indicator(
+                "ema", lambda: ema_span(close, fast_period, fast_period), fast_period
+            ) - self.indicator(
+                "ema", lambda: ema_span(close, slow_period, slow_period), slow_period
+            )
+
+        macd_line = exponential_averages("fast_period") - exponential_averages(
+            "slow_period"
+        )
+        signal_line = self.indicator_matrix(
+            "macd_signal",
+            lambda fast, slow, span: ema_span(macd(fast, slow), span, span),
+            [
+                (params["fast_period"], params["slow_period"], params["signal_period"])
+                for params in param_grid
+            ],
+        )
+        previous_macd = np.roll(macd_line, 1, axis=0)
+        previous_signal = np.roll(signal_line, 1, axis=0)
+        previous_macd[0] = previous_signal[0] = np.nan
 
         # Buy signal when MACD line crosses above signal line
-        signals.loc[
-            (macd_line > signal_line) & (macd_line.shift(1) <= signal_line.shift(1)),
-            "signal",
-        ] = 1
+        buy = (macd_line > signal_line) & (previous_macd <= previous_signal)
 
         # Sell signal when MACD line crosses below signal line
-        signals.loc[
-            (macd_line < signal_line) & (macd_line.shift(1) >= signal_line.shift(1)),
-            "signal",
-        ] = -1
+        sell = (macd_line < signal_line) & (previous_macd >= previous_signal)
+
+        return buy.astype(np.int8) - sell.astype(np.int8)
+
+    def _create_stream(self) -> Callable[[Mapping[str, float]], Optional[int]]:
+        fast = Ema(2.0 / (self.fast_period + 1), self.fast_period)
+        slow = Ema(2.0 / (self.slow_period + 1), self.slow_period)
+        signal = Ema(2.0 / (self.signal_period + 1), self.signal_period)
+        previous = [float("nan"), float("nan")]
+
+        def update(candle: Mapping[str, float]) -> Optional[int]:
+            close = float(candle["close"])
+            macd_line = fast.update(close) - slow.update(close)
+            signal_line = signal.update(macd_line)
+            previous_macd, previous_signal = previous
+            previous[:] = macd_line, signal_line
 
-        # Calculate profit/loss for each signal
-        signals["profit"] = signals["signal"] * signals["price"].pct_change()
+            buy = macd_line > signal_line and previous_macd <= previous_signal
+            sell = macd_line < signal_line and previous_macd >= previous_signal
+            return int(buy) - int(sell)
 
-        return signals
+        return update
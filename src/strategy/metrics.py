@@ -0,0 +1,102 @@
+from typing import Dict
+import numpy as np
+
+from .backtest import Trades
+
+# Crypto markets trade around the clock
+YEAR_MS = 365 * 24 * 60 * 60 * 1000
+
+# Metrics an optimizer can maximize
+OPTIMIZATION_METRICS = [
+    "total_profit",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "profit_factor",
+    "win_rate",
+]
+
+
+def performance_metrics(
+    position: np.ndarray,
+    profit: np.ndarray,
+    equity: np.ndarray,
+    trades: Trades,
+    periods_per_year: float = 1.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the performance metrics of one or many backtested columns.
+
+    Works on plain arrays in a few vectorized passes, without building
+    intermediate frames or filtered copies.
+
+    Args:
+        position: Position of every bar, (bars,) or (bars x columns)
+        profit: Return of every bar after costs, same shape as `position`
+        equity: Equity after every bar, same shape as `position`
+        trades: Trade ledger of the columns
+        periods_per_year: Bars per year, to annualize Sharpe and Sortino
+
+    Returns:
+        Metrics by name, an array with one value per column (a scalar for
+        1-d input)
+    """
+    single = profit.ndim == 1
+    if single:
+        position, profit, equity = position[:, None], profit[:, None], equity[:, None]
+    bars, columns = profit.shape
+    count = max(bars, 1)
+
+    total_trades = np.bincount(trades.column, minlength=columns)
+    profitable_trades = np.bincount(trades.column[trades.profit > 0], minlength=columns)
+    trade_profit = np.nan_to_num(trades.profit)
+    gains = np.bincount(
+        trades.column, weights=np.maximum(trade_profit, 0.0), minlength=columns
+    )
+    losses = np.bincount(
+        trades.column, weights=np.maximum(-trade_profit, 0.0), minlength=columns
+    )
+
+    # Sums of squares without temporaries; the negative ones are what is
+    # left after the positive ones
+    positive = np.maximum(profit, 0.0)
+    mean = profit.sum(axis=0) / count
+    squares = np.einsum("ij,ij->j", profit, profit)
+    downside = np.sqrt(
+        np.maximum(squares - np.einsum("ij,ij->j", positive, positive), 0.0) / count
+    )
+    variance = np.maximum(squares / count - mean * mean, 0.0) * (
+        count / max(count - 1, 1)
+    )
+
+    # Drawdowns, reusing the buffer in place
+    total_profit = equity[-1] - 1 if bars else np.zeros(columns)
+    drawdowns = np.maximum.accumulate(equity, axis=0, out=positive)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(equity, drawdowns, out=drawdowns)
+    # Bars after losing the whole equity have no drawdown of their own
+    max_drawdown = np.abs(np.fmin.reduce(drawdowns, axis=0, initial=1.0) - 1)
+
+    annualize = np.sqrt(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics = {
+            "total_trades": total_trades,
+            "profitable_trades": profitable_trades,
+            "win_rate": np.where(
+                total_trades > 0, profitable_trades / np.maximum(total_trades, 1), 0.0
+            ),
+            "total_profit": total_profit,
+            "max_drawdown": max_drawdown,
+            "sharpe_ratio": np.where(
+                variance > 0, mean / np.sqrt(variance) * annualize, 0.0
+            ),
+            "sortino_ratio": np.where(downside > 0, mean / downside * annualize, 0.0),
+            "exposure": np.count_nonzero(position, axis=0) / count,
+            "profit_factor": np.where(
+                losses > 0, gains / losses, np.where(gains > 0, np.inf, 0.0)
+            ),
+            "count_signals": np.full(columns, bars),
+        }
+
+    if single:
+        return {name: values[0] for name, values in metrics.items()}
+    return metrics
@@ -0,0 +1,111 @@
+from math import prod
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import numpy as np
+
+
+class Constraint(NamedTuple):
+    """Condition some parameters of every combination have to meet"""
+
+    parameters: Tuple[str, ...]
+    check: Callable[..., bool]  # called with the values of the parameters
+
+    def __call__(self, params: Mapping[str, Any]) -> bool:
+        return bool(self.check(*(params[name] for name in self.parameters)))
+
+
+class ParameterSpace:
+    """
+    Values an optimizer tries for each parameter of a strategy, and the
+    constraints between them.
+
+    Combinations are enumerated depth-first in the order the parameters
+    are declared. A constraint is checked as soon as its parameters have
+    values, so a combination failing it is pruned along with every
+    combination of the parameters declared after them, and is never built.
+    """
+
+    def __init__(
+        self,
+        parameters: Dict[str, Sequence[Any]],
+        constraints: Sequence[Constraint] = (),
+    ):
+        """
+        Args:
+            parameters: Values of every parameter, by the name of the
+                strategy's constructor argument
+            constraints: Conditions every combination has to meet
+        """
+        names = list(parameters)
+        for constraint in constraints:
+            unknown = set(constraint.parameters) - set(names)
+            if unknown:
+                raise ValueError(f"Constraint on unknown parameters {sorted(unknown)}")
+
+        self.parameters = {name: list(values) for name, values in parameters.items()}
+        self.constraints = list(constraints)
+
+        # Constraints by the level of the last parameter they depend on
+        self._checks = [[] for _ in names]
+        for constraint in self.constraints:
+            level = max(names.index(name) for name in constraint.parameters)
+            self._checks[level].append(constraint)
+
+    @property
+    def size(self) -> int:
+        """Get the number of combinations without the constraints"""
+        return prod(len(values) for values in self.parameters.values())
+
+    def is_valid(self, params: Mapping[str, Any]) -> bool:
+        """Check that a combination meets every constraint"""
+        return all(constraint(params) for constraint in self.constraints)
+
+    def sample(
+        self, rng: np.random.Generator, attempts: int = 1000
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Draw a combination meeting the constraints, uniformly at random.
+
+        Args:
+            rng: Random number generator
+            attempts: Combinations to draw before giving up, when few of
+                them meet the constraints
+
+        Returns:
+            The combination, or None if no attempt met the constraints
+        """
+        for _ in range(attempts):
+            params = {
+                name: values[rng.integers(len(values))]
+                for name, values in self.parameters.items()
+            }
+            if self.is_valid(params):
+                return params
+        return None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Enumerate the combinations meeting every constraint"""
+        names = list(self.parameters)
+        params = {}
+
+        def assign(level: int) -> Iterator[Dict[str, Any]]:
+            if level == len(names):
+                yield dict(params)
+                return
+            name = names[level]
+            for value in self.parameters[name]:
+                params[name] = value
+                if all(constraint(params) for constraint in self._checks[level]):
+                    yield from assign(level + 1)
+            params.pop(name, None)
+
+        return assign(0)
@@ -0,0 +1,201 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from ..client.shared import SharedArray, SharedSpec
+from .backtest import Execution
+from .factory import StrategyFactory
+from .strategy import batch_metrics
+
+# Fields of the price matrix, as in the cached candles
+FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+class Portfolio(NamedTuple):
+    """Backtest of one strategy over many symbols, weighted equally"""
+
+    index: pd.DatetimeIndex
+    symbols: List[str]
+    profit: np.ndarray  # (bars x symbols), NaN before a symbol trades
+    metrics: Dict[str, Dict[str, float]]  # by symbol
+    returns: np.ndarray  # (bars,) of the portfolio
+
+
+def price_matrix(
+    datasets: Dict[str, pd.DataFrame],
+) -> Tuple[pd.DatetimeIndex, List[str], np.ndarray]:
+    """
+    Align the candles of many symbols on the union of their bars.
+
+    Args:
+        datasets: Candles by symbol
+
+    Returns:
+        The bars, the symbols and a (symbols x fields x bars) matrix with
+        NaNs where a symbol has no candle; the candles of a symbol are
+        contiguous, as they are read one symbol at a time
+    """
+    symbols = [symbol for symbol, data in datasets.items() if len(data)]
+    bars = np.unique(
+        np.concatenate([datasets[symbol].index.to_numpy() for symbol in symbols])
+        if symbols
+        else np.array([], dtype="datetime64[ms]")
+    )
+
+    matrix = np.full((len(symbols), len(FIELDS), len(bars)), np.nan)
+    for column, symbol in enumerate(symbols):
+        data = datasets[symbol]
+        rows = np.searchsorted(bars, data.index.to_numpy())
+        matrix[column][:, rows] = data[FIELDS].to_numpy(dtype="float64").T
+    return pd.DatetimeIndex(bars), symbols, matrix
+
+
+def backtest_portfolio(
+    datasets: Dict[str, pd.DataFrame],
+    strategy: str,
+    timeframe: str,
+    options: Dict[str, Any],
+    execution: Execution = Execution(),
+    max_workers: Optional[int] = None,
+) -> Portfolio:
+    """
+    Backtest a strategy on every symbol in parallel processes.
+
+    The aligned candles are put in shared memory once and every worker
+    writes the returns of its symbols to a shared (bars x symbols) matrix,
+    so only symbol names and metrics are pickled per task.
+
+    Args:
+        datasets: Candles by symbol
+        strategy: Name of the strategy, as for `StrategyFactory.build`
+        timeframe: Timeframe of the candles
+        options: Keyword arguments of `StrategyFactory.build` besides
+            strategy, data, symbol and timeframe
+        execution: Fees, slippage and sizing of every symbol
+        max_workers: Number of worker processes (defaults to CPU count)
+    """
+    index, symbols, matrix = price_matrix(datasets)
+    with SharedArray.copy_of(matrix) as prices, SharedArray(
+        (len(index), len(symbols))
+    ) as profit:
+        del matrix
+        profit.array[...] = np.nan
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach,
+            initargs=(prices.spec, profit.spec, index),
+        ) as executor:
+            results = executor.map(
+                _backtest_symbol,
+                [
+                    (column, symbol, strategy, timeframe, options, execution)
+                    for column, symbol in enumerate(symbols)
+                ],
+            )
+            metrics = dict(zip(symbols, results))
+
+        returns = profit.array.copy()
+
+    return Portfolio(index, symbols, returns, metrics, portfolio_returns(returns))
+
+
+def portfolio_returns(profit: np.ndarray) -> np.ndarray:
+    """
+    Get the returns of a portfolio rebalanced to equal weights on every bar.
+
+    Args:
+        profit: Returns, (bars x symbols) with NaNs where a symbol doesn't
+            trade
+    """
+    active = np.count_nonzero(~np.isnan(profit), axis=1)
+    total = np.nansum(profit, axis=1)
+    return np.divide(total, active, out=np.zeros(len(profit)), where=active > 0)
+
+
+def portfolio_metrics(
+    portfolio: Portfolio, periods_per_year: float = 1.0
+) -> Dict[str, float]:
+    """
+    Calculate the metrics of a portfolio as a whole.
+
+    Args:
+        portfolio: Backtested portfolio
+        periods_per_year: Bars per year, to annualize the Sharpe ratio
+    """
+    returns = portfolio.returns
+    if not len(returns):
+        return {
+            "total_profit": 0.0,
+            "max_drawdown": 0.0,
+            "sharpe_ratio": 0.0,
+            "mean_correlation": 0.0,
+        }
+
+    equity = np.cumprod(1.0 + returns)
+    deviation = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    drawdowns = equity / np.maximum.accumulate(equity) - 1
+
+    correlation = correlation_matrix(portfolio.profit)
+    pairs = correlation[np.triu_indices(len(correlation), k=1)]
+    return {
+        "total_profit": float(equity[-1] - 1),
+        "max_drawdown": float(abs(drawdowns.min())),
+        "sharpe_ratio": (
+            float(returns.mean() / deviation * np.sqrt(periods_per_year))
+            if deviation > 0
+            else 0.0
+        ),
+        "mean_correlation": (
+            float(np.nanmean(pairs)) if np.isfinite(pairs).any() else 0.0
+        ),
+    }
+
+
+def correlation_matrix(profit: np.ndarray) -> np.ndarray:
+    """
+    Correlate the returns of every pair of symbols, over all bars.
+
+    Args:
+        profit: Returns, (bars x symbols); NaNs count as flat
+    """
+    returns = np.nan_to_num(profit)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.atleast_2d(np.corrcoef(returns, rowvar=False))
+
+
+# Shared arrays of a worker process
+_prices: Optional[SharedArray] = None
+_profit: Optional[SharedArray] = None
+_index: Optional[pd.DatetimeIndex] = None
+
+
+def _attach(prices: SharedSpec, profit: SharedSpec, index: pd.DatetimeIndex):
+    """Attach a worker process to the shared arrays of a portfolio"""
+    global _prices, _profit, _index
+    _prices = SharedArray.attach(prices)
+    _profit = SharedArray.attach(profit)
+    _index = index
+
+
+def _backtest_symbol(
+    task: Tuple[int, str, str, str, Dict[str, Any], Execution],
+) -> Dict[str, float]:
+    """Backtest a strategy on one column of the shared price matrix"""
+    column, symbol, strategy, timeframe, options, execution = task
+    candles = _prices.array[column]
+    rows = np.flatnonzero(~np.isnan(candles[FIELDS.index("close")]))
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        # Bars since the symbol was listed, read in place
+        rows = slice(rows[0], rows[-1] + 1)
+    data = pd.DataFrame(
+        candles[:, rows].T, index=_index[rows], columns=FIELDS, copy=False
+    )
+
+    st = StrategyFactory.build(
+        strategy=strategy, data=data, symbol=symbol, timeframe=timeframe, **options
+    )
+    st.execution = execution
+    batch = st.generate_signals_batch([st.parameters])
+    _profit.array[rows, column] = batch.profit[:, 0]
+    return batch_metrics(batch, st.periods_per_year)[0]
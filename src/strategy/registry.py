@@ -0,0 +1,59 @@
+from functools import lru_cache
+from importlib import import_module
+from importlib.metadata import EntryPoint, entry_points
+from typing import Dict, List, Type
+
+from .strategy import Strategy
+
+# Entry point group other packages register their strategies in, e.g.
+# [project.entry-points."trading_strategy.strategies"]
+# breakout = "my_package.breakout:Breakout"
+ENTRY_POINT_GROUP = "trading_strategy.strategies"
+
+# Built-in strategies by name, as "module:class" of this package
+BUILTIN_STRATEGIES = {
+    "bollinger-bands": "bollinger_bands:BollingerBands",
+    "ichimoku": "ichimoku:Ichimoku",
+    "ma-cross": "ma_cross:MaCross",
+    "macd": "macd:Macd",
+    "rsi": "rsi:Rsi",
+}
+
+
+@lru_cache(maxsize=None)
+def external_strategies() -> Dict[str, EntryPoint]:
+    """
+    Find the strategies installed packages register, without importing them.
+    Built-in names can't be overridden.
+    """
+    return {
+        entry_point.name: entry_point
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+        if entry_point.name not in BUILTIN_STRATEGIES
+    }
+
+
+def strategy_names() -> List[str]:
+    """Get the names of the built-in and the installed strategies"""
+    return list(BUILTIN_STRATEGIES) + sorted(external_strategies())
+
+
+@lru_cache(maxsize=None)
+def load_strategy(name: str) -> Type[Strategy]:
+    """
+    Import the module of a strategy and get its class.
+
+    Args:
+        name: Name of the strategy (e.g. 'ichimoku')
+    """
+    if name in BUILTIN_STRATEGIES:
+        module, attribute = BUILTIN_STRATEGIES[name].split(":")
+        strategy = getattr(import_module(f".{module}", __package__), attribute)
+    elif name in external_strategies():
+        strategy = external_strategies()[name].load()
+    else:
+        raise ValueError(f"Unknown strategy '{name}'.")
+
+    if not (isinstance(strategy, type) and issubclass(strategy, Strategy)):
+        raise TypeError(f"Strategy '{name}' is not a Strategy subclass.")
+    return strategy
@@ -0,0 +1,404 @@
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import pandas as pd
+
+from ..indicator.cache import fingerprint
+from .backtest import Execution
+
+# Where optimizations store their results by default, next to the candle cache
+DEFAULT_PATH = ".cache/results.sqlite"
+
+# Parameter sets looked up before the ones not stored yet are evaluated
+LOOKUP_BLOCK = 8192
+
+# Results written to the database at a time
+WRITE_BLOCK = 1024
+
+# A filter of a query, e.g. `total_trades>=10`
+FILTER = re.compile(r"^\s*([a-z_][a-z0-9_]*)\s*(<=|>=|<|>|=)\s*(\S+)\s*$")
+
+# Metric names, which become column names
+METRIC_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+# Columns of an evaluation besides its metrics
+KEY_COLUMNS = ("fingerprint", "strategy", "timeframe", "execution", "params")
+
+
+class Filter(NamedTuple):
+    """Comparison a stored metric has to meet"""
+
+    metric: str
+    operator: str  # one of <, <=, >, >= and =
+    value: float
+
+    @classmethod
+    def parse(cls, text: str) -> "Filter":
+        """Parse a filter such as `max_drawdown<0.2`"""
+        match = FILTER.match(text)
+        if match is None:
+            raise ValueError(f"Invalid filter '{text}', e.g. total_trades>=10")
+        metric, operator, value = match.groups()
+        try:
+            return cls(metric, operator, float(value))
+        except ValueError:
+            raise ValueError(f"Invalid value of filter '{text}'") from None
+
+
+class Dataset(NamedTuple):
+    """Data parameter sets were evaluated on"""
+
+    fingerprint: str  # see `fingerprint`
+    symbol: str
+    timeframe: str
+    start_ts: Optional[int]  # of the first bar, in milliseconds
+    end_ts: Optional[int]  # of the last bar, in milliseconds
+    bars: int
+
+
+class EvaluationKey(NamedTuple):
+    """What the metrics of a parameter set were evaluated on"""
+
+    fingerprint: str  # of the data, see `fingerprint`
+    strategy: str
+    timeframe: str
+    execution: str  # JSON of the `Execution`
+
+
+def strategy_key(strategy: type) -> str:
+    """
+    Get the name results of a strategy class are stored by, qualified by its
+    module so a plugin class named like a built-in one doesn't share them
+    """
+    return f"{strategy.__module__}.{strategy.__qualname__}"
+
+
+class ResultStore:
+    """
+    Metrics of the parameter sets an optimizer evaluated, in a local SQLite
+    database, so an interrupted or widened optimization only evaluates the
+    parameter sets it hasn't yet.
+
+    Every evaluation is keyed by the fingerprint of the data it was run on,
+    the strategy, the timeframe, the execution and the parameters. Every
+    metric is a column of its own, so results can be filtered and ranked
+    in SQL, here or with any SQLite client.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Args:
+            path: Database file, created with its directory if missing
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS datasets (
+                fingerprint TEXT PRIMARY KEY,
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                start_ts INTEGER,
+                end_ts INTEGER,
+                bars INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS evaluations (
+                fingerprint TEXT NOT NULL,
+                strategy TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                execution TEXT NOT NULL,
+                params TEXT NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (fingerprint, strategy, timeframe, execution, params)
+            );
+            """)
+        self.metrics = [
+            row[1]
+            for row in self.connection.execute("PRAGMA table_info(evaluations)")
+            if row[1] not in KEY_COLUMNS + ("created",)
+        ]
+        self._pending: List[Tuple[EvaluationKey, Dict[str, Any], Dict[str, float]]] = []
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Write the pending results and close the database"""
+        self.flush()
+        self.connection.close()
+
+    def key(
+        self,
+        data: pd.DataFrame,
+        strategy: type,
+        symbol: str,
+        timeframe: str,
+        execution: Execution = Execution(),
+    ) -> EvaluationKey:
+        """
+        Record the data results are evaluated on and get their key.
+
+        Args:
+            data: OHLCV data the parameter sets are evaluated on
+            strategy: Strategy class
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            execution: Fees, slippage and sizing
+        """
+        key = EvaluationKey(
+            fingerprint(data),
+            strategy_key(strategy),
+            timeframe,
+            json.dumps(execution._asdict()),
+        )
+        timestamps = data.index.as_unit("ms").asi8
+        self.connection.execute(
+            "INSERT OR IGNORE INTO datasets VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                key.fingerprint,
+                symbol,
+                timeframe,
+                int(timestamps[0]) if len(timestamps) else None,
+                int(timestamps[-1]) if len(timestamps) else None,
+                len(data),
+            ),
+        )
+        self.connection.commit()
+        return key
+
+    def get(
+        self, key: EvaluationKey, params: Dict[str, Any]
+    ) -> Optional[Dict[str, float]]:
+        """Get the stored metrics of a parameter set, if any"""
+        if not self.metrics:
+            return None
+        row = self.connection.execute(
+            f"SELECT {_columns(self.metrics)} FROM evaluations"
+            " WHERE fingerprint = ? AND strategy = ? AND timeframe = ?"
+            " AND execution = ? AND params = ?",
+            (*key, _dumps(params)),
+        ).fetchone()
+        if row is None:
+            return None
+        return _metrics(self.metrics, row)
+
+    def put(
+        self, key: EvaluationKey, params: Dict[str, Any], metrics: Dict[str, float]
+    ):
+        """Store the metrics of a parameter set, replacing stored ones"""
+        self._pending.append((key, params, metrics))
+        if len(self._pending) >= WRITE_BLOCK:
+            self.flush()
+
+    def flush(self):
+        """Write the pending results in one transaction"""
+        if not self._pending:
+            return
+
+        names = list(dict.fromkeys(n for _, _, m in self._pending for n in m))
+        for name in names:
+            if name not in self.metrics:
+                if not METRIC_NAME.match(name):
+                    raise ValueError(f"Invalid metric name '{name}'")
+                # Without a type, integer metrics are read back as integers
+                self.connection.execute(
+                    f"ALTER TABLE evaluations ADD COLUMN {_columns([name])}"
+                )
+                self.metrics.append(name)
+
+        created = time.time()
+        columns = list(KEY_COLUMNS) + ["created"] + names
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO evaluations ({_columns(columns)})"
+                f" VALUES ({', '.join('?' * len(columns))})",
+                [
+                    (*key, _dumps(params), created)
+                    + tuple(_value(metrics.get(name)) for name in names)
+                    for key, params, metrics in self._pending
+                ],
+            )
+        self._pending = []
+
+    def evaluate(
+        self,
+        evaluate: Callable[
+            [List[Dict[str, Any]]], Iterator[Tuple[Dict[str, Any], Dict[str, float]]]
+        ],
+        key: EvaluationKey,
+        param_grid: Iterable[Dict[str, Any]],
+        resume: bool = True,
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """
+        Evaluate only the parameter sets that aren't stored yet, and store
+        their results as they come.
+
+        The grid is read a block at a time, so stored results are yielded
+        as they are found and only one block of new parameter sets is held
+        in memory. Pending results are written when the evaluation ends or
+        is interrupted.
+
+        Args:
+            evaluate: Backtests a list of parameter sets, as `evaluate_grid`
+            key: What the parameter sets are evaluated on, see `key`
+            param_grid: Parameter sets to evaluate
+            resume: Reuse the stored results, instead of evaluating and
+                replacing them
+
+        Yields:
+            Every parameter set with its metrics
+        """
+        params = iter(param_grid)
+        try:
+            while True:
+                missing = []
+                for candidate in params:
+                    metrics = self.get(key, candidate) if resume else None
+                    if metrics is not None:
+                        yield candidate, metrics
+                        continue
+                    missing.append(candidate)
+                    if len(missing) == LOOKUP_BLOCK:
+                        break
+                if not missing:
+                    return
+
+                for candidate, metrics in evaluate(missing):
+                    self.put(key, candidate, metrics)
+                    yield candidate, metrics
+        finally:
+            self.flush()
+
+    def latest_dataset(
+        self,
+        strategy: type,
+        symbol: str,
+        timeframe: str,
+        execution: Execution = Execution(),
+    ) -> Optional[Dataset]:
+        """
+        Get the latest data a strategy was evaluated on for a symbol.
+
+        Of the data with results, the one with the latest last bar is used,
+        and the one with the most bars of those, so results on the shorter
+        windows of successive halving aren't mixed with the ones on all the
+        bars.
+
+        Args:
+            strategy: Strategy class
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            execution: Fees, slippage and sizing
+        """
+        row = self.connection.execute(
+            "SELECT * FROM datasets WHERE symbol = ? AND timeframe = ?"
+            " AND EXISTS (SELECT 1 FROM evaluations"
+            " WHERE evaluations.fingerprint = datasets.fingerprint"
+            " AND strategy = ? AND timeframe = ? AND execution = ?)"
+            " ORDER BY end_ts DESC, bars DESC LIMIT 1",
+            (
+                symbol,
+                timeframe,
+                strategy_key(strategy),
+                timeframe,
+                json.dumps(execution._asdict()),
+            ),
+        ).fetchone()
+        return None if row is None else Dataset(*row)
+
+    def best(
+        self,
+        strategy: type,
+        symbol: str,
+        timeframe: str,
+        execution: Execution = Execution(),
+        metric: str = "total_profit",
+        count: int = 1,
+        filters: Sequence[Filter] = (),
+        dataset: Optional[Dataset] = None,
+    ) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """
+        Get the best stored results of a strategy on one dataset.
+
+        Args:
+            strategy: Strategy class
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            execution: Fees, slippage and sizing
+            metric: Metric to rank by, highest first
+            count: Number of results
+            filters: Comparisons the results have to meet
+            dataset: Data the results were evaluated on (defaults to the
+                latest one, see `latest_dataset`)
+
+        Returns:
+            The parameter sets with their metrics, best first
+        """
+        if not self.metrics:
+            return []
+        for name in [metric] + [f.metric for f in filters]:
+            if name not in self.metrics:
+                raise ValueError(f"Unknown metric '{name}'")
+
+        if dataset is None:
+            dataset = self.latest_dataset(strategy, symbol, timeframe, execution)
+            if dataset is None:
+                return []
+
+        conditions = "".join(
+            f" AND {_columns([f.metric])} {f.operator} ?" for f in filters
+        )
+        rows = self.connection.execute(
+            f"SELECT params, {_columns(self.metrics)} FROM evaluations"
+            " WHERE fingerprint = ? AND strategy = ? AND timeframe = ?"
+            f" AND execution = ? AND {_columns([metric])} IS NOT NULL{conditions}"
+            f" ORDER BY {_columns([metric])} DESC, created LIMIT ?",
+            (
+                dataset.fingerprint,
+                strategy_key(strategy),
+                timeframe,
+                json.dumps(execution._asdict()),
+                *(f.value for f in filters),
+                count,
+            ),
+        ).fetchall()
+        return [(json.loads(row[0]), _metrics(self.metrics, row[1:])) for row in rows]
+
+
+def _columns(names: Sequence[str]) -> str:
+    """Quote column names for a statement"""
+    return ", ".join(f'"{name}"' for name in names)
+
+
+def _dumps(params: Dict[str, Any]) -> str:
+    """Serialize parameters the same way whatever their order"""
+    return json.dumps(params, sort_keys=True)
+
+
+def _value(value: Optional[float]) -> Optional[float]:
+    # SQLite stores NaN as NULL anyway
+    return None if value is None or value != value else value
+
+
+def _metrics(names: Sequence[str], row: Sequence[Optional[float]]) -> Dict[str, Any]:
+    return {
+        name: float("nan") if value is None else value
+        for name, value in zip(names, row)
+    }
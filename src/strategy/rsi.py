@@ -1,10 +1,28 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+import numpy as np
 import pandas as pd
-from ta.momentum import RSIIndicator
 
+from ..indicator.kernels import relative_strength_index
+from ..indicator.streaming import RelativeStrengthIndex
+from .parameter_space import Constraint, ParameterSpace
 from .strategy import Strategy
 
 
 class Rsi(Strategy):
+    parameter_space = ParameterSpace(
+        {
+            "period": range(6, 30 + 2, 2),
+            "overbought": range(60, 85 + 5, 5),
+            "oversold": range(15, 40 + 5, 5),
+        },
+        [
+            Constraint(
+                ("overbought", "oversold"),
+                lambda overbought, oversold: oversold < overbought,
+            )
+        ],
+    )
+
     def __init__(
         self,
         data: pd.DataFrame,
@@ -19,22 +37,40 @@ class Rsi(Strategy):
         self.overbought = overbought
         self.oversold = oversold
 
-    def generate_signals(self) -> pd.DataFrame:
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "period": self.period,
+            "overbought": self.overbought,
+            "oversold": self.oversold,
+        }
 
-        # Calculate RSI
-        rsi = RSIIndicator(close=self.data["close"], window=self.period).rsi()
+    def signal_matrix(self, param_grid: Sequence[Dict[str, Any]]) -> np.ndarray:
 
-        # Generate signals
-        signals = pd.DataFrame(index=self.data.index)
-        signals["price"] = self.data["close"]
-        signals["signal"] = 0
+        # Calculate RSI
+        close = self.data["close"].to_numpy(dtype="float64")
+        rsi = self.indicator_matrix(
+            "rsi",
+            lambda period: relative_strength_index(close, period),
+            [(params["period"],) for params in param_grid],
+        )
+        overbought = np.array([params["overbought"] for params in param_grid])
+        oversold = np.array([params["oversold"] for params in param_grid])
 
         # Buy signal when RSI crosses below oversold
-        signals.loc[rsi < self.oversold, "signal"] = 1
         # Sell signal when RSI crosses above overbought
-        signals.loc[rsi > self.overbought, "signal"] = -1
+        signal = (rsi < oversold).astype(np.int8)
+        signal[rsi > overbought] = -1
+
+        return signal
+
+    def _create_stream(self) -> Callable[[Mapping[str, float]], Optional[int]]:
+        rsi = RelativeStrengthIndex(self.period)
 
-        # Calculate profit/loss for each signal
-        signals["profit"] = signals["signal"] * signals["price"].pct_change()
+        def update(candle: Mapping[str, float]) -> Optional[int]:
+            value = rsi.update(float(candle["close"]))
+            if value > self.overbought:
+                return -1
+            return int(value < self.oversold)
 
-        return signals
+        return update
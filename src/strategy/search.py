@@ -0,0 +1,353 @@
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+import numpy as np
+import pandas as pd
+
+from .backtest import Execution
+from .grid_search import TopResults, evaluate_grid, strategy_pool
+from .parameter_space import ParameterSpace
+from .results import EvaluationKey, ResultStore
+from .strategy import Strategy
+
+# Backtests parameter sets on the latest bars (all of them by default) and
+# yields every one with its metrics, see `evaluate_grid`
+Evaluate = Callable[
+    [Iterable[Dict[str, Any]], Optional[int]],
+    Iterator[Tuple[Dict[str, Any], Dict[str, float]]],
+]
+
+# Fewest bars successive halving scores parameter sets on
+MIN_RUNG_BARS = 1000
+
+
+class Search(ABC):
+    """How an optimizer chooses the parameter sets it evaluates"""
+
+    def __init__(
+        self,
+        space: ParameterSpace,
+        combinations: int,
+        budget: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            space: Parameter space of the strategy
+            combinations: Number of combinations of the space meeting its
+                constraints
+            budget: Number of parameter sets to evaluate, as each search
+                defines it (see `default_budget`)
+            seed: Seed of the random choices
+        """
+        self.space = space
+        self.combinations = combinations
+        self.budget = min(
+            budget if budget is not None else self.default_budget(), combinations
+        )
+        self.rng = np.random.default_rng(seed)
+
+    def default_budget(self) -> int:
+        return self.combinations
+
+    @abstractmethod
+    def evaluations(self, bars: int) -> int:
+        """Get the number of evaluations on data of this many bars"""
+
+    @abstractmethod
+    def run(
+        self, evaluate: Evaluate, bars: int, metric: str
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """
+        Search the space.
+
+        Args:
+            evaluate: Backtests parameter sets
+            bars: Number of bars of the data
+            metric: Metric to maximize
+
+        Yields:
+            The parameter sets evaluated on all the bars, with their metrics
+        """
+
+    def sample(self, count: int, seen: set) -> List[Dict[str, Any]]:
+        """Draw parameter sets at random, none of them twice"""
+        params = []
+        while len(params) < count and len(seen) < self.combinations:
+            candidate = self.space.sample(self.rng)
+            if candidate is None:
+                break
+            key = tuple(candidate.values())
+            if key not in seen:
+                seen.add(key)
+                params.append(candidate)
+        return params
+
+
+class GridSearch(Search):
+    """Every combination of the space"""
+
+    def evaluations(self, bars: int) -> int:
+        return self.combinations
+
+    def run(self, evaluate, bars, metric):
+        yield from evaluate(self.space, None)
+
+
+class RandomSearch(Search):
+    """Parameter sets drawn at random from the space"""
+
+    def default_budget(self) -> int:
+        return max(self.combinations // 10, 1)
+
+    def evaluations(self, bars: int) -> int:
+        return self.budget
+
+    def run(self, evaluate, bars, metric):
+        if self.budget >= self.combinations:
+            yield from evaluate(self.space, None)
+            return
+        yield from evaluate(self.sample(self.budget, set()), None)
+
+
+class SuccessiveHalving(Search):
+    """
+    Score the budget on the latest bars only, and promote the best third to
+    three times as many bars, until the survivors are scored on all of them.
+
+    Every rung costs about the same, and a parameter set that does badly
+    on the latest bars rarely makes it to the top on all of them.
+    """
+
+    # Parameter sets of a rung per parameter set promoted to the next one
+    eta = 3
+
+    def rungs(self, bars: int) -> int:
+        """Get the number of rungs before the one with all the bars"""
+        rungs = 0
+        while (
+            bars // self.eta ** (rungs + 1) >= MIN_RUNG_BARS
+            and self.budget // self.eta ** (rungs + 1) >= 1
+        ):
+            rungs += 1
+        return rungs
+
+    def evaluations(self, bars: int) -> int:
+        return sum(
+            self.budget // self.eta**rung for rung in range(self.rungs(bars) + 1)
+        )
+
+    def run(self, evaluate, bars, metric):
+        rungs = self.rungs(bars)
+        params: Iterable[Dict[str, Any]] = (
+            self.space
+            if self.budget >= self.combinations
+            else self.sample(self.budget, set())
+        )
+        for rung in range(rungs):
+            promoted = TopResults(self.budget // self.eta ** (rung + 1), metric)
+            for candidate, metrics in evaluate(
+                params, bars // self.eta ** (rungs - rung)
+            ):
+                promoted.add(candidate, metrics)
+            params = [candidate for candidate, _ in promoted.best()]
+        yield from evaluate(params, None)
+
+
+class TreeParzenSearch(Search):
+    """
+    Tree-structured Parzen estimator: after a random start, draw parameter
+    sets that are likely among the best quarter seen so far and unlikely
+    among the rest, a round at a time.
+
+    The values of every parameter are treated as ordered, and smoothed over
+    their neighbours, so values near good ones are tried as well.
+    """
+
+    # Share of the budget drawn at random before modelling the results
+    startup = 0.2
+
+    # Rounds of modelled parameter sets, each evaluated as one batch
+    rounds = 8
+
+    # Share of the results counted as good
+    gamma = 0.25
+
+    # Candidates drawn per parameter set a round evaluates
+    candidates = 24
+
+    def default_budget(self) -> int:
+        return max(self.combinations // 10, 1)
+
+    def evaluations(self, bars: int) -> int:
+        return self.budget
+
+    def run(self, evaluate, bars, metric):
+        names = list(self.space.parameters)
+        values = [self.space.parameters[name] for name in names]
+        positions = [{value: i for i, value in enumerate(v)} for v in values]
+
+        seen = set()
+        observed: List[List[int]] = []
+        scores: List[float] = []
+
+        def record(params: Dict[str, Any], metrics: Dict[str, float]):
+            observed.append(
+                [positions[i][params[name]] for i, name in enumerate(names)]
+            )
+            score = metrics[metric]
+            scores.append(score if score == score else -np.inf)
+
+        first = self.sample(max(int(self.budget * self.startup), 1), seen)
+        for params, metrics in evaluate(first, None):
+            record(params, metrics)
+            yield params, metrics
+
+        remaining = self.budget - len(first)
+        for done in range(self.rounds):
+            count = remaining // (self.rounds - done)
+            remaining -= count
+            batch = self.propose(count, values, observed, scores, seen)
+            for params, metrics in evaluate(batch, None):
+                record(params, metrics)
+                yield params, metrics
+
+    def propose(
+        self,
+        count: int,
+        values: List[List[Any]],
+        observed: List[List[int]],
+        scores: List[float],
+        seen: set,
+    ) -> List[Dict[str, Any]]:
+        """Draw the parameter sets of a round that aren't evaluated yet"""
+        if count < 1:
+            return []
+
+        observed = np.array(observed)
+        order = np.argsort(scores, kind="stable")[::-1]
+        good = order[: max(int(math.ceil(len(order) * self.gamma)), 1)]
+        bad = order[len(good) :]
+
+        # Likelihood of every value of every parameter among the good and the
+        # bad results, with a uniform prior
+        draws = self.candidates * count
+        indices = np.empty((draws, len(values)), dtype=np.intp)
+        ratio = np.zeros(draws)
+        for i, options in enumerate(values):
+            good_density = self.density(observed[good, i], len(options))
+            bad_density = self.density(observed[bad, i], len(options))
+            indices[:, i] = self.rng.choice(len(options), size=draws, p=good_density)
+            ratio += np.log(good_density[indices[:, i]])
+            ratio -= np.log(bad_density[indices[:, i]])
+
+        # Every parameter set is the most likely good one of its own draws,
+        # rather than of all of them, so a round doesn't collapse onto the
+        # single most promising region
+        names = list(self.space.parameters)
+        batch = []
+        for group in np.arange(draws).reshape(count, self.candidates):
+            for j in group[np.argsort(ratio[group], kind="stable")[::-1]]:
+                key = tuple(values[i][indices[j, i]] for i in range(len(values)))
+                if key in seen:
+                    continue
+                params = dict(zip(names, key))
+                if not self.space.is_valid(params):
+                    continue
+                seen.add(key)
+                batch.append(params)
+                break
+
+        # Top up with random ones when the model keeps drawing the same sets
+        return batch + self.sample(count - len(batch), seen)
+
+    @staticmethod
+    def density(positions: np.ndarray, size: int) -> np.ndarray:
+        """Smooth the positions of observed values over all of them"""
+        width = max(size / 10, 1.0)
+        grid = np.arange(size)
+        weights = np.exp(-0.5 * ((grid[:, None] - positions[None, :]) / width) ** 2)
+        density = weights.sum(axis=1) + 1.0
+        return density / density.sum()
+
+
+# Search modes of the optimizer, by the name of their option
+SEARCHES: Dict[str, Type[Search]] = {
+    "grid": GridSearch,
+    "random": RandomSearch,
+    "halving": SuccessiveHalving,
+    "tpe": TreeParzenSearch,
+}
+
+
+def search(
+    strategy: Type[Strategy],
+    data: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    mode: Search,
+    execution: Execution = Execution(),
+    metric: str = "total_profit",
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    store: Optional[ResultStore] = None,
+    resume: bool = True,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+    """
+    Search the parameters of a strategy on one pool of worker processes,
+    whatever parameter sets the search mode chooses.
+
+    With a store, every evaluation is stored, on all the bars or on the
+    latest ones, and parameter sets already stored for the same data aren't
+    evaluated again.
+
+    Args:
+        strategy: Strategy class
+        data: OHLCV data
+        symbol: Trading pair symbol
+        timeframe: Candle timeframe
+        mode: Search mode
+        execution: Fees, slippage and sizing
+        metric: Metric to maximize
+        max_workers: Number of worker processes (defaults to CPU count)
+        progress: Called with 1 after every evaluation, on any number of
+            bars, as `mode.evaluations` counts them
+        store: Stores the results, see `ResultStore.evaluate`
+        resume: Reuse the stored results, instead of evaluating and
+            replacing them
+
+    Yields:
+        The parameter sets evaluated on all the data, with their metrics
+    """
+    first = next(iter(mode.space), None)
+    if first is None:
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    with strategy_pool(
+        strategy, data, symbol, timeframe, first, execution, workers
+    ) as executor:
+        keys: Dict[Optional[int], EvaluationKey] = {}
+
+        def evaluate(param_grid, bars=None):
+            if store is None:
+                results = evaluate_grid(executor, workers, param_grid, bars)
+            else:
+                if bars not in keys:
+                    window = data if bars is None else data.iloc[-bars:]
+                    keys[bars] = store.key(
+                        window, strategy, symbol, timeframe, execution
+                    )
+                results = store.evaluate(
+                    lambda missing: evaluate_grid(executor, workers, missing, bars),
+                    keys[bars],
+                    param_grid,
+                    resume,
+                )
+            for result in results:
+                if progress is not None:
+                    progress(1)
+                yield result
+
+        yield from mode.run(evaluate, len(data), metric)
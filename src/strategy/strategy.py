@@ -1,46 +1,334 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+import numpy as np
 import pandas as pd
 
+from ..client.timeframe import timeframe_to_milliseconds
+from ..indicator.cache import IndicatorCache
+from .backtest import Execution, Trades, backtest
+from .metrics import YEAR_MS, performance_metrics
+from .parameter_space import ParameterSpace
+
+# Cells of the (bars x params) matrices a batch evaluates at once
+BATCH_CELLS = 1024 * 1024
+
+
+class SignalBatch(NamedTuple):
+    """Signals of many parameter sets, one column per parameter set"""
+
+    price: np.ndarray  # (bars,)
+    signal: np.ndarray  # (bars x params) of -1, 0 and 1
+    position: np.ndarray  # (bars x params) of -1, 0 and 1
+    profit: np.ndarray  # (bars x params), after costs
+    equity: np.ndarray  # (bars x params), starting at 1
+    trades: Trades
+
+    def signals(self, column: int, index: pd.Index) -> "Signals":
+        """
+        Get the signals of one parameter set, as views into this batch.
+
+        Args:
+            column: Column of the parameter set
+            index: Index of the bars
+        """
+        return Signals(
+            index,
+            self.price,
+            self.signal[:, column],
+            self.position[:, column],
+            self.profit[:, column],
+        )
+
+
+class Signals:
+    """
+    Signals of one parameter set, as arrays that are usually views into
+    the matrices they were computed in. A data frame is only built when
+    asked for.
+    """
+
+    __slots__ = ("index", "price", "signal", "position", "profit", "_frame")
+
+    def __init__(
+        self,
+        index: pd.Index,
+        price: np.ndarray,
+        signal: np.ndarray,
+        position: np.ndarray,
+        profit: np.ndarray,
+    ):
+        """
+        Initialize the signals.
+
+        Args:
+            index: Index of the bars
+            price: Close price of every bar
+            signal: Signal of every bar, -1, 0 or 1
+            position: Position held after every bar, -1, 0 or 1
+            profit: Profit of every bar, after costs
+        """
+        self.index = index
+        self.price = price
+        self.signal = signal
+        self.position = position
+        self.profit = profit
+        self._frame = None
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get a data frame with price, signal, position and profit columns"""
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {
+                    "price": self.price,
+                    "signal": self.signal.astype(np.int64),
+                    "position": self.position.astype(np.int64),
+                    "profit": self.profit,
+                },
+                index=self.index,
+            )
+        return self._frame
+
 
 class Strategy(ABC):
+    # Shared by every strategy in this process
+    indicator_cache = IndicatorCache()
+
+    # Fees, slippage and sizing signals are traded with
+    execution = Execution()
+
+    # Constructor arguments by the name of their CLI option, less the
+    # strategy's prefix, where the two differ (see `StrategyFactory.build`)
+    option_arguments: Dict[str, str] = {}
+
+    # Values the optimizer searches, for strategies that can be optimized
+    parameter_space: Optional[ParameterSpace] = None
+
     def __init__(self, data: pd.DataFrame, symbol: str, timeframe: str):
         self.data = data
         self.symbol = symbol
         self.timeframe = timeframe
+        self._stream = None
 
+    def indicator(
+        self, name: str, compute: Callable[[], np.ndarray], *params: Hashable
+    ) -> np.ndarray:
+        """
+        Get an indicator series of this strategy's data through the cache.
+
+        Args:
+            name: Name of the indicator
+            compute: Function computing the series
+            params: Parameters the series depends on
+        """
+        return self.indicator_cache.get(self.data, name, params, compute)
+
+    def indicator_matrix(
+        self,
+        name: str,
+        compute: Callable[..., np.ndarray],
+        params: Sequence[tuple],
+    ) -> np.ndarray:
+        """
+        Get one indicator column per parameter tuple, computing each distinct
+        tuple once through the cache.
+
+        Args:
+            name: Name of the indicator
+            compute: Function computing the series from a parameter tuple
+            params: Parameter tuple of every column
+        """
+        distinct = list(dict.fromkeys(params))
+        series = np.column_stack(
+            [self.indicator(name, lambda p=p: compute(*p), *p) for p in distinct]
+        )
+        position = {p: i for i, p in enumerate(distinct)}
+        return series[:, [position[p] for p in params]]
+
+    @property
     @abstractmethod
-    def generate_signals(self) -> pd.DataFrame:
-        """Generate buy/sell signals based on the strategy logic"""
+    def parameters(self) -> Dict[str, Any]:
+        """Get the constructor arguments besides data, symbol and timeframe"""
         pass
 
+    def generate_signals(self) -> Signals:
+        """
+        Generate buy/sell signals based on the strategy logic. Call
+        `to_frame` on the result for a data frame.
+        """
+        batch = self.generate_signals_batch([self.parameters])
+        return batch.signals(0, self.data.index)
+
+    @abstractmethod
+    def signal_matrix(self, param_grid: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """
+        Generate the signals of many parameter sets at once, as a
+        (bars x params) matrix of -1, 0 and 1.
+
+        Args:
+            param_grid: Keyword arguments of the strategy's constructor
+                besides data, symbol and timeframe, one dict per column
+        """
+        pass
+
+    def generate_signals_batch(
+        self, param_grid: Sequence[Dict[str, Any]]
+    ) -> SignalBatch:
+        """
+        Generate and backtest the signals of many parameter sets at once.
+
+        Args:
+            param_grid: Keyword arguments of the strategy's constructor
+                besides data, symbol and timeframe, one dict per column
+        """
+        price = self.data["close"].to_numpy(dtype="float64")
+        signal = self.signal_matrix(param_grid)
+        result = backtest(price, signal, self.execution)
+        return SignalBatch(
+            price,
+            signal,
+            result.position,
+            result.profit,
+            result.equity,
+            result.trades,
+        )
+
+    @staticmethod
+    def lookahead(params: Dict[str, Any]) -> int:
+        """
+        Get the number of bars after a bar its signal depends on.
+
+        Args:
+            params: Keyword arguments of the strategy's constructor besides
+                data, symbol and timeframe
+        """
+        return 0
+
+    @property
+    def signal_lag(self) -> int:
+        """Get the bars between a candle passed to `update` and its signal"""
+        return self.lookahead(self.parameters)
+
+    def update(self, candle: Mapping[str, float]) -> Optional[int]:
+        """
+        Feed the next candle to the incremental mode and get its signal.
+
+        Indicators are updated from rolling state in O(1) per candle instead
+        of being recomputed over the whole history, and the signals equal
+        those `generate_signals` gives for the same candles. Strategies with
+        a `signal_lag` return the signal of the bar that many candles back,
+        or None while there is no such bar yet.
+
+        Args:
+            candle: Candle with (at least) `high`, `low` and `close` prices
+        """
+        if self._stream is None:
+            self._stream = self._create_stream()
+        return self._stream(candle)
+
+    def warm_up(self):
+        """Feed this strategy's data to the incremental mode"""
+        for candle in self.data.to_dict("records"):
+            self.update(candle)
+
+    def _create_stream(self) -> Callable[[Mapping[str, float]], Optional[int]]:
+        """Create the function `update` passes every candle to"""
+        raise NotImplementedError(f"{type(self).__name__} has no incremental mode")
+
+    def get_performance_metrics_batch(
+        self, param_grid: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, float]]:
+        """Calculate the performance metrics of many parameter sets"""
+
+        # Bound the size of the matrices evaluated at once
+        chunk = max(1, BATCH_CELLS // max(len(self.data), 1))
+        metrics = []
+        for start in range(0, len(param_grid), chunk):
+            batch = self.generate_signals_batch(param_grid[start : start + chunk])
+            metrics.extend(batch_metrics(batch, self.periods_per_year))
+        return metrics
+
+    def get_performance_metrics_windows(
+        self, param_grid: Sequence[Dict[str, Any]], windows: Sequence[slice]
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        Calculate the performance metrics of many parameter sets on windows
+        of the data, such as the folds of a walk-forward optimization.
+
+        Indicators and signals are computed once over all the data and
+        every window is backtested on its own from that. Signals that
+        depend on bars after the end of their window are dropped, so no
+        window sees what comes after it.
+
+        Args:
+            param_grid: Keyword arguments of the strategy's constructor
+                besides data, symbol and timeframe
+            windows: Bars of every window
+
+        Returns:
+            Metrics of every window, by name with one value per parameter set
+        """
+        price = self.data["close"].to_numpy(dtype="float64")
+        lookahead = np.array([self.lookahead(params) for params in param_grid])
+        metrics = [{} for _ in windows]
+
+        chunk = max(1, BATCH_CELLS // max(len(self.data), 1))
+        for start in range(0, len(param_grid), chunk):
+            signal = self.signal_matrix(param_grid[start : start + chunk])
+            lags = lookahead[start : start + chunk]
+            for window, window_metrics in zip(windows, metrics):
+                window_signal = signal[window]
+                if lags.any():
+                    bars = np.arange(len(window_signal), 0, -1)
+                    window_signal = np.where(
+                        bars[:, None] <= lags, np.int8(0), window_signal
+                    )
+                result = backtest(price[window], window_signal, self.execution)
+                chunk_metrics = performance_metrics(
+                    result.position,
+                    result.profit,
+                    result.equity,
+                    result.trades,
+                    self.periods_per_year,
+                )
+                for name, values in chunk_metrics.items():
+                    window_metrics.setdefault(name, []).append(values)
+
+        return [
+            {name: np.concatenate(values) for name, values in window_metrics.items()}
+            for window_metrics in metrics
+        ]
+
     def get_performance_metrics(self) -> Dict[str, float]:
         """Calculate strategy performance metrics"""
+        return self.get_performance_metrics_batch([self.parameters])[0]
+
+    @property
+    def periods_per_year(self) -> float:
+        """Get the number of bars in a year of this strategy's timeframe"""
+        return YEAR_MS / timeframe_to_milliseconds(self.timeframe)
+
 
-        signals = self.generate_signals()
-
-        # Calculate basic metrics
-        total_trades = len(signals[signals["signal"] != 0])
-        profitable_trades = len(signals[signals["profit"] > 0])
-        win_rate = profitable_trades / total_trades if total_trades > 0 else 0
-        total_profit = signals["profit"].sum()
-        max_drawdown = self._calculate_max_drawdown(signals)
-        count_signals = len(signals)
-
-        return {
-            "total_trades": total_trades,
-            "profitable_trades": profitable_trades,
-            "win_rate": win_rate,
-            "total_profit": total_profit,
-            "max_drawdown": max_drawdown,
-            "count_signals": count_signals,
-        }
-
-    def _calculate_max_drawdown(self, signals: pd.DataFrame) -> float:
-        """Calculate maximum drawdown from equity curve"""
-
-        cumulative = (1 + signals["profit"]).cumprod()
-        rolling_max = cumulative.expanding().max()
-        drawdowns = cumulative / rolling_max - 1
-
-        return abs(drawdowns.min())
+def batch_metrics(
+    batch: SignalBatch, periods_per_year: float = 1.0
+) -> List[Dict[str, float]]:
+    """Calculate `Strategy.get_performance_metrics` for every column of a batch"""
+    metrics = performance_metrics(
+        batch.position, batch.profit, batch.equity, batch.trades, periods_per_year
+    )
+    return [
+        {name: values[i].item() for name, values in metrics.items()}
+        for i in range(batch.signal.shape[1])
+    ]
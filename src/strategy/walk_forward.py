@@ -0,0 +1,132 @@
+import os
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Type,
+)
+import numpy as np
+import pandas as pd
+
+from .backtest import Execution
+from .grid_search import dispatch_chunks, strategy_pool, worker_strategy
+from .strategy import Strategy
+
+
+class Fold(NamedTuple):
+    """Bars a walk-forward fold optimizes on and then tests on"""
+
+    train: slice
+    test: slice
+
+
+class FoldResult(NamedTuple):
+    """Best parameters of a fold's training bars and how they did"""
+
+    fold: Fold
+    params: Dict[str, Any]
+    train: Dict[str, float]  # metrics on the training bars
+    test: Dict[str, float]  # metrics on the test bars
+
+
+def walk_forward_folds(bars: int, train_bars: int, test_bars: int) -> List[Fold]:
+    """
+    Split bars into rolling folds, each testing on the bars after its
+    training window; the test windows follow each other without overlap.
+
+    Args:
+        bars: Number of bars
+        train_bars: Bars of every training window
+        test_bars: Bars of every test window (the last one may be shorter)
+    """
+    folds = []
+    start = 0
+    while start + train_bars < bars:
+        end = start + train_bars
+        folds.append(Fold(slice(start, end), slice(end, min(end + test_bars, bars))))
+        start += test_bars
+    return folds
+
+
+def walk_forward(
+    strategy: Type[Strategy],
+    data: pd.DataFrame,
+    symbol: str,
+    timeframe: str,
+    param_grid: Iterable[Dict[str, Any]],
+    folds: Sequence[Fold],
+    execution: Execution = Execution(),
+    metric: str = "total_profit",
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> List[FoldResult]:
+    """
+    Optimize a strategy on the training bars of every fold and test the
+    best parameters on the bars that follow.
+
+    The parameter grid is split among worker processes. Each computes
+    the indicators of its parameters once over all the data and evaluates
+    the training and test windows of every fold from them, instead of
+    recomputing them for every overlapping fold. The best parameters of
+    every fold are kept as chunks come back, so memory doesn't grow with
+    the grid.
+
+    Args:
+        strategy: Strategy class
+        data: OHLCV data of all folds
+        symbol: Trading pair symbol
+        timeframe: Candle timeframe
+        param_grid: Keyword arguments of the strategy's constructor besides
+            data, symbol and timeframe; read lazily, see `dispatch_chunks`
+        folds: Walk-forward folds
+        execution: Fees, slippage and sizing
+        metric: Metric the training windows are optimized for
+        max_workers: Number of worker processes (defaults to CPU count)
+        progress: Called with the number of parameter sets of every
+            evaluated chunk
+    """
+    params = iter(param_grid)
+    first = next(params, None)
+    if first is None or not folds:
+        return []
+
+    windows = [window for fold in folds for window in fold]
+    workers = max_workers or os.cpu_count() or 1
+
+    best: List[Optional[FoldResult]] = [None] * len(folds)
+    with strategy_pool(
+        strategy, data, symbol, timeframe, first, execution, workers
+    ) as executor:
+        for chunk, metrics in dispatch_chunks(
+            executor, _evaluate, chain([first], params), workers, windows
+        ):
+            for i, fold in enumerate(folds):
+                train, test = metrics[2 * i], metrics[2 * i + 1]
+                if np.isnan(train[metric]).all():
+                    continue
+                j = int(np.nanargmax(train[metric]))
+                # Of equal values, the first parameter set wins
+                if best[i] is None or train[metric][j] > best[i].train[metric]:
+                    best[i] = FoldResult(
+                        fold,
+                        dict(chunk[j]),
+                        {name: values[j].item() for name, values in train.items()},
+                        {name: values[j].item() for name, values in test.items()},
+                    )
+            if progress is not None:
+                progress(len(chunk))
+
+    return [result for result in best if result is not None]
+
+
+def _evaluate(
+    param_grid: List[Dict[str, Any]], windows: Sequence[slice]
+) -> List[Dict[str, np.ndarray]]:
+    """Evaluate a chunk of the parameter grid on every window"""
+    return worker_strategy().get_performance_metrics_windows(param_grid, windows)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_ohlcv(bars: int, seed: int = 7, freq: str = "1h") -> pd.DataFrame:
+    """Build a random walk of OHLCV candles with trending stretches"""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.normal(0, 2e-3, -(-bars // 100)), 100)[:bars]
+    close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 1e-2, bars)))
+    open = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open, close) * (1 + np.abs(rng.normal(0, 3e-3, bars)))
+    low = np.minimum(open, close) * (1 - np.abs(rng.normal(0, 3e-3, bars)))
+    return pd.DataFrame(
+        {
+            "open": open,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": rng.uniform(1, 10, bars),
+        },
+        index=pd.date_range("2024-01-01", periods=bars, freq=freq, name="timestamp"),
+    )
+
+
+@pytest.fixture(scope="session")
+def ohlcv() -> pd.DataFrame:
+    return make_ohlcv(1500)
@@ -0,0 +1,189 @@
+import sys
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.client.archive import archive_symbol, parse_archive_name, read_kline_archive
+from src.client.ccxt import CcxtClient
+from src.client.replay import ReplayExchange
+
+from conftest import make_ohlcv
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+HEADER = (
+    "open_time,open,high,low,close,volume,close_time,quote_volume,count,"
+    "taker_buy_volume,taker_buy_quote_volume,ignore\n"
+)
+
+
+def write_archive(path: Path, data: pd.DataFrame, header=False, micros=False):
+    """Zip candles as a CSV laid out like the exchange's kline archives"""
+    open_times = data.index.as_unit("ms").asi8
+    if micros:
+        open_times = open_times * 1000
+    rows = [HEADER] if header else []
+    for open_time, (o, h, l, c, v) in zip(open_times, data.to_numpy()):
+        rows.append(f"{open_time},{o},{h},{l},{c},{v},{open_time + 1},0,0,0,0,0\n")
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(path.with_suffix(".csv").name, "".join(rows))
+
+
+def candles_of_day(day: str, bars=24) -> pd.DataFrame:
+    data = make_ohlcv(bars, seed=int(pd.Timestamp(day).day))
+    data.index = pd.date_range(day, periods=bars, freq="1h", name="timestamp")
+    return data
+
+
+def day_ms(day: str) -> int:
+    return int(pd.Timestamp(day).value // 1_000_000)
+
+
+def test_archive_symbol_drops_separators():
+    assert archive_symbol("BTC/USDT") == "BTCUSDT"
+    assert archive_symbol("eth/usdt:USDT") == "ETHUSDT"
+
+
+def test_parse_monthly_and_daily_archive_names():
+    assert parse_archive_name(Path("BTCUSDT-1m-2024-02.zip")) == (
+        "BTCUSDT",
+        "1m",
+        (1706745600000, 1709251200000 - 1),
+    )
+    assert parse_archive_name(Path("data/ETHUSDT-1M-2023-12-31.zip")) == (
+        "ETHUSDT",
+        "1M",
+        (1703980800000, 1703980800000 + DAY_MS - 1),
+    )
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "BTCUSDT-1m-2024-01.csv",
+        "BTCUSDT-1m-2024-01.zip.CHECKSUM",
+        "btcusdt-1m-2024-01.zip",
+        "BTCUSDT-2024-01.zip",
+        "BTCUSDT-1m-24-01.zip",
+    ],
+)
+def test_other_file_names_are_not_archives(name):
+    assert parse_archive_name(Path(name)) is None
+
+
+@pytest.mark.parametrize("header", [False, True])
+@pytest.mark.parametrize("micros", [False, True])
+def test_read_kline_archive(tmp_path, header, micros):
+    data = candles_of_day("2024-01-01")
+    path = tmp_path / "BTCUSDT-1h-2024-01-01.zip"
+    write_archive(path, data, header=header, micros=micros)
+
+    timestamps, values = read_kline_archive(str(path))
+    assert timestamps.dtype == np.int64
+    np.testing.assert_array_equal(timestamps, data.index.as_unit("ms").asi8)
+    np.testing.assert_allclose(values, data.to_numpy())
+
+
+class InlineExecutor:
+    """Run submitted reads right away and track how many wait to be consumed"""
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.waiting = 0
+        self.max_waiting = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def submit(self, fn, *args):
+        executor = self
+
+        class Consumed(Future):
+            def result(self, timeout=None):
+                executor.waiting -= 1
+                return super().result(timeout)
+
+        future = Consumed()
+        future.set_result(fn(*args))
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        return future
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executors = []
+
+    def create(max_workers):
+        executors.append(InlineExecutor(max_workers))
+        return executors[-1]
+
+    monkeypatch.setattr(sys.modules["src.client.client"], "ProcessPoolExecutor", create)
+    return executors
+
+
+@pytest.fixture
+def client(tmp_path):
+    return CcxtClient(
+        cache_dir=str(tmp_path / "cache"), exchange=ReplayExchange(rateLimit=0)
+    )
+
+
+def test_import_archives_reads_a_bounded_window_ahead(tmp_path, client, executor):
+    days = [f"2024-01-{day:02d}" for day in range(1, 11)]
+    for day in days:
+        write_archive(tmp_path / f"BTCUSDT-1h-{day}.zip", candles_of_day(day))
+    write_archive(tmp_path / "ETHUSDT-1h-2024-01-01.zip", candles_of_day(days[0]))
+
+    imported = client.import_archives("BTC/USDT", str(tmp_path), max_workers=2)
+    assert imported == {"1h": 24 * len(days)}
+    assert executor[0].max_waiting <= 2 * 2
+    assert executor[0].waiting == 0
+
+    stored = client.store.read(client.exchange_id, "BTC/USDT", "1h")
+    expected = pd.concat([candles_of_day(day) for day in days])
+    np.testing.assert_array_equal(
+        stored.index.as_unit("ms").asi8, expected.index.as_unit("ms").asi8
+    )
+    np.testing.assert_allclose(stored[expected.columns], expected)
+    start = day_ms(days[0])
+    assert client.store.covered_ranges(client.exchange_id, "BTC/USDT", "1h") == [
+        (start, start + len(days) * DAY_MS - 1)
+    ]
+
+
+def test_import_archives_writes_in_bounded_batches(
+    tmp_path, client, executor, monkeypatch
+):
+    days = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-05", "2024-01-06"]
+    for day in days:
+        write_archive(tmp_path / f"BTCUSDT-1h-{day}.zip", candles_of_day(day))
+
+    writes = []
+    write = client.store.write
+
+    def record(exchange, symbol, timeframe, data, covered):
+        writes.append(covered)
+        return write(exchange, symbol, timeframe, data, covered=covered)
+
+    monkeypatch.setattr(client.store, "write", record)
+    monkeypatch.setattr(sys.modules["src.client.client"], "IMPORT_BATCH", 48)
+
+    assert client.import_archives("BTC/USDT", str(tmp_path)) == {"1h": 24 * 5}
+    # Two days per batch, and a new one after the missing day
+    assert writes == [
+        (day_ms("2024-01-01"), day_ms("2024-01-03") - 1),
+        (day_ms("2024-01-03"), day_ms("2024-01-04") - 1),
+        (day_ms("2024-01-05"), day_ms("2024-01-07") - 1),
+    ]
+    assert client.store.covered_ranges(client.exchange_id, "BTC/USDT", "1h") == [
+        (day_ms("2024-01-01"), day_ms("2024-01-04") - 1),
+        (day_ms("2024-01-05"), day_ms("2024-01-07") - 1),
+    ]
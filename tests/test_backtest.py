@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.strategy.backtest import Execution, backtest
+
+PRICE = np.array(
+    [100.0, 101, 103, 102, 99, 98, 100, 104, 107, 105, 103, 106, 108, 104, 101, 102]
+)
+SIGNAL = np.array([0, 1, 0, 1, 0, -1, 0, 0, 1, 0, -1, -1, 0, 1, 0, -1])
+
+
+def reference_backtest(price, signal, execution):
+    """Trade the signals one bar at a time"""
+    fill_cost = 1.0 - execution.size * (execution.fee + execution.slippage)
+    position = np.zeros(len(signal), dtype=int)
+    profit = np.zeros(len(signal))
+    equity = np.ones(len(signal))
+    trades = []  # [entry, exit, direction, value]
+
+    held = 0
+    value = 1.0
+    for bar in range(len(signal)):
+        factor = 1.0
+        if bar > 0:
+            change = price[bar] / price[bar - 1] - 1
+            factor = max(1.0 + held * execution.size * change, 0.0)
+            if trades and trades[-1][1] == -1:
+                trades[-1][3] *= factor
+
+        current = held
+        if signal[bar] == 1:
+            current = 1
+        elif signal[bar] == -1:
+            current = -1 if execution.short else 0
+
+        if current != held:
+            factor *= fill_cost ** abs(current - held)
+            if held != 0:
+                trades[-1][1] = bar
+                trades[-1][3] *= fill_cost
+            if current != 0:
+                trades.append([bar, -1, current, fill_cost])
+
+        value *= factor
+        position[bar] = current
+        profit[bar] = factor - 1
+        equity[bar] = value
+        held = current
+    return position, profit, equity, trades
+
+
+@pytest.mark.parametrize(
+    "execution",
+    [
+        Execution(fee=0.0),
+        Execution(fee=0.001),
+        Execution(fee=0.002, slippage=0.0005, size=0.5),
+        Execution(fee=0.001, short=False),
+    ],
+    ids=["no-fee", "fee", "slippage-half-size", "long-only"],
+)
+def test_backtest_matches_per_bar_loop(execution):
+    position, profit, equity, trades = reference_backtest(PRICE, SIGNAL, execution)
+    result = backtest(PRICE, SIGNAL, execution)
+
+    np.testing.assert_array_equal(result.position, position)
+    np.testing.assert_allclose(result.profit, profit, rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(result.equity, equity, rtol=1e-12)
+
+    np.testing.assert_array_equal(result.trades.entry, [t[0] for t in trades])
+    np.testing.assert_array_equal(result.trades.exit, [t[1] for t in trades])
+    np.testing.assert_array_equal(result.trades.direction, [t[2] for t in trades])
+    np.testing.assert_allclose(
+        result.trades.profit, [t[3] - 1 for t in trades], rtol=1e-12, atol=1e-15
+    )
+
+
+def test_long_only_never_goes_short():
+    result = backtest(PRICE, SIGNAL, Execution(short=False))
+    assert (result.position >= 0).all()
+    assert (result.trades.direction == 1).all()
+
+
+def test_backtest_columns_match_single_signals():
+    signals = np.stack([SIGNAL, -SIGNAL, np.roll(SIGNAL, 3)], axis=1)
+    result = backtest(PRICE, signals)
+
+    for column in range(signals.shape[1]):
+        single = backtest(PRICE, signals[:, column])
+        np.testing.assert_array_equal(result.position[:, column], single.position)
+        np.testing.assert_allclose(result.equity[:, column], single.equity)
+        trades = result.trades.column == column
+        np.testing.assert_array_equal(result.trades.entry[trades], single.trades.entry)
+        np.testing.assert_allclose(result.trades.profit[trades], single.trades.profit)
@@ -0,0 +1,79 @@
+import subprocess
+import sys
+from importlib import import_module
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from src import command
+from src.cli import cli
+from src.command.optimize import optimize
+from src.command.optimize_ichimoku import optimize_ichimoku
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def imported_modules(*args: str) -> set:
+    """Run the CLI in a fresh interpreter and get every module it imports"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.cli", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_help_imports_no_command_dependencies():
+    modules = imported_modules("--help")
+    for package in ("ccxt", "pandas"):
+        assert not any(
+            module == package or module.startswith(f"{package}.") for module in modules
+        ), f"--help imported {package}"
+
+
+def test_help_lists_every_command():
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for name in command.COMMANDS:
+        assert name.replace("_", "-") in result.output
+
+
+@pytest.mark.parametrize("name", list(command.COMMANDS))
+def test_short_help_matches_command(name):
+    module, short_help = command.COMMANDS[name]
+    loaded = getattr(import_module(module, command.__name__), name)
+    assert loaded.help.split("\n\n")[0].strip() == short_help
+
+
+def test_command_help_imports_command():
+    result = CliRunner().invoke(cli, ["run", "--help"])
+    assert result.exit_code == 0
+    assert "--strategy" in result.output
+
+
+def test_optimize_ichimoku_shares_the_options_of_optimize():
+    assert [param.name for param in optimize_ichimoku.params] == [
+        param.name for param in optimize.params if param.name != "strategy"
+    ]
+
+
+def test_optimize_ichimoku_optimizes_ichimoku(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "src.command.optimize.optimize_strategy", lambda *args: calls.append(args)
+    )
+    args = ["--symbol", "BTC/USDT", "--timeframe", "1h,4h", "--search", "tpe"]
+    result = CliRunner().invoke(cli, ["optimize-ichimoku", *args])
+    assert result.exit_code == 0, result.output
+    expected = CliRunner().invoke(cli, ["optimize", "--strategy", "ichimoku", *args])
+    assert expected.exit_code == 0, expected.output
+
+    assert calls[0][0] == "ichimoku"
+    assert calls[0] == calls[1]
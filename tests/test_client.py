@@ -0,0 +1,144 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.client.ccxt import CcxtClient
+from src.client.replay import ReplayExchange
+from src.client.timeframe import floor_timestamp
+
+from conftest import make_ohlcv
+
+HOUR_MS = 60 * 60 * 1000
+START = 1704067200000  # 2024-01-01
+
+
+@pytest.fixture
+def client(tmp_path):
+    return CcxtClient(
+        cache_dir=str(tmp_path / "cache"), exchange=ReplayExchange(rateLimit=0)
+    )
+
+
+def cover(client, first, last):
+    """Mark hours [first, last] (in hours from START) as cached"""
+    data = make_ohlcv(last - first + 1)
+    data.index = pd.date_range(
+        pd.Timestamp(START + first * HOUR_MS, unit="ms"),
+        periods=len(data),
+        freq="1h",
+        name="timestamp",
+    )
+    client.store.write(
+        client.exchange_id,
+        "BTC/USDT",
+        "1h",
+        data,
+        covered=(START + first * HOUR_MS, START + (last + 1) * HOUR_MS - 1),
+    )
+
+
+def hours(first, last):
+    return (START + first * HOUR_MS, START + last * HOUR_MS)
+
+
+def test_missing_ranges_of_an_empty_cache(client):
+    assert client._get_missing_ranges("BTC/USDT", "1h", *hours(0, 10)) == [hours(0, 10)]
+    assert client._get_missing_ranges("BTC/USDT", "1h", None, None) == [(None, None)]
+
+
+def test_missing_ranges_are_the_head_gaps_and_tail(client):
+    cover(client, 10, 19)
+    cover(client, 30, 39)
+
+    missing = client._get_missing_ranges("BTC/USDT", "1h", *hours(0, 50))
+    assert missing == [
+        (START, START + 10 * HOUR_MS - 1),
+        (START + 20 * HOUR_MS, START + 30 * HOUR_MS - 1),
+        (START + 40 * HOUR_MS, START + 50 * HOUR_MS),
+    ]
+
+    # Nothing is missing within a covered run
+    assert client._get_missing_ranges("BTC/USDT", "1h", *hours(11, 18)) == []
+
+
+def test_gaps_without_a_candle_open_time_are_not_missing(client):
+    cover(client, 0, 9)
+    # Covered up to a millisecond before the next candle opens
+    assert client._get_missing_ranges("BTC/USDT", "1h", *hours(0, 9)) == []
+    assert (
+        client._get_missing_ranges("BTC/USDT", "1h", START, START + 10 * HOUR_MS - 1)
+        == []
+    )
+
+
+def test_without_a_start_only_the_tail_of_the_latest_run_is_missing(client):
+    cover(client, 0, 9)
+    cover(client, 20, 29)
+    now = int(time.time() * 1000)
+
+    missing = client._get_missing_ranges("BTC/USDT", "1h", None, None)
+    assert len(missing) == 1
+    first, last = missing[0]
+    assert first == START + 30 * HOUR_MS
+    assert now <= last <= int(time.time() * 1000)
+
+
+def test_the_forming_candle_stays_missing(client):
+    now = int(time.time() * 1000)
+    forming = floor_timestamp(now, "1h")
+    data = make_ohlcv(5)
+    data.index = pd.date_range(
+        end=pd.Timestamp(forming, unit="ms"), periods=5, freq="1h", name="timestamp"
+    )
+    first = forming - 4 * HOUR_MS
+    client._save_to_cache("BTC/USDT", "1h", data, first, None)
+
+    assert client.store.covered_ranges(client.exchange_id, "BTC/USDT", "1h") == [
+        (first, forming - 1)
+    ]
+    missing = client._get_missing_ranges("BTC/USDT", "1h", first, None)
+    assert len(missing) == 1 and missing[0][0] == forming
+
+
+class OverfullExchange(ReplayExchange):
+    """Returns full pages whatever limit is asked for, past window ends"""
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None, params=None):
+        return super().fetch_ohlcv(symbol, timeframe, since, None, params)
+
+
+@pytest.mark.parametrize(
+    "exchange, limit",
+    [
+        (ReplayExchange(rateLimit=0, page_limit=7), 50),
+        (ReplayExchange(rateLimit=0, page_limit=1000), 24),
+        (OverfullExchange(rateLimit=0, page_limit=30), 24),
+    ],
+    ids=["short-pages", "one-page-per-window", "pages-past-window-end"],
+)
+def test_window_pagination_has_no_duplicates(tmp_path, exchange, limit):
+    client = CcxtClient(
+        cache_dir=str(tmp_path / "cache"), exchange=exchange, limit=limit
+    )
+    start = pd.Timestamp(START, unit="ms")
+    end = start + pd.Timedelta(hours=239)
+
+    data = client.fetch_once("BTC/USDT", "1h", start, end)
+
+    timestamps = data["timestamp"].to_numpy()
+    np.testing.assert_array_equal(timestamps, START + np.arange(240) * HOUR_MS)
+    reference = ReplayExchange(rateLimit=0, page_limit=1000).fetch_ohlcv(
+        "BTC/USDT", "1h", START, 240
+    )
+    np.testing.assert_allclose(data.to_numpy(), np.array(reference))
+
+
+def test_latest_candles_without_a_start(client):
+    end = floor_timestamp(int(time.time() * 1000), "1h") - 5 * HOUR_MS
+    data = client.fetch_once("BTC/USDT", "1h", None, pd.Timestamp(end, unit="ms"))
+
+    timestamps = data["timestamp"].to_numpy()
+    assert timestamps[-1] == end
+    assert (np.diff(timestamps) == HOUR_MS).all()
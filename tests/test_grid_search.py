@@ -0,0 +1,106 @@
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.strategy.grid_search import TASKS_PER_WORKER, TopResults, dispatch_chunks
+
+
+def results(*values):
+    return [({"id": i}, {"total_profit": value}) for i, value in enumerate(values)]
+
+
+def ids(best):
+    return [params["id"] for params, _ in best]
+
+
+def test_top_results_keep_the_best_first():
+    top = TopResults(3)
+    for params, metrics in results(0.1, 0.5, -0.2, 0.3, 0.4, 0.0):
+        top.add(params, metrics)
+    assert ids(top.best()) == [1, 4, 3]
+    assert top.seen == 6
+
+
+def test_top_results_rank_ties_in_the_order_seen():
+    top = TopResults(3)
+    for params, metrics in results(0.2, 0.5, 0.2, 0.5, 0.2):
+        top.add(params, metrics)
+    assert ids(top.best()) == [1, 3, 0]
+
+
+def test_top_results_skip_nans():
+    top = TopResults(2, metric="sharpe_ratio")
+    for i, value in enumerate([float("nan"), 1.0, float("nan"), -1.0]):
+        top.add({"id": i}, {"sharpe_ratio": value})
+    assert ids(top.best()) == [1, 3]
+    assert top.seen == 4
+
+
+def test_top_results_of_count_zero_keep_nothing():
+    top = TopResults(0)
+    for params, metrics in results(0.1, 0.2):
+        top.add(params, metrics)
+    assert top.best() == []
+    assert top.seen == 2
+
+
+def evaluate(chunk, offset):
+    # Finish out of order
+    time.sleep(random.random() / 1000)
+    return [params["id"] + offset for params in chunk]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Count the tasks submitted"""
+
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_dispatch_chunks_yields_results_in_grid_order(workers):
+    grid = ({"id": i} for i in range(500))
+    with ThreadPoolExecutor(workers) as executor:
+        evaluated = [
+            (params["id"], result)
+            for chunk, chunk_results in dispatch_chunks(
+                executor, evaluate, grid, workers, 1000
+            )
+            for params, result in zip(chunk, chunk_results)
+        ]
+    assert evaluated == [(i, i + 1000) for i in range(500)]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_dispatch_chunks_bounds_the_pending_tasks(monkeypatch, workers):
+    grid_module = sys.modules["src.strategy.grid_search"]
+    monkeypatch.setattr(grid_module, "FIRST_CHUNK", 2)
+    monkeypatch.setattr(grid_module, "MAX_CHUNK", 2)
+    read = []
+    in_flight = []
+
+    def grid():
+        for i in range(100):
+            read.append(i)
+            yield {"id": i}
+
+    with CountingExecutor(workers) as executor:
+        chunks = dispatch_chunks(executor, evaluate, grid(), workers, 0)
+        for done, (chunk, _) in enumerate(chunks, start=1):
+            # Submitted and not yet yielded, counting this chunk
+            in_flight.append(executor.submitted - done + 1)
+            # The grid is read no further than the pending chunks
+            assert len(read) <= 2 * (executor.submitted + 1)
+    assert executor.submitted == 50
+    assert max(in_flight) == TASKS_PER_WORKER * workers
+
+
+def test_dispatch_chunks_of_an_empty_grid():
+    with ThreadPoolExecutor(1) as executor:
+        assert list(dispatch_chunks(executor, evaluate, [], 1, 0)) == []
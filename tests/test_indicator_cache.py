@@ -0,0 +1,121 @@
+import gc
+
+import numpy as np
+import pytest
+
+from src.indicator.cache import IndicatorCache, fingerprint
+from src.strategy.ma_cross import MaCross
+from src.strategy.strategy import Strategy
+
+from conftest import make_ohlcv
+
+
+class Counter:
+    """Compute a rolling mean of the close, counting the calls"""
+
+    def __init__(self, data, window=5):
+        self.data = data
+        self.window = window
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.data["close"].rolling(self.window).mean().to_numpy()
+
+
+def test_second_lookup_is_a_hit(ohlcv):
+    cache = IndicatorCache()
+    compute = Counter(ohlcv)
+
+    first = cache.get(ohlcv, "sma", (5,), compute)
+    second = cache.get(ohlcv, "sma", (5,), compute)
+    assert compute.calls == 1
+    assert second is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["bytes"] == first.nbytes
+
+
+def test_cached_series_are_read_only(ohlcv):
+    values = IndicatorCache().get(ohlcv, "sma", (5,), Counter(ohlcv))
+    with pytest.raises(ValueError):
+        values[0] = 1.0
+
+
+def test_name_and_params_are_part_of_the_key(ohlcv):
+    cache = IndicatorCache()
+    compute = Counter(ohlcv)
+    cache.get(ohlcv, "sma", (5,), compute)
+    cache.get(ohlcv, "sma", (6,), compute)
+    cache.get(ohlcv, "ema", (5,), compute)
+    assert compute.calls == 3
+    assert cache.stats()["misses"] == 3
+
+
+def test_equal_data_hits_and_changed_data_misses(ohlcv):
+    cache = IndicatorCache()
+    compute = Counter(ohlcv)
+    cache.get(ohlcv, "sma", (5,), compute)
+
+    cache.get(ohlcv.copy(), "sma", (5,), compute)
+    assert compute.calls == 1
+
+    changed = ohlcv.copy()
+    changed.iloc[100, changed.columns.get_loc("close")] += 1.0
+    cache.get(changed, "sma", (5,), Counter(changed))
+    shifted = ohlcv.copy()
+    shifted.index = shifted.index + (shifted.index[1] - shifted.index[0])
+    cache.get(shifted, "sma", (5,), Counter(shifted))
+    assert cache.stats()["misses"] == 3
+
+
+def test_fingerprint_ignores_how_the_candles_were_loaded(ohlcv):
+    loaded = ohlcv.copy()
+    loaded.index = loaded.index.as_unit("ns")
+    loaded["volume"] = loaded["volume"].round().astype("int64")
+    rounded = ohlcv.copy()
+    rounded["volume"] = rounded["volume"].round()
+    assert fingerprint(loaded) == fingerprint(rounded)
+    assert fingerprint(ohlcv) != fingerprint(ohlcv.iloc[:-1])
+
+
+def test_fingerprints_are_forgotten_with_their_frame():
+    cache = IndicatorCache()
+    data = make_ohlcv(100)
+    cache.fingerprint(data)
+    assert len(cache._fingerprints) == 1
+
+    del data
+    gc.collect()
+    assert cache._fingerprints == {}
+
+
+def test_least_recently_used_series_are_evicted(ohlcv):
+    size = len(ohlcv) * 8
+    cache = IndicatorCache(max_bytes=2 * size)
+    for window in (5, 6, 7):
+        cache.get(ohlcv, "sma", (window,), Counter(ohlcv, window))
+    assert cache.stats()["evictions"] == 1
+
+    compute = Counter(ohlcv, 5)
+    cache.get(ohlcv, "sma", (5,), compute)
+    cache.get(ohlcv, "sma", (7,), compute)
+    assert compute.calls == 1
+
+
+def test_strategies_share_indicators(ohlcv, monkeypatch):
+    monkeypatch.setattr(Strategy, "indicator_cache", IndicatorCache())
+    first = MaCross(ohlcv, "BTC/USDT", "1h", fast_period=10, slow_period=20)
+    first.generate_signals()
+    misses = Strategy.indicator_cache.stats()["misses"]
+    assert misses > 0
+
+    second = MaCross(ohlcv, "BTC/USDT", "1h", fast_period=10, slow_period=30)
+    np.testing.assert_array_equal(
+        second.generate_signals().signal,
+        MaCross(ohlcv.copy(), "BTC/USDT", "1h", fast_period=10, slow_period=30)
+        .generate_signals()
+        .signal,
+    )
+    # Only the slow average is new to the cache
+    assert Strategy.indicator_cache.stats()["misses"] == misses + 1
@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator
+from ta.trend import MACD, EMAIndicator, IchimokuIndicator, SMAIndicator
+
+from src.indicator import kernels
+from src.strategy.bollinger_bands import BollingerBands
+from src.strategy.ichimoku import Ichimoku
+from src.strategy.ma_cross import MaCross
+from src.strategy.macd import Macd
+from src.strategy.rsi import Rsi
+
+WINDOWS = [1, 2, 5, 14, 52, 200]
+
+
+def assert_series_equal(actual: np.ndarray, expected: pd.Series):
+    np.testing.assert_allclose(
+        actual, expected.to_numpy(dtype="float64"), rtol=1e-9, atol=1e-9
+    )
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("min_periods", [None, 0, 1])
+def test_rolling_extremes_match_pandas(ohlcv, window, min_periods):
+    high, low = ohlcv["high"], ohlcv["low"]
+    rolling = {"window": window, "min_periods": min_periods}
+    assert_series_equal(
+        kernels.rolling_max(high, window, min_periods), high.rolling(**rolling).max()
+    )
+    assert_series_equal(
+        kernels.rolling_min(low, window, min_periods), low.rolling(**rolling).min()
+    )
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_rolling_mean_and_std_match_pandas(ohlcv, window):
+    close = ohlcv["close"]
+    assert_series_equal(
+        kernels.rolling_mean(close, window), close.rolling(window).mean()
+    )
+    assert_series_equal(kernels.rolling_std(close, window), close.rolling(window).std())
+    assert_series_equal(
+        kernels.rolling_std(close, window, ddof=0), close.rolling(window).std(ddof=0)
+    )
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("min_periods", [None, 1, 3])
+def test_rolling_sums_skip_nans_as_pandas(ohlcv, window, min_periods):
+    if min_periods is not None:
+        min_periods = min(min_periods, window)
+    close = ohlcv["close"].copy()
+    close.iloc[[3, 4, 250, 900]] = np.nan
+    close.iloc[400:460] = np.nan
+    rolling = close.rolling(window, min_periods=min_periods)
+    assert_series_equal(kernels.rolling_sum(close, window, min_periods), rolling.sum())
+    assert_series_equal(
+        kernels.rolling_mean(close, window, min_periods), rolling.mean()
+    )
+    assert_series_equal(kernels.rolling_std(close, window, min_periods), rolling.std())
+
+
+def test_rolling_sum_keeps_windows_after_a_nan():
+    values = pd.Series([1.0, 2, 3, np.nan, 4, 5, 6, 7, 8, 9, 10])
+    result = kernels.rolling_sum(values, 5)
+    assert_series_equal(result, values.rolling(5).sum())
+    assert result[8] == 30
+
+
+@pytest.mark.parametrize("window", [2, 12, 26, 50])
+def test_ema_matches_ta(ohlcv, window):
+    close = ohlcv["close"]
+    assert_series_equal(
+        kernels.ema_span(close, window, window),
+        EMAIndicator(close=close, window=window).ema_indicator(),
+    )
+    assert_series_equal(
+        kernels.ema(close, 0.3), close.ewm(alpha=0.3, adjust=False).mean()
+    )
+
+
+def test_ema_starts_after_leading_nans(ohlcv):
+    close = ohlcv["close"].copy()
+    close.iloc[:10] = np.nan
+    assert_series_equal(
+        kernels.ema_span(close, 9), close.ewm(span=9, adjust=False).mean()
+    )
+
+
+@pytest.mark.parametrize("window", [2, 14, 30])
+def test_wilder_matches_pandas(ohlcv, window):
+    change = ohlcv["close"].diff().clip(lower=0)
+    assert_series_equal(
+        kernels.wilder(change, window, window),
+        change.ewm(alpha=1 / window, min_periods=window, adjust=False).mean(),
+    )
+
+
+@pytest.mark.parametrize("window", [2, 7, 14, 28])
+def test_relative_strength_index_matches_ta(ohlcv, window):
+    close = ohlcv["close"]
+    assert_series_equal(
+        kernels.relative_strength_index(close, window),
+        RSIIndicator(close=close, window=window).rsi(),
+    )
+
+
+# Signals of the strategies as they were computed with `ta` and pandas
+
+
+def reference_bollinger_bands(data, period, num_std):
+    mean = data["close"].rolling(window=period).mean()
+    std = data["close"].rolling(window=period).std()
+    signal = pd.Series(0, index=data.index)
+    signal[data["close"] < mean - std * num_std] = 1
+    signal[data["close"] > mean + std * num_std] = -1
+    return signal
+
+
+def reference_ichimoku(
+    data, tenkan_period, kijun_period, senkou_span_b_period, displacement
+):
+    ichimoku = IchimokuIndicator(
+        high=data["high"],
+        low=data["low"],
+        window1=tenkan_period,
+        window2=kijun_period,
+        window3=senkou_span_b_period,
+    )
+    tenkan_sen = ichimoku.ichimoku_conversion_line()
+    kijun_sen = ichimoku.ichimoku_base_line()
+    senkou_span_a = ichimoku.ichimoku_a()
+    senkou_span_b = ichimoku.ichimoku_b()
+    chikou_span = data["close"].shift(-displacement)
+    close = data["close"]
+
+    signal = pd.Series(0, index=data.index)
+    signal[
+        (close > senkou_span_a)
+        & (close > senkou_span_b)
+        & (tenkan_sen > kijun_sen)
+        & (chikou_span > close)
+    ] = 1
+    signal[
+        (close < senkou_span_a)
+        & (close < senkou_span_b)
+        & (tenkan_sen < kijun_sen)
+        & (chikou_span < close)
+    ] = -1
+    return signal
+
+
+def reference_ma_cross(data, fast_period, slow_period):
+    fast = SMAIndicator(close=data["close"], window=fast_period).sma_indicator()
+    slow = SMAIndicator(close=data["close"], window=slow_period).sma_indicator()
+    signal = pd.Series(0, index=data.index)
+    signal[fast > slow] = 1
+    signal[fast < slow] = -1
+    return signal
+
+
+def reference_macd(data, fast_period, slow_period, signal_period):
+    indicator = MACD(
+        close=data["close"],
+        window_slow=slow_period,
+        window_fast=fast_period,
+        window_sign=signal_period,
+    )
+    line, trigger = indicator.macd(), indicator.macd_signal()
+    signal = pd.Series(0, index=data.index)
+    signal[(line > trigger) & (line.shift(1) <= trigger.shift(1))] = 1
+    signal[(line < trigger) & (line.shift(1) >= trigger.shift(1))] = -1
+    return signal
+
+
+def reference_rsi(data, period, overbought, oversold):
+    rsi = RSIIndicator(close=data["close"], window=period).rsi()
+    signal = pd.Series(0, index=data.index)
+    signal[rsi < oversold] = 1
+    signal[rsi > overbought] = -1
+    return signal
+
+
+CASES = [
+    (BollingerBands, reference_bollinger_bands, {"period": 20, "num_std": 2.0}),
+    (BollingerBands, reference_bollinger_bands, {"period": 10, "num_std": 1.5}),
+    (
+        Ichimoku,
+        reference_ichimoku,
+        {
+            "tenkan_period": 9,
+            "kijun_period": 26,
+            "senkou_span_b_period": 52,
+            "displacement": 26,
+        },
+    ),
+    (
+        Ichimoku,
+        reference_ichimoku,
+        {
+            "tenkan_period": 5,
+            "kijun_period": 20,
+            "senkou_span_b_period": 42,
+            "displacement": 30,
+        },
+    ),
+    (MaCross, reference_ma_cross, {"fast_period": 10, "slow_period": 20}),
+    (MaCross, reference_ma_cross, {"fast_period": 3, "slow_period": 50}),
+    (Macd, reference_macd, {"fast_period": 12, "slow_period": 26, "signal_period": 9}),
+    (Macd, reference_macd, {"fast_period": 5, "slow_period": 35, "signal_period": 5}),
+    (Rsi, reference_rsi, {"period": 14, "overbought": 70, "oversold": 30}),
+    (Rsi, reference_rsi, {"period": 7, "overbought": 80, "oversold": 20}),
+]
+
+
+@pytest.mark.parametrize(
+    "strategy, reference, params",
+    CASES,
+    ids=[f"{case[0].__name__}-{i}" for i, case in enumerate(CASES)],
+)
+def test_strategy_signals_match_ta(ohlcv, strategy, reference, params):
+    signals = strategy(data=ohlcv, symbol="BTC/USDT", timeframe="1h", **params)
+    expected = reference(ohlcv, **params)
+    assert (expected != 0).any()
+    np.testing.assert_array_equal(signals.generate_signals().signal, expected)
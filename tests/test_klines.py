@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.client.klines import COLUMNS, KlineBuffer
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def page(first: int, count: int):
+    """Kline rows as ccxt returns them"""
+    return [
+        [first + i * HOUR_MS, 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, 10.0 * i]
+        for i in range(count)
+    ]
+
+
+def test_extend_grows_in_chunks():
+    buffer = KlineBuffer()
+    buffer.CHUNK = 8
+    buffer.extend(page(0, 5))
+    buffer.extend(page(5 * HOUR_MS, 6))
+
+    assert len(buffer) == 11
+    assert len(buffer.timestamps) == 16
+    np.testing.assert_array_equal(buffer.timestamps[:11], np.arange(11) * HOUR_MS)
+    np.testing.assert_array_equal(
+        buffer.values[:11], np.array(page(0, 5) + page(0, 6))[:, 1:]
+    )
+
+
+def test_write_keeps_at_most_the_capacity():
+    buffer = KlineBuffer(capacity=10)
+    assert buffer.write(2, page(0, 5), 3) == 3
+    assert buffer.write(0, [], 3) == 0
+    assert buffer.write(0, page(0, 5), 0) == 0
+    np.testing.assert_array_equal(buffer.timestamps[2:5], np.arange(3) * HOUR_MS)
+
+
+def test_compact_moves_regions_next_to_each_other():
+    buffer = KlineBuffer(capacity=30)
+    # Three windows of 10, partly filled as pages came back
+    written = []
+    for offset, (first, count) in zip([0, 10, 20], [(0, 4), (4, 10), (14, 3)]):
+        buffer.write(offset, page(first * HOUR_MS, count), 10)
+        written.append((offset, count))
+    buffer.compact(written)
+
+    assert len(buffer) == 17
+    np.testing.assert_array_equal(buffer.timestamps[:17], np.arange(17) * HOUR_MS)
+    opens = [1.0 + i for i in [*range(4), *range(10), *range(3)]]
+    np.testing.assert_array_equal(buffer.values[:17, 0], opens)
+
+
+def test_to_frame_keeps_the_dtype():
+    buffer = KlineBuffer(capacity=4, dtype="float32")
+    buffer.extend(page(0, 3))
+    frame = buffer.to_frame()
+
+    assert list(frame.columns) == ["timestamp"] + COLUMNS
+    assert len(frame) == 3
+    assert frame["close"].dtype == np.float32
+    np.testing.assert_array_equal(frame["timestamp"], np.arange(3) * HOUR_MS)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.strategy.backtest import Trades
+from src.strategy.metrics import performance_metrics
+
+
+def trades(column, profit):
+    count = len(profit)
+    return Trades(
+        column=np.asarray(column, dtype=np.int64),
+        entry=np.zeros(count, dtype=np.int64),
+        exit=np.zeros(count, dtype=np.int64),
+        direction=np.ones(count, dtype=np.int64),
+        profit=np.asarray(profit, dtype=np.float64),
+    )
+
+
+def metrics_of(position, profit, ledger, periods_per_year=1.0):
+    profit = np.asarray(profit, dtype=np.float64)
+    return performance_metrics(
+        np.asarray(position),
+        profit,
+        np.cumprod(1 + profit, axis=0),
+        ledger,
+        periods_per_year,
+    )
+
+
+POSITION = [1, 1, 0, -1]
+PROFIT = [0.1, -0.05, 0.0, 0.02]
+LEDGER = trades([0, 0], [0.045, -0.02])
+
+
+def test_metrics_match_hand_computed_values():
+    metrics = metrics_of(POSITION, PROFIT, LEDGER)
+
+    assert metrics["total_trades"] == 2
+    assert metrics["profitable_trades"] == 1
+    assert metrics["win_rate"] == 0.5
+    # 1.1 * 0.95 * 1.0 * 1.02
+    assert metrics["total_profit"] == pytest.approx(0.0659)
+    # From 1.1 down to 1.045
+    assert metrics["max_drawdown"] == pytest.approx(0.05)
+    # Mean 0.0175, squared deviations 0.011675 over 3 degrees of freedom
+    assert metrics["sharpe_ratio"] == pytest.approx(0.0175 / np.sqrt(0.011675 / 3))
+    # Downside deviation sqrt(0.05 ** 2 / 4)
+    assert metrics["sortino_ratio"] == pytest.approx(0.0175 / 0.025)
+    assert metrics["exposure"] == 0.75
+    assert metrics["profit_factor"] == pytest.approx(0.045 / 0.02)
+    assert metrics["count_signals"] == 4
+
+
+def test_ratios_are_annualized():
+    metrics = metrics_of(POSITION, PROFIT, LEDGER)
+    yearly = metrics_of(POSITION, PROFIT, LEDGER, periods_per_year=365)
+    for name in ("sharpe_ratio", "sortino_ratio"):
+        assert yearly[name] == pytest.approx(metrics[name] * np.sqrt(365))
+    assert yearly["total_profit"] == metrics["total_profit"]
+
+
+def test_metrics_without_trades_or_risk():
+    metrics = metrics_of([0, 0, 0], [0.0, 0.0, 0.0], trades([], []))
+    assert metrics["total_trades"] == 0
+    assert metrics["win_rate"] == 0.0
+    assert metrics["profit_factor"] == 0.0
+    assert metrics["sharpe_ratio"] == 0.0
+    assert metrics["sortino_ratio"] == 0.0
+    assert metrics["max_drawdown"] == 0.0
+    assert metrics["exposure"] == 0.0
+
+
+def test_profit_factor_without_losses_is_infinite():
+    metrics = metrics_of([1, 1], [0.01, 0.02], trades([0], [0.0302]))
+    assert metrics["profit_factor"] == np.inf
+    assert metrics["sortino_ratio"] == 0.0
+    assert metrics["win_rate"] == 1.0
+
+
+def test_losing_the_whole_equity_is_a_full_drawdown():
+    metrics = metrics_of([1, 1, 1], [0.5, -1.0, 0.0], trades([0], [-1.0]))
+    assert metrics["max_drawdown"] == 1.0
+    assert metrics["total_profit"] == -1.0
+
+
+def test_columns_match_single_backtests():
+    profit = np.array([PROFIT, [0.0, 0.01, -0.02, 0.03]]).T
+    position = np.array([POSITION, [0, 1, 1, 1]]).T
+    ledger = trades([0, 0, 1], [0.045, -0.02, 0.0194])
+
+    metrics = metrics_of(position, profit, ledger)
+    first = metrics_of(POSITION, PROFIT, LEDGER)
+    second = metrics_of(position[:, 1], profit[:, 1], trades([0], [0.0194]))
+    for name, values in metrics.items():
+        assert values.shape == (2,)
+        assert values[0] == pytest.approx(first[name])
+        assert values[1] == pytest.approx(second[name])
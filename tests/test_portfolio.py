@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategy.backtest import Execution
+from src.strategy.factory import StrategyFactory
+from src.strategy.portfolio import (
+    backtest_portfolio,
+    portfolio_metrics,
+    portfolio_returns,
+    price_matrix,
+)
+from src.strategy.strategy import batch_metrics
+
+from conftest import make_ohlcv
+
+OPTIONS = {"ma_cross_fast_period": 5, "ma_cross_slow_period": 30}
+EXECUTION = Execution(fee=0.002, slippage=0.0005)
+
+
+@pytest.fixture
+def datasets():
+    """Symbols listed at different times, one with missing candles"""
+    btc = make_ohlcv(600, seed=1)
+    eth = make_ohlcv(400, seed=2)
+    eth.index = btc.index[150:550]
+    sol = make_ohlcv(500, seed=3)
+    sol.index = btc.index[100:]
+    sol = sol.drop(sol.index[200:210])
+    return {"BTC/USDT": btc, "ETH/USDT": eth, "SOL/USDT": sol}
+
+
+def test_price_matrix_aligns_symbols_on_the_union_of_bars(datasets):
+    index, symbols, matrix = price_matrix(
+        {**datasets, "NEW/USDT": make_ohlcv(10).iloc[:0]}
+    )
+    assert symbols == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    assert index.equals(pd.DatetimeIndex(datasets["BTC/USDT"].index.to_numpy()))
+    assert matrix.shape == (3, 5, 600)
+
+    for column, symbol in enumerate(symbols):
+        data = datasets[symbol]
+        rows = index.get_indexer(data.index)
+        np.testing.assert_array_equal(matrix[column][:, rows].T, data.to_numpy())
+        assert np.isnan(np.delete(matrix[column], rows, axis=1)).all()
+
+
+def test_portfolio_aggregates_per_symbol_backtests(datasets):
+    portfolio = backtest_portfolio(
+        datasets, "ma-cross", "1h", OPTIONS, EXECUTION, max_workers=2
+    )
+    assert portfolio.symbols == list(datasets)
+    assert portfolio.profit.shape == (600, 3)
+
+    for column, (symbol, data) in enumerate(datasets.items()):
+        strategy = StrategyFactory.build(
+            strategy="ma-cross", data=data, symbol=symbol, timeframe="1h", **OPTIONS
+        )
+        strategy.execution = EXECUTION
+        batch = strategy.generate_signals_batch([strategy.parameters])
+
+        rows = portfolio.index.get_indexer(data.index)
+        np.testing.assert_allclose(portfolio.profit[rows, column], batch.profit[:, 0])
+        assert np.isnan(np.delete(portfolio.profit[:, column], rows)).all()
+        assert portfolio.metrics[symbol] == pytest.approx(
+            batch_metrics(batch, strategy.periods_per_year)[0]
+        )
+
+    # Equal weights over the symbols trading on every bar
+    expected = pd.DataFrame(portfolio.profit).mean(axis=1).fillna(0.0)
+    np.testing.assert_allclose(portfolio.returns, expected)
+
+
+def test_portfolio_returns_weight_the_symbols_trading_equally():
+    profit = np.array(
+        [
+            [np.nan, np.nan],
+            [0.02, np.nan],
+            [0.02, -0.01],
+            [np.nan, 0.04],
+        ]
+    )
+    np.testing.assert_allclose(portfolio_returns(profit), [0.0, 0.02, 0.005, 0.04])
+
+
+def test_portfolio_metrics(datasets):
+    portfolio = backtest_portfolio(
+        datasets, "ma-cross", "1h", OPTIONS, EXECUTION, max_workers=1
+    )
+    metrics = portfolio_metrics(portfolio, periods_per_year=24 * 365)
+
+    equity = np.cumprod(1 + portfolio.returns)
+    assert metrics["total_profit"] == pytest.approx(equity[-1] - 1)
+    assert metrics["max_drawdown"] == pytest.approx(
+        1 - (equity / np.maximum.accumulate(equity)).min()
+    )
+    correlation = pd.DataFrame(np.nan_to_num(portfolio.profit)).corr().to_numpy()
+    assert metrics["mean_correlation"] == pytest.approx(
+        correlation[np.triu_indices(3, k=1)].mean()
+    )
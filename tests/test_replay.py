@@ -0,0 +1,101 @@
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.client.ccxt import CcxtClient
+from src.client.replay import ReplayExchange
+from src.client.resample import resample_ohlcv
+from src.client.timeframe import floor_timestamp, from_milliseconds, to_milliseconds
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def replay_client(tmp_path, exchange: ReplayExchange, **kwargs) -> CcxtClient:
+    """Client of a replay exchange that retries without waiting"""
+    client = CcxtClient(cache_dir=str(tmp_path / "cache"), exchange=exchange, **kwargs)
+    client.scheduler.retry_delay = 0.0
+    return client
+
+
+def candles(exchange: ReplayExchange, timeframe: str, since: int, count: int):
+    rows = exchange.fetch_ohlcv("BTC/USDT", timeframe, since, count)
+    frame = pd.DataFrame(
+        rows, columns=["timestamp", "open", "high", "low", "close", "volume"]
+    )
+    return frame.set_index(pd.to_datetime(frame.pop("timestamp"), unit="ms"))
+
+
+@pytest.mark.parametrize("base, timeframe", [("1m", "1h"), ("1h", "4h"), ("4h", "1d")])
+def test_coarse_synthetic_candles_equal_resampled_fine_ones(base, timeframe):
+    exchange = ReplayExchange(rateLimit=0, now=datetime(2024, 6, 1), page_limit=5000)
+    since = to_milliseconds(datetime(2024, 1, 3))
+    coarse = candles(exchange, timeframe, since, 20)
+    fine = candles(exchange, base, since, 5000)
+    resampled = resample_ohlcv(fine, timeframe).iloc[: len(coarse)]
+
+    np.testing.assert_array_equal(coarse.index, resampled.index)
+    np.testing.assert_allclose(coarse.to_numpy(), resampled.to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("page_limit, limit", [(7, 1000), (1000, 10), (13, 40)])
+def test_pagination_has_no_duplicates_at_page_boundaries(tmp_path, page_limit, limit):
+    exchange = ReplayExchange(
+        rateLimit=0, now=datetime(2024, 6, 1), page_limit=page_limit
+    )
+    client = replay_client(tmp_path, exchange, limit=limit, max_workers=4)
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 9, 23)
+
+    data = client.fetch_retry("BTC/USDT", "1h", start, end, use_cache=False)
+
+    expected = pd.date_range(start, end, freq="1h")
+    np.testing.assert_array_equal(data.index, expected)
+    assert data.index.is_unique
+    reference = candles(
+        ReplayExchange(rateLimit=0, now=datetime(2024, 6, 1), page_limit=10_000),
+        "1h",
+        to_milliseconds(start),
+        len(expected),
+    )
+    np.testing.assert_allclose(data.to_numpy(), reference.to_numpy())
+
+
+def test_requests_are_retried_after_injected_errors(tmp_path):
+    exchange = ReplayExchange(
+        rateLimit=0, now=datetime(2024, 6, 1), page_limit=24, error_rate=0.3, seed=3
+    )
+    client = replay_client(tmp_path, exchange, max_workers=1)
+    client.scheduler.max_retries = 20
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 31, 23)
+
+    data = client.fetch_retry("BTC/USDT", "1h", start, end, use_cache=False)
+
+    np.testing.assert_array_equal(data.index, pd.date_range(start, end, freq="1h"))
+    assert exchange.errors > 0
+    assert client.scheduler.retries == exchange.errors
+    # Only the failed requests were sent again, not the whole range
+    assert exchange.requests == client.scheduler.requests + exchange.errors
+
+
+def test_cache_is_topped_up_with_the_new_candles_only(tmp_path):
+    exchange = ReplayExchange(rateLimit=0, page_limit=1000)
+    client = replay_client(tmp_path, exchange)
+    now = int(time.time() * 1000)
+    start = from_milliseconds(floor_timestamp(now, "1h") - 72 * HOUR_MS)
+
+    first = client.fetch_retry(
+        "BTC/USDT", "1h", start, from_milliseconds(now - 24 * HOUR_MS)
+    )
+    requests = exchange.requests
+    topped_up = client.fetch_retry("BTC/USDT", "1h", start)
+
+    # One request for the tail, none for the cached candles
+    assert exchange.requests - requests == 1
+    assert topped_up.index.is_unique and topped_up.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(topped_up.iloc[: len(first)], first)
+    assert topped_up.index[-1] == pd.Timestamp(floor_timestamp(now, "1h"), unit="ms")
+
+    fresh = client.fetch_retry("BTC/USDT", "1h", start, use_cache=False)
+    np.testing.assert_allclose(topped_up.to_numpy(), fresh.to_numpy())
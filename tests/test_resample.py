@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.client.ccxt import CcxtClient
+from src.client.replay import ReplayExchange
+from src.client.resample import can_resample, resample_ohlcv
+
+from conftest import make_ohlcv
+
+AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+@pytest.mark.parametrize(
+    "base, timeframe, rule",
+    [
+        ("1m", "5m", "5min"),
+        ("1m", "1h", "1h"),
+        ("1h", "4h", "4h"),
+        ("1h", "1d", "1D"),
+        ("1h", "1w", "W-MON"),
+    ],
+)
+def test_resample_matches_pandas(base, timeframe, rule):
+    freq = {"1m": "1min", "1h": "1h"}[base]
+    data = make_ohlcv(5000, freq=freq)
+    # Gaps leave some buckets partial or empty
+    data = data.drop(data.index[[7, 8, 9, 1000, 2500]]).drop(data.index[3000:3400])
+
+    expected = (
+        data.resample(rule, label="left", closed="left")
+        .agg(AGGREGATIONS)
+        .dropna(subset=["open"])
+    )
+    actual = resample_ohlcv(data, timeframe)
+
+    np.testing.assert_array_equal(
+        actual.index.as_unit("ms").asi8, expected.index.as_unit("ms").asi8
+    )
+    np.testing.assert_allclose(actual[list(AGGREGATIONS)], expected, rtol=1e-12)
+
+
+def test_resample_empty():
+    assert resample_ohlcv(make_ohlcv(10).iloc[:0], "4h").empty
+
+
+@pytest.mark.parametrize(
+    "base, timeframe, possible",
+    [
+        ("1m", "1h", True),
+        ("1h", "4h", True),
+        ("4h", "1d", True),
+        ("1d", "1w", True),
+        ("2d", "1w", False),  # weeks open on Mondays
+        ("1h", "1h", False),
+        ("4h", "1h", False),
+        ("3h", "4h", False),
+        ("1d", "1M", False),
+        ("1w", "2w", False),
+    ],
+)
+def test_can_resample(base, timeframe, possible):
+    assert can_resample(base, timeframe) is possible
+
+
+def test_coarser_timeframes_are_resampled_from_the_cache(tmp_path):
+    exchange = ReplayExchange(rateLimit=0, now=datetime(2024, 6, 1))
+    client = CcxtClient(cache_dir=str(tmp_path / "cache"), exchange=exchange)
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 20, 23, 59)
+    hourly = client.fetch_retry("BTC/USDT", "1h", start, end)
+
+    requests = exchange.requests
+    four_hours = client.fetch_retry("BTC/USDT", "4h", start, end)
+
+    assert exchange.requests == requests
+    pd.testing.assert_frame_equal(four_hours, resample_ohlcv(hourly, "4h"))
+    direct = client.fetch_retry("BTC/USDT", "4h", start, end, use_cache=False)
+    np.testing.assert_allclose(four_hours.to_numpy(), direct.to_numpy(), rtol=1e-12)
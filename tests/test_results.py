@@ -0,0 +1,99 @@
+import sys
+import time
+
+import pandas as pd
+from click.testing import CliRunner
+
+from src.cli import cli
+from src.client.timeframe import closed_candles, floor_timestamp
+from src.strategy import ma_cross, search
+from src.strategy.backtest import Execution
+from src.strategy.results import ResultStore, strategy_key
+
+from conftest import make_ohlcv
+
+
+class MaCross(ma_cross.MaCross):
+    """Plugin strategy named like a built-in one"""
+
+
+def forming_ohlcv(bars: int = 600) -> pd.DataFrame:
+    """Hourly candles up to the one still forming"""
+    forming = pd.Timestamp(floor_timestamp(int(time.time() * 1000), "1h"), unit="ms")
+    data = make_ohlcv(bars)
+    data.index = pd.date_range(end=forming, periods=bars, freq="1h", name="timestamp")
+    return data
+
+
+def test_closed_candles_drop_the_forming_one():
+    data = forming_ohlcv()
+    closed = closed_candles(data, "1h")
+    assert closed.index.equals(data.index[:-1])
+    assert closed_candles(closed, "1h") is closed
+    assert closed_candles(data.iloc[:0], "1h").empty
+
+
+def test_plugin_named_like_a_builtin_has_results_of_its_own(ohlcv, tmp_path):
+    assert strategy_key(MaCross) != strategy_key(ma_cross.MaCross)
+
+    params = {"fast_period": 10, "slow_period": 20}
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        key = store.key(ohlcv, ma_cross.MaCross, "BTC/USDT", "1h")
+        store.put(key, params, {"total_profit": 0.5, "total_trades": 3})
+        store.flush()
+
+        plugin = store.key(ohlcv, MaCross, "BTC/USDT", "1h")
+        assert store.get(key, params) is not None
+        assert store.get(plugin, params) is None
+        assert store.latest_dataset(MaCross, "BTC/USDT", "1h", Execution()) is None
+
+
+def test_optimization_resumes_while_the_last_candle_forms(tmp_path, monkeypatch):
+    data = forming_ohlcv()
+
+    class Client:
+        """Gives a different price of the forming candle on every fetch"""
+
+        fetches = 0
+
+        def fetch_retry(self, **kwargs):
+            Client.fetches += 1
+            fetched = data.copy()
+            fetched.iloc[-1, fetched.columns.get_loc("close")] *= 1 + Client.fetches
+            return fetched
+
+        def fetch_many(self, **kwargs):
+            return iter(())
+
+    evaluated = []
+
+    def evaluate_grid(executor, workers, param_grid, bars=None):
+        evaluated.extend(param_grid)
+        return original(executor, workers, param_grid, bars)
+
+    original = search.evaluate_grid
+    monkeypatch.setattr(sys.modules["src.command.optimize"], "CcxtClient", Client)
+    monkeypatch.setattr(search, "evaluate_grid", evaluate_grid)
+
+    args = [
+        "optimize",
+        "--strategy",
+        "ma-cross",
+        "--symbol",
+        "BTC/USDT",
+        "--timeframe",
+        "1h",
+        "--workers",
+        "1",
+        "--results",
+        str(tmp_path / "results.sqlite"),
+    ]
+    first = CliRunner().invoke(cli, args)
+    assert first.exit_code == 0, first.output
+    combinations = len(evaluated)
+    assert combinations > 0
+
+    second = CliRunner().invoke(cli, args)
+    assert second.exit_code == 0, second.output
+    assert len(evaluated) == combinations
+    assert first.output.splitlines()[-3:] == second.output.splitlines()[-3:]
@@ -0,0 +1,104 @@
+from collections import Counter
+
+import pytest
+
+from src.strategy.ichimoku import Ichimoku
+from src.strategy.ma_cross import MaCross
+from src.strategy.search import SEARCHES, search
+
+SPACE = Ichimoku.parameter_space
+COMBINATIONS = sum(1 for _ in SPACE)
+
+
+def score(params, bars):
+    """Deterministic metric with a single peak, noisier on fewer bars"""
+    peak = {
+        "tenkan_period": 9,
+        "kijun_period": 26,
+        "senkou_span_b_period": 52,
+        "displacement": 26,
+    }
+    distance = sum(abs(params[name] - value) for name, value in peak.items())
+    noise = hash(tuple(params.values())) % 7 if bars is not None else 0
+    return -float(distance + noise)
+
+
+class Recorder:
+    """Stands in for the evaluation of `search`, counting every result"""
+
+    def __init__(self):
+        self.evaluated = []
+        self.progress = 0
+
+    def __call__(self, param_grid, bars=None):
+        for params in param_grid:
+            self.evaluated.append((bars, tuple(params.values())))
+            self.progress += 1
+            yield dict(params), {"total_profit": score(params, bars)}
+
+
+@pytest.mark.parametrize("mode", list(SEARCHES))
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("budget", [None, 300])
+def test_search_modes(mode, seed, budget):
+    bars = 12000
+    search_mode = SEARCHES[mode](SPACE, COMBINATIONS, budget, seed)
+    evaluate = Recorder()
+    results = list(search_mode.run(evaluate, bars, "total_profit"))
+
+    assert evaluate.progress == search_mode.evaluations(bars)
+
+    # No parameter set is evaluated twice on the same bars
+    repeated = [key for key, n in Counter(evaluate.evaluated).items() if n > 1]
+    assert repeated == []
+
+    # Every parameter set meets the constraints, and the results are those
+    # on all the bars
+    names = list(SPACE.parameters)
+    for _, key in evaluate.evaluated:
+        assert SPACE.is_valid(dict(zip(names, key)))
+    assert len(results) == sum(1 for b, _ in evaluate.evaluated if b is None)
+
+
+@pytest.mark.parametrize("mode", list(SEARCHES))
+def test_search_modes_are_seeded(mode):
+    runs = []
+    for _ in range(2):
+        search_mode = SEARCHES[mode](SPACE, COMBINATIONS, 200, 42)
+        evaluate = Recorder()
+        list(search_mode.run(evaluate, 12000, "total_profit"))
+        runs.append(evaluate.evaluated)
+    assert runs[0] == runs[1]
+
+
+def test_halving_scores_rungs_on_the_latest_bars():
+    search_mode = SEARCHES["halving"](SPACE, COMBINATIONS, 900, 0)
+    evaluate = Recorder()
+    list(search_mode.run(evaluate, 12000, "total_profit"))
+
+    rungs = Counter(bars for bars, _ in evaluate.evaluated)
+    assert rungs == {1333: 900, 4000: 300, None: 100}
+
+
+@pytest.mark.parametrize("mode", list(SEARCHES))
+def test_search_reports_progress_of_every_evaluation(ohlcv, mode):
+    space = MaCross.parameter_space
+    combinations = sum(1 for _ in space)
+    search_mode = SEARCHES[mode](space, combinations, 20, 3)
+
+    calls = []
+    results = list(
+        search(
+            MaCross,
+            ohlcv,
+            "BTC/USDT",
+            "1h",
+            search_mode,
+            max_workers=1,
+            progress=calls.append,
+        )
+    )
+
+    assert len(calls) == search_mode.evaluations(len(ohlcv))
+    assert len({tuple(params.values()) for params, _ in results}) == len(results)
+    assert all(space.is_valid(params) for params, _ in results)
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.client.shared import SharedArray, SharedFrame
+
+
+def test_shared_array_is_shared_with_attached_processes():
+    values = np.arange(12, dtype="float64").reshape(3, 4)
+    with SharedArray.copy_of(values) as shared:
+        attached = SharedArray.attach(shared.spec)
+        np.testing.assert_array_equal(attached.array, values)
+
+        attached.array[1, 2] = -1.0
+        assert shared.array[1, 2] == -1.0
+        attached.close()
+        # Only the creator removes the memory
+        with SharedArray.attach(shared.spec) as again:
+            assert again.array[1, 2] == -1.0
+
+
+def test_shared_array_is_released_on_exit():
+    with SharedArray((2, 3), "int64") as shared:
+        spec = shared.spec
+    assert shared.array is None
+    with pytest.raises(FileNotFoundError):
+        SharedArray.attach(spec)
+
+
+def test_empty_shared_array():
+    with SharedArray((0, 3)) as shared:
+        assert shared.array.shape == (0, 3)
+
+
+def test_shared_frame_round_trips_candles(ohlcv):
+    with SharedFrame.copy_of(ohlcv) as shared:
+        pd.testing.assert_frame_equal(shared.frame, ohlcv, check_freq=False)
+
+        attached = SharedFrame.attach(shared.spec)
+        pd.testing.assert_frame_equal(attached.frame, ohlcv, check_freq=False)
+        # The attached frame reads the shared values in place
+        assert np.shares_memory(
+            attached.frame["close"].to_numpy(), attached.values.array
+        )
+        shared.values.array[3, 0] = -1.0
+        assert attached.frame["close"].iloc[0] == -1.0
+        attached.close()
+
+        assert shared.frame["close"].iloc[0] == -1.0
+
+
+def test_shared_frame_is_released_on_exit(ohlcv):
+    with SharedFrame.copy_of(ohlcv) as shared:
+        spec = shared.spec
+    assert shared.frame is None
+    with pytest.raises(FileNotFoundError):
+        SharedFrame.attach(spec)
+
+
+def test_shared_frame_is_attached_in_worker_processes(ohlcv):
+    with SharedFrame.copy_of(ohlcv) as shared, ProcessPoolExecutor(1) as executor:
+        total = executor.submit(sum_of_close, shared.spec).result()
+    assert total == pytest.approx(ohlcv["close"].sum())
+
+
+def sum_of_close(spec):
+    with SharedFrame.attach(spec) as shared:
+        return float(shared.frame["close"].sum())
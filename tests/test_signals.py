@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.strategy.ma_cross import MaCross
+from src.strategy.rsi import Rsi
+
+GRID = [
+    {"fast_period": 10, "slow_period": 20},
+    {"fast_period": 5, "slow_period": 50},
+]
+
+
+def test_signals_are_views_into_their_batch(ohlcv):
+    strategy = MaCross(ohlcv, "BTC/USDT", "1h", **GRID[0])
+    batch = strategy.generate_signals_batch(GRID)
+    signals = batch.signals(1, ohlcv.index)
+
+    assert len(signals) == len(ohlcv)
+    assert signals.index is ohlcv.index
+    for name in ("signal", "position", "profit"):
+        column = getattr(batch, name)[:, 1]
+        np.testing.assert_array_equal(getattr(signals, name), column)
+        assert np.shares_memory(getattr(signals, name), getattr(batch, name))
+    assert signals.price is batch.price
+
+
+def test_to_frame_builds_the_columns_once(ohlcv):
+    signals = MaCross(ohlcv, "BTC/USDT", "1h", **GRID[0]).generate_signals()
+    frame = signals.to_frame()
+
+    assert list(frame.columns) == ["price", "signal", "position", "profit"]
+    assert frame.index.equals(ohlcv.index)
+    assert frame["signal"].dtype == np.int64
+    assert frame["position"].dtype == np.int64
+    assert frame["profit"].dtype == np.float64
+    pd.testing.assert_series_equal(
+        frame["price"], ohlcv["close"], check_names=False, check_freq=False
+    )
+    np.testing.assert_array_equal(frame["signal"], signals.signal)
+    np.testing.assert_array_equal(frame["position"], signals.position)
+    assert signals.to_frame() is frame
+
+
+def test_signals_of_a_strategy_match_its_batch(ohlcv):
+    params = {"period": 14, "overbought": 70, "oversold": 30}
+    strategy = Rsi(ohlcv, "BTC/USDT", "1h", **params)
+    signals = strategy.generate_signals()
+    batch = strategy.generate_signals_batch([{**params, "period": 7}, params])
+
+    np.testing.assert_array_equal(signals.signal, batch.signal[:, 1])
+    np.testing.assert_array_equal(signals.position, batch.position[:, 1])
+    np.testing.assert_allclose(signals.profit, batch.profit[:, 1])
+    assert set(np.unique(signals.signal)) <= {-1, 0, 1}
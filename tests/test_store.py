@@ -0,0 +1,232 @@
+import pickle
+import sys
+import threading
+import types
+
+import numpy as np
+import pandas as pd
+
+from src.client.lru import LruCache
+from src.client.store import OhlcvStore
+
+from conftest import make_ohlcv
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def assert_same_candles(actual: pd.DataFrame, expected: pd.DataFrame):
+    np.testing.assert_array_equal(
+        actual.index.as_unit("ms").asi8, expected.index.as_unit("ms").asi8
+    )
+    np.testing.assert_array_equal(actual[expected.columns], expected)
+
+
+def span(data: pd.DataFrame):
+    """Time range of hourly candles, to the end of the last one"""
+    timestamps = data.index.as_unit("ms").asi8
+    return int(timestamps[0]), int(timestamps[-1]) + HOUR_MS - 1
+
+
+def test_concurrent_writes_to_one_series_keep_every_candle(tmp_path):
+    store = OhlcvStore(tmp_path)
+    data = make_ohlcv(4000)
+    parts = [data.iloc[i : i + 250] for i in range(0, len(data), 250)]
+
+    barrier = threading.Barrier(len(parts))
+
+    def write(part):
+        barrier.wait()
+        store.write("binance", "BTC/USDT", "1h", part, covered=span(part))
+
+    threads = [threading.Thread(target=write, args=(part,)) for part in parts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.covered_ranges("binance", "BTC/USDT", "1h") == [span(data)]
+    assert_same_candles(OhlcvStore(tmp_path).read("binance", "BTC/USDT", "1h"), data)
+
+
+def legacy_pickle(directory, name, data):
+    with open(directory / f"{name}.pkl", "wb") as f:
+        pickle.dump(data, f)
+
+
+def test_legacy_import_skips_pickles_it_cant_load(tmp_path):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    data = make_ohlcv(48)
+    legacy_pickle(cache, "btc_usdt_1h_2024010100_2024010223", data)
+    # A pickle of a class that no longer exists
+    module = types.ModuleType("gone_module")
+    module.Gone = type("Gone", (), {"__module__": "gone_module"})
+    sys.modules["gone_module"] = module
+    try:
+        legacy_pickle(cache, "btc_usdt_1h_none_none", module.Gone())
+    finally:
+        del sys.modules["gone_module"]
+    (cache / "btc_usdt_1h_2023010100_none.pkl").write_bytes(b"not a pickle")
+
+    store = OhlcvStore(tmp_path / "store")
+    assert store.import_legacy(cache, "binance", "BTC/USDT", "1h") == 1
+    assert_same_candles(store.read("binance", "BTC/USDT", "1h"), data)
+    assert not (cache / "btc_usdt_1h_2024010100_2024010223.pkl").exists()
+
+
+def test_legacy_month_candles_are_not_imported_as_minutes(tmp_path):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    minutes = make_ohlcv(120, freq="1min")
+    months = make_ohlcv(12, freq="MS")
+    # The old cache lowercased the whole name, so both are named `1m`
+    legacy_pickle(cache, "btc_usdt_1m_2024010100_none", minutes)
+    legacy_pickle(cache, "btc_usdt_1m_none_none", months)
+
+    store = OhlcvStore(tmp_path / "store")
+    assert store.import_legacy(cache, "binance", "BTC/USDT", "1m") == 1
+    assert store.import_legacy(cache, "binance", "BTC/USDT", "1M") == 1
+
+    assert_same_candles(store.read("binance", "BTC/USDT", "1m"), minutes)
+    assert_same_candles(store.read("binance", "BTC/USDT", "1M"), months)
+    assert list(cache.glob("*.pkl")) == []
+
+
+def test_round_trip_merges_candles_and_ranges(tmp_path):
+    store = OhlcvStore(tmp_path)
+    data = make_ohlcv(300)
+    first, second = data.iloc[:200], data.iloc[150:]
+    store.write("binance", "BTC/USDT", "1h", first, covered=span(first))
+    store.write("binance", "BTC/USDT", "1h", second, covered=span(second))
+
+    # A fresh store reads the columns back from disk
+    reopened = OhlcvStore(tmp_path)
+    assert reopened.covered_ranges("binance", "BTC/USDT", "1h") == [span(data)]
+    assert_same_candles(reopened.read("binance", "BTC/USDT", "1h"), data)
+
+    start = span(data)[0]
+    window = reopened.read(
+        "binance", "BTC/USDT", "1h", start + 10 * HOUR_MS, start + 19 * HOUR_MS
+    )
+    assert_same_candles(window, data.iloc[10:20])
+    assert reopened.timeframes("binance", "BTC/USDT") == ["1h"]
+
+
+def test_newer_candles_replace_stored_ones(tmp_path):
+    store = OhlcvStore(tmp_path)
+    data = make_ohlcv(50)
+    store.write("binance", "BTC/USDT", "1h", data, covered=span(data))
+    updated = data.iloc[-5:] * 2
+    store.write("binance", "BTC/USDT", "1h", updated, covered=None)
+
+    read = OhlcvStore(tmp_path).read("binance", "BTC/USDT", "1h")
+    assert_same_candles(read.iloc[-5:], updated)
+    assert_same_candles(read.iloc[:-5], data.iloc[:-5])
+
+
+def test_interrupted_write_is_ignored(tmp_path):
+    store = OhlcvStore(tmp_path)
+    data = make_ohlcv(100)
+    store.write("binance", "BTC/USDT", "1h", data, covered=span(data))
+
+    # The columns of a write that stopped before its meta file
+    path = store.series_dir("binance", "BTC/USDT", "1h")
+    np.save(path / "close.npy", np.ones(150))
+
+    reopened = OhlcvStore(tmp_path)
+    assert reopened.open("binance", "BTC/USDT", "1h") is None
+    assert reopened.read("binance", "BTC/USDT", "1h").empty
+
+    # The next write starts the series over
+    reopened.write("binance", "BTC/USDT", "1h", data, covered=span(data))
+    assert_same_candles(OhlcvStore(tmp_path).read("binance", "BTC/USDT", "1h"), data)
+
+
+def test_legacy_pickles_are_imported_once(tmp_path):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    data = make_ohlcv(100)
+    legacy_pickle(cache, "btc_usdt_1h_2024010100_2024010223", data.iloc[:48])
+    legacy_pickle(cache, "btc_usdt_1h_2024010300_none", data.iloc[48:])
+    (cache / "btc_usdt_1h_2024010100_2024010223.csv.pkl").write_text("csv copy")
+    legacy_pickle(cache, "eth_usdt_1h_none_none", data)
+
+    store = OhlcvStore(tmp_path / "store")
+    assert store.import_legacy(cache, "binance", "BTC/USDT", "1h") == 2
+    assert store.import_legacy(cache, "binance", "BTC/USDT", "1h") == 0
+    assert_same_candles(store.read("binance", "BTC/USDT", "1h"), data)
+    # Every pickle covers its candles' open times
+    timestamps = data.index.as_unit("ms").asi8
+    assert store.covered_ranges("binance", "BTC/USDT", "1h") == [
+        (timestamps[0], timestamps[47]),
+        (timestamps[48], timestamps[-1]),
+    ]
+    assert sorted(path.name for path in cache.iterdir()) == [
+        "eth_usdt_1h_none_none.pkl"
+    ]
+
+
+def test_lru_evicts_least_recently_used_values():
+    cache = LruCache(max_bytes=30)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 10)
+    assert cache.get("a") == 1  # b is the least recently used now
+    cache.put("d", 4, 10)
+
+    assert cache.get("b") is None
+    assert [cache.peek(key) for key in "acd"] == [1, 3, 4]
+    assert (cache.hits, cache.misses, cache.evictions, cache.size) == (1, 1, 1, 30)
+
+    # Values over the whole budget are not kept
+    cache.put("e", 5, 31)
+    assert cache.peek("e") is None and cache.size == 30
+    cache.pop("a")
+    assert cache.size == 20
+
+
+def test_store_counts_memory_and_disk_hits(tmp_path):
+    data = make_ohlcv(100)
+    OhlcvStore(tmp_path).write("binance", "BTC/USDT", "1h", data, covered=span(data))
+
+    store = OhlcvStore(tmp_path)
+    store.read("binance", "BTC/USDT", "1h")
+    store.read("binance", "BTC/USDT", "1h")
+    store.read("binance", "ETH/USDT", "1h")
+
+    stats = store.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["disk_misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["memory_misses"] == 2
+    # The series read from disk stays mapped in memory, by its full size
+    assert stats["memory_bytes"] == 100 * 6 * 8
+    assert isinstance(
+        store.memory.peek(store.series_key("binance", "BTC/USDT", "1h")).columns[
+            "close"
+        ],
+        np.memmap,
+    )
+
+
+def test_store_evicts_least_recently_used_series_over_the_disk_budget(tmp_path):
+    data = make_ohlcv(100)
+    size = 100 * 6 * 8
+    store = OhlcvStore(tmp_path, max_memory_bytes=size, max_disk_bytes=2 * size)
+
+    for symbol in ["BTC/USDT", "ETH/USDT"]:
+        store.write("binance", symbol, "1h", data, covered=span(data))
+    store.read("binance", "BTC/USDT", "1h")
+    store.write("binance", "SOL/USDT", "1h", data, covered=span(data))
+
+    stats = store.stats()
+    assert stats["disk_evictions"] == 1
+    assert stats["disk_bytes"] == 2 * size
+    assert stats["memory_evictions"] >= 1
+    assert stats["memory_bytes"] <= size
+
+    reopened = OhlcvStore(tmp_path)
+    assert reopened.covered_ranges("binance", "ETH/USDT", "1h") == []
+    assert not (tmp_path / "binance" / "eth_usdt").exists()
+    for symbol in ["BTC/USDT", "SOL/USDT"]:
+        assert_same_candles(reopened.read("binance", symbol, "1h"), data)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.strategy.bollinger_bands import BollingerBands
+from src.strategy.ichimoku import Ichimoku
+from src.strategy.ma_cross import MaCross
+from src.strategy.macd import Macd
+from src.strategy.rsi import Rsi
+
+CASES = [
+    (BollingerBands, {"period": 20, "num_std": 2.0}),
+    (BollingerBands, {"period": 7, "num_std": 1.0}),
+    (
+        Ichimoku,
+        {
+            "tenkan_period": 9,
+            "kijun_period": 26,
+            "senkou_span_b_period": 52,
+            "displacement": 26,
+        },
+    ),
+    (
+        Ichimoku,
+        {
+            "tenkan_period": 5,
+            "kijun_period": 20,
+            "senkou_span_b_period": 42,
+            "displacement": 30,
+        },
+    ),
+    (MaCross, {"fast_period": 10, "slow_period": 20}),
+    (MaCross, {"fast_period": 3, "slow_period": 50}),
+    (Macd, {"fast_period": 12, "slow_period": 26, "signal_period": 9}),
+    (Macd, {"fast_period": 5, "slow_period": 35, "signal_period": 5}),
+    (Rsi, {"period": 14, "overbought": 70, "oversold": 30}),
+    (Rsi, {"period": 7, "overbought": 80, "oversold": 20}),
+]
+
+
+def strategy_id(case):
+    strategy, params = case
+    return f"{strategy.__name__}-{'-'.join(str(v) for v in params.values())}"
+
+
+@pytest.mark.parametrize("case", CASES, ids=[strategy_id(case) for case in CASES])
+def test_update_matches_generate_signals(ohlcv, case):
+    strategy, params = case
+    expected = (
+        strategy(data=ohlcv, symbol="BTC/USDT", timeframe="1h", **params)
+        .generate_signals()
+        .signal
+    )
+
+    streaming = strategy(
+        data=ohlcv.iloc[:0], symbol="BTC/USDT", timeframe="1h", **params
+    )
+    lag = streaming.signal_lag
+    assert lag == params.get("displacement", 0)
+
+    signals = [streaming.update(candle) for candle in ohlcv.to_dict("records")]
+
+    # The first signals come only once the bars they depend on have closed
+    assert signals[:lag] == [None] * lag
+    np.testing.assert_array_equal(signals[lag:], expected[: len(ohlcv) - lag])
+    assert (expected != 0).any()
+
+
+def test_warm_up_continues_with_new_candles(ohlcv):
+    params = {"fast_period": 10, "slow_period": 20}
+    expected = (
+        MaCross(data=ohlcv, symbol="BTC/USDT", timeframe="1h", **params)
+        .generate_signals()
+        .signal
+    )
+
+    split = len(ohlcv) // 2
+    streaming = MaCross(
+        data=ohlcv.iloc[:split], symbol="BTC/USDT", timeframe="1h", **params
+    )
+    streaming.warm_up()
+    signals = [streaming.update(c) for c in ohlcv.iloc[split:].to_dict("records")]
+
+    np.testing.assert_array_equal(signals, expected[split:])
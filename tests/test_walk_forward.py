@@ -0,0 +1,99 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from src.strategy.backtest import backtest
+from src.strategy.ichimoku import Ichimoku
+from src.strategy.ma_cross import MaCross
+from src.strategy.metrics import performance_metrics
+from src.strategy.walk_forward import walk_forward, walk_forward_folds
+
+MA_CROSS_GRID = [
+    {"fast_period": fast, "slow_period": slow}
+    for fast, slow in product([3, 5, 10, 20], [30, 50, 80])
+]
+
+ICHIMOKU_GRID = [
+    {
+        "tenkan_period": tenkan,
+        "kijun_period": kijun,
+        "senkou_span_b_period": 52,
+        "displacement": displacement,
+    }
+    for tenkan, kijun, displacement in product([5, 9], [20, 26], [10, 26, 30])
+]
+
+FOLDS = walk_forward_folds(1500, 600, 200)
+
+
+def windows():
+    return [window for fold in FOLDS for window in fold]
+
+
+@pytest.mark.parametrize(
+    "strategy, param_grid",
+    [(MaCross, MA_CROSS_GRID), (Ichimoku, ICHIMOKU_GRID)],
+    ids=["MaCross", "Ichimoku"],
+)
+def test_window_metrics_match_standalone_backtests(ohlcv, strategy, param_grid):
+    instance = strategy(ohlcv, "BTC/USDT", "1h", **param_grid[0])
+    metrics = instance.get_performance_metrics_windows(param_grid, windows())
+
+    for i, params in enumerate(param_grid):
+        signal = strategy(ohlcv, "BTC/USDT", "1h", **params).generate_signals().signal
+        lag = strategy.lookahead(params)
+        for window, window_metrics in zip(windows(), metrics):
+            window_signal = signal[window].copy()
+            if lag:
+                window_signal[-lag:] = 0
+
+                # What is left only depends on the bars up to the window's end
+                cut = ohlcv.iloc[: window.stop]
+                seen = strategy(cut, "BTC/USDT", "1h", **params).generate_signals()
+                np.testing.assert_array_equal(
+                    window_signal[:-lag], seen.signal[window][:-lag]
+                )
+
+            data = ohlcv.iloc[window]
+            result = backtest(
+                data["close"].to_numpy(dtype="float64"),
+                window_signal,
+                instance.execution,
+            )
+            expected = performance_metrics(
+                result.position,
+                result.profit,
+                result.equity,
+                result.trades,
+                instance.periods_per_year,
+            )
+            for name, value in expected.items():
+                np.testing.assert_allclose(
+                    window_metrics[name][i], value, rtol=1e-12, err_msg=name
+                )
+
+
+@pytest.mark.parametrize("metric", ["total_profit", "sharpe_ratio"])
+def test_walk_forward_picks_best_parameters_of_every_fold(ohlcv, metric):
+    results = walk_forward(
+        MaCross,
+        ohlcv,
+        "BTC/USDT",
+        "1h",
+        MA_CROSS_GRID,
+        FOLDS,
+        metric=metric,
+        max_workers=1,
+    )
+
+    instance = MaCross(ohlcv, "BTC/USDT", "1h", **MA_CROSS_GRID[0])
+    metrics = instance.get_performance_metrics_windows(MA_CROSS_GRID, windows())
+
+    assert [result.fold for result in results] == FOLDS
+    for i, result in enumerate(results):
+        train, test = metrics[2 * i], metrics[2 * i + 1]
+        best = int(np.nanargmax(train[metric]))
+        assert result.params == MA_CROSS_GRID[best]
+        assert result.train[metric] == pytest.approx(train[metric][best])
+        assert result.test["total_profit"] == pytest.approx(test["total_profit"][best])